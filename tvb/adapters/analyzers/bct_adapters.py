@@ -29,7 +29,9 @@
 #
 
 import os
+import re
 from abc import abstractmethod
+from tvb.adapters.analyzers.bct_native import NATIVE_FUNCTIONS, weights_to_lengths
 from tvb.adapters.analyzers.matlab_worker import MatlabWorker
 from tvb.basic.filters.chain import FilterChain
 from tvb.basic.profile import TvbProfile
@@ -53,6 +55,9 @@ LABEL_CONNECTIVITY_BINARY = "Binary (directed/undirected) connection matrix"
 LABEL_CONN_WEIGHTED_DIRECTED = "Weighted directed connection matrix"
 LABEL_CONN_WEIGHTED_UNDIRECTED = "Weighted undirected connection matrix"
 
+BCT_STATEMENT = re.compile(r'^\[?([\w\s,]+?)\]?\s*=\s*(\w+)\(([\w\s,]*)\)$')
+"A MATLAB statement `[out1, out2] = function(in1, in2)`"
+
 
 def bct_description(mat_file_name):
     return extract_matlab_doc_string(os.path.join(BCT_PATH, mat_file_name))
@@ -61,9 +66,11 @@ def bct_description(mat_file_name):
 class BaseBCT(ABCAsynchronous):
     """
     Interface between Brain Connectivity Toolbox of Olaf Sporns and TVB Framework.
-    This adapter requires BCT deployed locally, and Matlab or Octave installed separately of TVB.
+    The algorithms with a NumPy implementation (see bct_native) are computed in process.
+    The others require BCT deployed locally, and Matlab or Octave installed separately of TVB.
     """
     _ui_connectivity_label = "Connection matrix:"
+    _matlab_code = ""
 
 
     def __init__(self):
@@ -71,9 +78,29 @@ class BaseBCT(ABCAsynchronous):
         self.matlab_worker = MatlabWorker()
 
 
+    @classmethod
+    def can_be_active(cls):
+        return cls.native_program(cls._matlab_code) is not None or not not TvbProfile.current.MATLAB_EXECUTABLE
+
+
     @staticmethod
-    def can_be_active():
-        return not not TvbProfile.current.MATLAB_EXECUTABLE
+    def native_program(matlab_code):
+        """
+        Translate BCT MATLAB code to NumPy calls, when all the functions it calls are in bct_native.
+        :returns: a list of (output names, function, input names) for each statement, or None
+        """
+        program = []
+        for statement in matlab_code.split(';'):
+            statement = statement.strip()
+            if not statement:
+                continue
+            match = BCT_STATEMENT.match(statement)
+            if match is None or match.group(2) not in NATIVE_FUNCTIONS:
+                return None
+            outputs, function_name, inputs = match.groups()
+            program.append(([name.strip() for name in outputs.split(',')], NATIVE_FUNCTIONS[function_name],
+                            [name.strip() for name in inputs.split(',') if name.strip()]))
+        return program or None
 
 
     def get_input_tree(self):
@@ -93,6 +120,25 @@ class BaseBCT(ABCAsynchronous):
         return 0
 
 
+    def execute(self, matlab_code, **kwargs):
+        """
+        Run the BCT code with the NumPy implementations when available, in MATLAB otherwise.
+        :returns: dict of the variables in the workspace after execution
+        """
+        program = self.native_program(matlab_code)
+        if program is None:
+            return self.execute_matlab(matlab_code, **kwargs)
+
+        self.log.info("Starting native execution of BCT code:" + matlab_code)
+        workspace = dict(kwargs)
+        for outputs, function, inputs in program:
+            results = function(*[workspace[name] for name in inputs])
+            if not isinstance(results, tuple):
+                results = (results,)
+            workspace.update(zip(outputs, results))
+        return workspace
+
+
     def execute_matlab(self, matlab_code, **kwargs):
         self.matlab_worker.add_to_path(BCT_PATH)
         self.log.info("Starting execution of MATLAB code:" + matlab_code)
@@ -165,7 +211,7 @@ class ModularityOCSM(BaseBCT):
         # Prepare parameters
         kwargs['CW'] = connectivity.weights
         # Execute the matlab code
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         # Gather results
         measure = self.build_connectivity_measure(result, 'Ci', connectivity, "Optimal Community Structure")
         value = self.build_float_value_wrapper(result, 'Q', title="Maximized Modularity")
@@ -192,7 +238,7 @@ class DistanceDBIN(BaseBCT):
 
     def launch(self, connectivity, **kwargs):
         kwargs['A'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure = self.build_connectivity_measure(result, 'D', connectivity, "Distance matrix")
         return [measure]
 
@@ -216,7 +262,7 @@ class DistanceRDM(DistanceDBIN):
 
     def launch(self, connectivity, **kwargs):
         kwargs['A'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
 
         measure1 = self.build_connectivity_measure(result, 'R', connectivity, "Reachability matrix")
         measure2 = self.build_connectivity_measure(result, 'D', connectivity, "Distance matrix")
@@ -241,9 +287,31 @@ class DistanceNETW(DistanceDBIN):
 
     def launch(self, connectivity, **kwargs):
         kwargs['A'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
 
         measure1 = self.build_connectivity_measure(result, 'Wq', connectivity, "3D matrix")
         measure2 = self.build_connectivity_measure(result, 'wlq', connectivity, "Walk length distribution")
         value = self.build_float_value_wrapper(result, 'twalk', title="Total number of walks found")
         return [measure1, value, measure2]
+
+
+class CharacteristicPathLength(DistanceDBIN):
+    """
+    The connectivity weights are converted to connection lengths (1 / weight) before computing distances.
+    """
+    _ui_connectivity_label = "Weighted (directed/undirected) connection matrix:"
+    _ui_name = "Characteristic path length and efficiency"
+    _ui_description = bct_description("charpath.m")
+    _matlab_code = "D = distance_wei(L); [lambda,efficiency,ecc,radius,diameter] = charpath(D);"
+
+
+    def launch(self, connectivity, **kwargs):
+        kwargs['L'] = weights_to_lengths(connectivity.weights)
+        result = self.execute(self._matlab_code, **kwargs)
+
+        measure = self.build_connectivity_measure(result, 'ecc', connectivity, "Eccentricity")
+        value1 = self.build_float_value_wrapper(result, 'lambda', title="Characteristic path length")
+        value2 = self.build_float_value_wrapper(result, 'efficiency', title="Global efficiency")
+        value3 = self.build_float_value_wrapper(result, 'radius', title="Radius")
+        value4 = self.build_float_value_wrapper(result, 'diameter', title="Diameter")
+        return [measure, value1, value2, value3, value4]
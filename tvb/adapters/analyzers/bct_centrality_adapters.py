@@ -48,7 +48,7 @@ class CentralityNodeBinary(BaseBCT):
 
     def launch(self, connectivity, **kwargs):
         kwargs['A'] = connectivity.binarized_weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure = self.build_connectivity_measure(result, 'C', connectivity,
                                                   "Node Betweenness Centrality Binary", "Nodes")
         return [measure]
@@ -67,7 +67,7 @@ class CentralityNodeWeighted(BaseBCT):
 
     def launch(self, connectivity, **kwargs):
         kwargs['A'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure = self.build_connectivity_measure(result, 'C', connectivity,
                                                   "Node Betweenness Centrality Weighted", "Nodes")
         return [measure]
@@ -83,7 +83,7 @@ class CentralityEdgeBinary(CentralityNodeBinary):
 
     def launch(self, connectivity, **kwargs):
         kwargs['A'] = connectivity.binarized_weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure1 = self.build_connectivity_measure(result, 'EBC', connectivity, "Edge Betweenness Centrality Matrix")
         measure2 = self.build_connectivity_measure(result, 'BC', connectivity, "Node Betweenness Centrality Vector")
         return [measure1, measure2]
@@ -99,7 +99,7 @@ class CentralityEdgeWeighted(CentralityNodeWeighted):
 
     def launch(self, connectivity, **kwargs):
         kwargs['A'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure1 = self.build_connectivity_measure(result, 'EBC', connectivity, "Edge Betweenness Centrality Matrix")
         measure2 = self.build_connectivity_measure(result, 'BC', connectivity, "Node Betweenness Centrality Vector")
         return [measure1, measure2]
@@ -117,7 +117,7 @@ class CentralityEigenVector(BaseUndirected):
 
     def launch(self, connectivity, **kwargs):
         kwargs['CIJ'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure = self.build_connectivity_measure(result, 'v', connectivity, "Eigen vector centrality")
         return [measure]
 
@@ -135,7 +135,7 @@ class CentralityKCoreness(BaseUndirected):
 
     def launch(self, connectivity, **kwargs):
         kwargs['CIJ'] = connectivity.binarized_weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure1 = self.build_connectivity_measure(result, 'coreness', connectivity, "Node coreness BU")
         measure2 = self.build_connectivity_measure(result, 'kn', connectivity, "Size of k-core")
         return [measure1, measure2]
@@ -151,7 +151,7 @@ class CentralityKCorenessBD(CentralityNodeBinary):
 
     def launch(self, connectivity, **kwargs):
         kwargs['CIJ'] = connectivity.binarized_weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure1 = self.build_connectivity_measure(result, 'coreness', connectivity, "Node coreness BD")
         measure2 = self.build_connectivity_measure(result, 'kn', connectivity, "Size of k-core")
         return [measure1, measure2]
@@ -169,7 +169,7 @@ class CentralityShortcuts(CentralityNodeBinary):
 
     def launch(self, connectivity, **kwargs):
         kwargs['A'] = connectivity.binarized_weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
 
         measure1 = self.build_connectivity_measure(result, 'Erange', connectivity, "Range for each edge")
         value1 = self.build_int_value_wrapper(result, 'eta', "Average range for entire graph")
@@ -188,7 +188,7 @@ class FlowCoefficients(CentralityNodeBinary):
 
     def launch(self, connectivity, **kwargs):
         kwargs['CIJ'] = connectivity.binarized_weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
 
         measure1 = self.build_connectivity_measure(result, 'fc', connectivity, "Flow coefficient for each node")
         value1 = self.build_float_value_wrapper(result, 'FC', "Average flow coefficient over the network")
@@ -210,7 +210,7 @@ class ParticipationCoefficient(BaseBCT):
 
     def launch(self, connectivity, **kwargs):
         kwargs['W'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
 
         measure = self.build_connectivity_measure(result, 'P', connectivity, "Participation Coefficient")
         return [measure]
@@ -226,7 +226,7 @@ class ParticipationCoefficientSign(ParticipationCoefficient):
 
     def launch(self, connectivity, **kwargs):
         kwargs['W'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
 
         measure1 = self.build_connectivity_measure(result, 'Ppos', connectivity,
                                                    "Participation Coefficient from positive weights")
@@ -247,7 +247,7 @@ class SubgraphCentrality(CentralityNodeBinary):
 
     def launch(self, connectivity, **kwargs):
         kwargs['CIJ'] = connectivity.binarized_weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
 
         measure = self.build_connectivity_measure(result, 'Cs', connectivity, "Subgraph Centrality")
         return [measure]
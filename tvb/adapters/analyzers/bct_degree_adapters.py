@@ -50,7 +50,7 @@ class Degree(BaseBCT):
 
     def launch(self, connectivity, **kwargs):
         kwargs['CIJ'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure = self.build_connectivity_measure(result, 'deg', connectivity, "Node degree")
         return [measure]
 
@@ -67,7 +67,7 @@ class DegreeIOD(Degree):
 
     def launch(self, connectivity, **kwargs):
         kwargs['CIJ'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure1 = self.build_connectivity_measure(result, 'id', connectivity, "Node indegree")
         measure2 = self.build_connectivity_measure(result, 'od', connectivity, "Node outdegree")
         measure3 = self.build_connectivity_measure(result, 'deg', connectivity, "Node degree (indegree + outdegree)")
@@ -86,7 +86,7 @@ class JointDegree(Degree):
 
     def launch(self, connectivity, **kwargs):
         kwargs['CIJ'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure = self.build_connectivity_measure(result, 'J', connectivity,
                                                   "'Joint Degree JOD= ' +str(result['J_od'])+ ', JID= ' +str(result['J_id'])+ ', JBL= ' +str(result['J_bl'])",
                                                   "Connectivity Nodes", "Connectivity Nodes")
@@ -108,7 +108,7 @@ class MatchingIndex(Degree):
 
     def launch(self, connectivity, **kwargs):
         kwargs['CIJ'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure1 = self.build_connectivity_measure(result, 'Min', connectivity,
                                                    "Matching index for incoming connections")
         measure2 = self.build_connectivity_measure(result, 'Mout', connectivity,
@@ -129,7 +129,7 @@ class Strength(Degree):
 
     def launch(self, connectivity, **kwargs):
         kwargs['CIJ'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure = self.build_connectivity_measure(result, 'strength', connectivity, "Node strength")
         return [measure]
 
@@ -144,7 +144,7 @@ class StrengthISOS(Strength):
 
     def launch(self, connectivity, **kwargs):
         kwargs['CIJ'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure1 = self.build_connectivity_measure(result, 'is', connectivity, "Node instrength")
         measure2 = self.build_connectivity_measure(result, 'os', connectivity, "Node outstrength")
         measure3 = self.build_connectivity_measure(result, 'strength', connectivity,
@@ -162,7 +162,7 @@ class StrengthWeights(Strength):
 
     def launch(self, connectivity, **kwargs):
         kwargs['CIJ'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         measure1 = self.build_connectivity_measure(result, 'Spos', connectivity, "Nodal strength of positive weights")
         measure2 = self.build_connectivity_measure(result, 'Sneg', connectivity, "Nodal strength of negative weights")
         value1 = self.build_float_value_wrapper(result, 'vpos', "Total positive weight")
@@ -183,7 +183,7 @@ class DensityDirected(BaseBCT):
 
     def launch(self, connectivity, **kwargs):
         kwargs['A'] = connectivity.weights
-        result = self.execute_matlab(self._matlab_code, **kwargs)
+        result = self.execute(self._matlab_code, **kwargs)
         value1 = self.build_float_value_wrapper(result, 'kden', title="Density")
         value2 = self.build_int_value_wrapper(result, 'N', title="Number of vertices")
         value3 = self.build_int_value_wrapper(result, 'K', title="Number of edges")
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+"""
+NumPy / SciPy implementations of the most used Brain Connectivity Toolbox functions.
+
+Each function has the name and the arguments of the BCT MATLAB function it replaces and
+returns its outputs in the same order, so that BCT adapters can run them instead of MATLAB code
+(see BaseBCT.execute). Results follow the BCT 2017 implementations, including their conventions
+for isolated nodes and disconnected graphs.
+"""
+
+import numpy
+from scipy.sparse.csgraph import shortest_path
+
+
+
+def degrees_und(CIJ):
+    """ Node degree of an undirected (binary/weighted) graph """
+    return numpy.sum(CIJ != 0, axis=0).astype(float)
+
+
+def degrees_dir(CIJ):
+    """ Indegree, outdegree and degree of a directed (binary/weighted) graph """
+    binary = CIJ != 0
+    in_degree = numpy.sum(binary, axis=0).astype(float)
+    out_degree = numpy.sum(binary, axis=1).astype(float)
+    return in_degree, out_degree, in_degree + out_degree
+
+
+def strengths_und(CIJ):
+    """ Node strength of an undirected weighted graph """
+    return numpy.sum(CIJ, axis=0, dtype=float)
+
+
+def strengths_dir(CIJ):
+    """ Instrength, outstrength and strength of a directed weighted graph """
+    in_strength = numpy.sum(CIJ, axis=0, dtype=float)
+    out_strength = numpy.sum(CIJ, axis=1, dtype=float)
+    return in_strength, out_strength, in_strength + out_strength
+
+
+def _cycles_ratio(cycles, total):
+    """ cycles / total, with 0 where there are no cycles """
+    result = numpy.zeros(len(cycles))
+    nonzero = cycles != 0
+    result[nonzero] = cycles[nonzero] / total[nonzero]
+    return result
+
+
+def clustering_coef_bu(G):
+    """ Clustering coefficient of an undirected binary graph """
+    neighbours = (G != 0).astype(float)
+    degree = neighbours.sum(axis=1)
+    # links between the neighbours of each node
+    links = numpy.einsum('ij,jk,ik->i', neighbours, G, neighbours)
+    coefficients = numpy.zeros(len(G))
+    valid = degree >= 2
+    coefficients[valid] = links[valid] / (degree[valid] ** 2 - degree[valid])
+    return coefficients
+
+
+def clustering_coef_bd(A):
+    """ Clustering coefficient of a directed binary graph (Fagiolo, 2007) """
+    A = numpy.asarray(A, dtype=float)
+    S = A + A.T
+    degree = S.sum(axis=1)
+    cycles = numpy.diag(numpy.linalg.matrix_power(S, 3)) / 2.0
+    return _cycles_ratio(cycles, degree * (degree - 1) - 2 * numpy.diag(numpy.dot(A, A)))
+
+
+def clustering_coef_wu(W):
+    """ Clustering coefficient of an undirected weighted graph (Onnela et al., 2005) """
+    degree = numpy.sum(W != 0, axis=1).astype(float)
+    cycles = numpy.diag(numpy.linalg.matrix_power(numpy.power(W, 1.0 / 3), 3))
+    return _cycles_ratio(cycles, degree * (degree - 1))
+
+
+def clustering_coef_wd(W):
+    """ Clustering coefficient of a directed weighted graph (Fagiolo, 2007) """
+    A = (W != 0).astype(float)
+    S = numpy.power(W, 1.0 / 3) + numpy.power(W.T, 1.0 / 3)
+    degree = numpy.sum(A + A.T, axis=1)
+    cycles = numpy.diag(numpy.linalg.matrix_power(S, 3)) / 2.0
+    return _cycles_ratio(cycles, degree * (degree - 1) - 2 * numpy.diag(numpy.dot(A, A)))
+
+
+def betweenness_bin(A):
+    """
+    Node betweenness centrality of a binary (directed/undirected) graph, by matrix path counting.
+    """
+    G = numpy.asarray(A != 0, dtype=float)
+    n = len(G)
+    identity = numpy.eye(n, dtype=bool)
+    depth = 1
+    paths_d = G.copy()
+    shortest_paths_d = paths_d.copy()
+    shortest_paths = shortest_paths_d.copy()
+    shortest_paths[identity] = 1
+    lengths = shortest_paths_d.copy()
+    lengths[identity] = 1
+    while shortest_paths_d.any():
+        depth += 1
+        paths_d = numpy.dot(paths_d, G)
+        shortest_paths_d = paths_d * (lengths == 0)
+        shortest_paths += shortest_paths_d
+        lengths += depth * (shortest_paths_d != 0)
+
+    lengths[lengths == 0] = numpy.inf
+    lengths[identity] = 0
+    shortest_paths[shortest_paths == 0] = 1
+
+    dependencies = numpy.zeros((n, n))
+    for depth in range(depth - 1, 1, -1):
+        dependencies += (numpy.dot((lengths == depth) * (1 + dependencies) / shortest_paths, G.T) *
+                         ((lengths == depth - 1) * shortest_paths))
+    return numpy.sum(dependencies, axis=0)
+
+
+def betweenness_wei(A):
+    """
+    Node betweenness centrality of a weighted (directed/undirected) graph (Brandes, 2001).
+    The weights are connection lengths.
+    """
+    G = numpy.asarray(A, dtype=float)
+    n = len(G)
+    centrality = numpy.zeros(n)
+    for source in range(n):
+        distance = numpy.full(n, numpy.inf)
+        distance[source] = 0
+        paths_count = numpy.zeros(n)
+        paths_count[source] = 1
+        unvisited = numpy.ones(n, dtype=bool)
+        predecessors = numpy.zeros((n, n), dtype=bool)
+        # nodes in order of non-increasing distance from the source
+        order = numpy.zeros(n, dtype=int)
+        position = n - 1
+        remaining = G.copy()
+        current = [source]
+        while True:
+            unvisited[current] = False
+            remaining[:, current] = 0
+            for v in current:
+                order[position] = v
+                position -= 1
+                for w in numpy.nonzero(remaining[v])[0]:
+                    distance_vw = distance[v] + remaining[v, w]
+                    if distance_vw < distance[w]:
+                        distance[w] = distance_vw
+                        paths_count[w] = paths_count[v]
+                        predecessors[w, :] = False
+                        predecessors[w, v] = True
+                    elif distance_vw == distance[w]:
+                        paths_count[w] += paths_count[v]
+                        predecessors[w, v] = True
+            if not unvisited.any():
+                break
+            min_distance = distance[unvisited].min()
+            if numpy.isinf(min_distance):
+                order[:position + 1] = numpy.nonzero(numpy.isinf(distance))[0]
+                break
+            current = numpy.nonzero(distance == min_distance)[0]
+
+        dependency = numpy.zeros(n)
+        for w in order[:n - 1]:
+            centrality[w] += dependency[w]
+            for v in numpy.nonzero(predecessors[w])[0]:
+                dependency[v] += (1 + dependency[w]) * paths_count[v] / paths_count[w]
+    return centrality
+
+
+def distance_bin(A):
+    """ Distance matrix (shortest path lengths, in number of edges) of a binary graph """
+    G = numpy.asarray(A != 0, dtype=float)
+    length = 1
+    walks = G.copy()
+    distances = G.copy()
+    found = True
+    while found:
+        length += 1
+        walks = numpy.dot(walks, G)
+        found = (walks != 0) & (distances == 0)
+        distances[found] = length
+        found = found.any()
+    distances[distances == 0] = numpy.inf
+    numpy.fill_diagonal(distances, 0)
+    return distances
+
+
+def weights_to_lengths(W):
+    """
+    Connection-length matrix of a weighted graph, as BCT weight_conversion(W, 'lengths'): the inverse of every
+    non-zero weight, so that stronger connections are shorter. Absent connections stay 0.
+    """
+    L = numpy.array(W, dtype=float)
+    present = L != 0
+    L[present] = 1 / L[present]
+    return L
+
+
+def distance_wei(L):
+    """ Distance matrix of a weighted graph, with the weights as connection lengths (Dijkstra) """
+    return shortest_path(numpy.asarray(L, dtype=float), method='D', directed=True)
+
+
+def charpath(D):
+    """
+    Characteristic path length, global efficiency, eccentricity, radius and diameter of a distance matrix.
+    The diagonal is excluded, infinite distances are included.
+    """
+    D = numpy.array(D, dtype=float)
+    numpy.fill_diagonal(D, numpy.nan)
+    values = D[~numpy.isnan(D)]
+    lambda_ = numpy.mean(values)
+    efficiency = numpy.mean(1 / values)
+    eccentricity = numpy.nanmax(D, axis=1)
+    return lambda_, efficiency, eccentricity, numpy.min(eccentricity), numpy.max(eccentricity)
+
+
+def _spectral_modularity(B, m):
+    """
+    Newman's spectral community detection, with the fine tuning of each split, over a symmetric
+    modularity matrix B. m normalises the modularity of the final partition.
+    """
+    n = len(B)
+    communities = numpy.ones(n, dtype=int)
+    count = 1
+    to_split = [1]
+    indices = numpy.arange(n)
+    B_group = B.copy()
+    n_group = n
+    while to_split:
+        eigenvalues, eigenvectors = numpy.linalg.eigh(B_group)
+        leading = eigenvectors[:, numpy.argmax(eigenvalues)]
+        S = numpy.ones(n_group)
+        S[leading < 0] = -1
+        q = numpy.dot(S, numpy.dot(B_group, S))
+        if q > 1e-10:
+            # fine tuning: flip one node at a time, keep the best split found
+            q_max = q
+            numpy.fill_diagonal(B_group, 0)
+            free = numpy.ones(n_group)
+            S_iter = S.copy()
+            while not numpy.isnan(free).all():
+                q_iter = q_max - 4 * S_iter * numpy.dot(B_group, S_iter)
+                index_max = numpy.nanargmax(q_iter * free)
+                q_max = q_iter[index_max]
+                S_iter[index_max] = -S_iter[index_max]
+                free[index_max] = numpy.nan
+                if q_max > q:
+                    q = q_max
+                    S = S_iter.copy()
+            if abs(numpy.sum(S)) == n_group:
+                to_split.pop(0)
+            else:
+                count += 1
+                communities[indices[S == 1]] = to_split[0]
+                communities[indices[S == -1]] = count
+                to_split.insert(0, count)
+        else:
+            to_split.pop(0)
+
+        if not to_split:
+            break
+        indices = numpy.nonzero(communities == to_split[0])[0]
+        B_sub = B[numpy.ix_(indices, indices)]
+        B_group = B_sub - numpy.diag(B_sub.sum(axis=0))
+        n_group = len(indices)
+
+    same_community = communities[:, numpy.newaxis] == communities[numpy.newaxis, :]
+    return communities, numpy.sum(B[same_community]) / m
+
+
+def modularity_und(CW, gamma=1.0):
+    """ Optimal community structure and modularity of an undirected graph (Newman, 2006) """
+    A = numpy.asarray(CW, dtype=float)
+    degree = A.sum(axis=0)
+    m = degree.sum()
+    B = A - gamma * numpy.outer(degree, degree) / m
+    return _spectral_modularity(B, m)
+
+
+def modularity_dir(CW, gamma=1.0):
+    """ Optimal community structure and modularity of a directed graph (Leicht and Newman, 2008) """
+    A = numpy.asarray(CW, dtype=float)
+    in_degree, out_degree = A.sum(axis=0), A.sum(axis=1)
+    m = in_degree.sum()
+    b = A - gamma * numpy.outer(out_degree, in_degree).T / m
+    return _spectral_modularity(b + b.T, 2 * m)
+
+
+
+NATIVE_FUNCTIONS = dict((function.__name__, function) for function in [
+    degrees_und, degrees_dir, strengths_und, strengths_dir,
+    clustering_coef_bu, clustering_coef_bd, clustering_coef_wu, clustering_coef_wd,
+    betweenness_bin, betweenness_wei, distance_bin, distance_wei, charpath, modularity_und, modularity_dir])
+"BCT function name: NumPy implementation"
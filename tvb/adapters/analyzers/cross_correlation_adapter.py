@@ -37,12 +37,13 @@ Adapter that uses the traits module to generate interfaces for ... Analyzer.
 """
 
 import numpy
+from tvb.adapters.analyzers import node_blocks
 from tvb.core.adapters.abcadapter import ABCAsynchronous
 from tvb.core.adapters.exceptions import LaunchException
 from tvb.basic.logger.builder import get_logger
 from tvb.basic.filters.chain import FilterChain
 from tvb.basic.traits.util import log_debug_array
-from tvb.datatypes.time_series import TimeSeries, TimeSeriesEEG, TimeSeriesMEG, TimeSeriesSEEG
+from tvb.datatypes.time_series import TimeSeriesEEG, TimeSeriesMEG, TimeSeriesSEEG
 from tvb.datatypes.temporal_correlations import CrossCorrelation
 from tvb.datatypes.graph import CorrelationCoefficients
 from tvb.analyzers.cross_correlation import CrossCorrelate
@@ -94,11 +95,32 @@ class CrossCorrelateAdapter(ABCAsynchronous):
         """
         Returns the required memory to be able to run the adapter.
         """
-        #Not all the data is loaded into memory at one time here.
-        used_shape = (self.input_shape[0], 1, self.input_shape[2], self.input_shape[3])
-        input_size = numpy.prod(used_shape) * 8.0
-        output_size = self.algorithm.result_size(used_shape)
-        return input_size + output_size
+        # The spectra of all signals, and the correlations of one block of nodes with all the others
+        tpts, state_variables, nodes, modes = self.input_shape
+        spectra_size = (self._fft_length(tpts) // 2 + 1) * state_variables * nodes * modes * 16.0
+        return spectra_size + self._block_nodes() * self._node_memory()
+
+
+    @staticmethod
+    def _fft_length(tpts):
+        """
+        :returns: a power of 2 long enough for the circular correlation to hold all lags of the linear one
+        """
+        return 2 ** int(numpy.ceil(numpy.log2(max(2 * tpts - 1, 1))))
+
+
+    def _node_memory(self):
+        """
+        :returns: bytes needed by the correlations of one node with all the others: their spectra products,
+                  the circular correlations and the kept offsets
+        """
+        tpts, state_variables, nodes, modes = self.input_shape
+        fft_length = self._fft_length(tpts)
+        return ((fft_length // 2 + 1) * 16.0 + fft_length * 8.0 + tpts * 8.0) * state_variables * nodes * modes
+
+
+    def _block_nodes(self):
+        return int(max(1, min(self.input_shape[2], node_blocks.BLOCK_MEMORY // self._node_memory())))
 
 
     def get_required_disk_size(self, **kwargs):
@@ -120,19 +142,28 @@ class CrossCorrelateAdapter(ABCAsynchronous):
         ##--------- Prepare a CrossCorrelation object for result ------------##
         cross_corr = CrossCorrelation(source=time_series,
                                       storage_path=self.storage_path)
-        
-        node_slice = [slice(self.input_shape[0]), None, slice(self.input_shape[2]), slice(self.input_shape[3])]
-        ##---------- Iterate over slices and compose final result ------------##
-        small_ts = TimeSeries(use_storage=False)
-        small_ts.sample_period = time_series.sample_period
-        partial_cross_corr = None
-        for var in range(self.input_shape[1]):
-            node_slice[1] = slice(var, var + 1)
-            small_ts.data = time_series.read_data_slice(tuple(node_slice))
-            self.algorithm.time_series = small_ts
-            partial_cross_corr = self.algorithm.evaluate()
-            cross_corr.write_data_slice(partial_cross_corr)
-        cross_corr.time = partial_cross_corr.time
+        tpts, state_variables, nodes, modes = self.input_shape
+        fft_length = self._fft_length(tpts)
+
+        ##--------- Spectra of the centered signals, one state variable at a time ---------##
+        spectra = numpy.empty((fft_length // 2 + 1, state_variables, nodes, modes), dtype=numpy.complex128)
+        for var in range(state_variables):
+            data = time_series.read_data_slice((slice(tpts), slice(var, var + 1), slice(nodes), slice(modes)))[:, 0]
+            spectra[:, var] = numpy.fft.rfft(data - data.mean(axis=0), fft_length, axis=0)
+
+        # Offsets kept by correlate(mode="same"): the tpts central ones, out of the 2 * tpts - 1 of the full correlation
+        offsets = numpy.arange(tpts) + (tpts - 1) // 2 - (tpts - 1)
+
+        ##---------- All pairs of a block of nodes at once, streamed along the first node dimension ------------##
+        block_nodes = self._block_nodes()
+        for start in range(0, nodes, block_nodes):
+            block = spectra[:, :, start:start + block_nodes, numpy.newaxis, :]
+            circular = numpy.fft.irfft(block * numpy.conj(spectra[:, :, numpy.newaxis, :, :]), fft_length, axis=0)
+            # (offsets, state variables, node 1, node 2, modes) -> (offsets, node 1, node 2, state variables, modes)
+            cross_corr.store_data_chunk('array_data', circular[offsets % fft_length].transpose((0, 2, 3, 1, 4)),
+                                        grow_dimension=1, close_file=False)
+
+        cross_corr.time = time_series.sample_period * numpy.arange(-numpy.floor(tpts / 2.0), numpy.ceil(tpts / 2.0))
         cross_corr.labels_ordering[1] = time_series.labels_ordering[2]
         cross_corr.labels_ordering[2] = time_series.labels_ordering[2]
         cross_corr.close_file()
@@ -212,9 +243,8 @@ class PearsonCorrelationCoefficientAdapter(ABCAsynchronous):
         :returns: the correlation coefficient for the given time series
         :rtype: `CorrelationCoefficients`
         """
-        not_stored_result = self.algorithm.evaluate()
         result = CorrelationCoefficients(storage_path=self.storage_path, source=time_series)
-        result.array_data = not_stored_result.array_data
+        result.array_data = self._correlation_coefficients(time_series, t_start, t_end)
 
         if isinstance(time_series, TimeSeriesEEG) or isinstance(time_series, TimeSeriesMEG) \
                 or isinstance(time_series, TimeSeriesSEEG):
@@ -223,4 +253,52 @@ class PearsonCorrelationCoefficientAdapter(ABCAsynchronous):
             result.labels_ordering[0] = time_series.labels_ordering[2]
             result.labels_ordering[1] = time_series.labels_ordering[2]
 
-        return result
\ No newline at end of file
+        return result
+
+
+    def _correlation_coefficients(self, time_series, t_start, t_end):
+        """
+        Same as `CorrelationCoefficient.evaluate`, computed for one pair of node blocks at a time: the signals
+        of both blocks are centered and scaled to unit norm, after which their coefficients are one matrix product.
+        Only the signals of two blocks are held in memory, next to the result.
+        """
+        shape = time_series.read_data_shape()
+        nodes = shape[2]
+        t_lo = int((1. / time_series.sample_period) * (t_start - time_series.sample_period))
+        t_hi = int((1. / time_series.sample_period) * (t_end - time_series.sample_period))
+        t_lo = max(t_lo, 0)
+        t_hi = max(t_hi, shape[0])
+        time_slice = slice(t_lo, t_hi + 1)
+        tpts = max(0, min(t_hi + 1, shape[0]) - t_lo)
+        if tpts == 0:
+            raise LaunchException("The interval starting at t_start = %s is past the end of the time series."
+                                  % t_start)
+        block_nodes = int(max(1, node_blocks.BLOCK_MEMORY // (tpts * 8 * 2)))
+        blocks = [slice(start, min(start + block_nodes, nodes)) for start in range(0, nodes, block_nodes)]
+
+        result = numpy.zeros((nodes, nodes, shape[1], shape[3]))
+        for mode in range(shape[3]):
+            for var in range(shape[1]):
+                for i, rows in enumerate(blocks):
+                    rows_signals = self._normalized_signals(time_series, time_slice, var, rows, mode)
+                    for j in range(i, len(blocks)):
+                        columns = blocks[j]
+                        if j == i:
+                            columns_signals = rows_signals
+                        else:
+                            columns_signals = self._normalized_signals(time_series, time_slice, var, columns, mode)
+                        coefficients = numpy.clip(rows_signals.T.dot(columns_signals), -1, 1)
+                        result[rows, columns, var, mode] = coefficients
+                        result[columns, rows, var, mode] = coefficients.T
+        return result
+
+
+    @staticmethod
+    def _normalized_signals(time_series, time_slice, var, nodes_slice, mode):
+        """
+        :returns: the signals of a block of nodes, centered and scaled to unit norm (constant signals become NaN)
+        """
+        data = time_series.read_data_slice((time_slice, var, nodes_slice, mode))
+        data = data - data.mean(axis=0)
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            return data / numpy.sqrt((data ** 2).sum(axis=0))
@@ -36,16 +36,51 @@ Adapter that uses the traits module to generate interfaces for FCD Analyzer.
 
 """
 
+import os
+import tempfile
+import multiprocessing
 import numpy as np
-from tvb.analyzers.fcd_matrix import FcdCalculator
+from numpy import linalg
+from tvb.adapters.analyzers import node_blocks
+from tvb.adapters.analyzers.node_blocks import number_of_processes
+from tvb.adapters.visualizers.stacked_measure import ROW_TITLES
+from tvb.analyzers.fcd_matrix import FcdCalculator, spectral_embedding, epochs_interval
+from tvb.basic.profile import TvbProfile
 from tvb.basic.traits.util import log_debug_array
 from tvb.basic.filters.chain import FilterChain
 from tvb.core.adapters.abcadapter import ABCAsynchronous
 from tvb.core.adapters.exceptions import LaunchException
+from tvb.core.entities.file.hdf5_storage_manager import HDF5StorageManager
 from tvb.datatypes.fcd import Fcd
 from tvb.datatypes.graph import ConnectivityMeasure
 
 
+NUM_EIGENVECTORS = 3
+
+
+
+def _windowed_fc(job):
+    """
+    Compute the FC in consecutive sliding windows, in a worker process which reads the time series file on its own.
+
+    :param job: (storage folder, file name, window starts, window length, state variable, mode)
+    :returns: for each window, the upper triangle of its FC, centered and scaled to unit norm,
+              such that the Pearson correlation of two windows is the dot product of their rows
+    """
+    storage_folder, file_name, starts, sw, var, mode = job
+    first, last = int(starts[0]), int(starts[-1] + sw) + 1
+    data = HDF5StorageManager(storage_folder, file_name).get_data('data', (slice(first, last), var, slice(None), mode))
+    triangle = np.triu_indices(data.shape[1], 1)
+    result = np.empty((len(starts), len(triangle[0])))
+    for idx, start in enumerate(starts):
+        window = data[int(start) - first:int(start + sw) + 1 - first]
+        result[idx] = np.corrcoef(window.T)[triangle]
+    result -= result.mean(axis=1)[:, np.newaxis]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result /= np.sqrt((result ** 2).sum(axis=1))[:, np.newaxis]
+    return result
+
+
 
 class FunctionalConnectivityDynamicsAdapter(ABCAsynchronous):
     """ TVB adapter for calling the Pearson CrossCorrelation algorithm. """
@@ -101,13 +136,43 @@ class FunctionalConnectivityDynamicsAdapter(ABCAsynchronous):
         self.algorithm = FcdCalculator(time_series=time_series, sw=sw, sp=sp)
 
 
+    def _window_parameters(self):
+        """
+        :returns: the sliding window length and the spanning, in time points
+        """
+        sample_period = self.algorithm.time_series.sample_period
+        return float(self.algorithm.sw) / sample_period, float(self.algorithm.sp) / sample_period
+
+
+    def _block_rows(self):
+        """
+        :returns: number of windows whose FC (upper triangles) fits in half of the block memory
+        """
+        nodes = self.input_shape[2]
+        return max(1, int(node_blocks.BLOCK_MEMORY / (2 * 8.0 * max(1, nodes * (nodes - 1) / 2))))
+
+
     def get_required_memory_size(self, **kwargs):
-        # We do not know how much memory is needed.
-        return -1
+        """
+        FCD matrices, the two FC blocks of their product, and for each worker its FC block and time series span.
+        """
+        windows, _, state_variables, modes = self.algorithm.result_shape(self.input_shape)
+        sw, sp = self._window_parameters()
+        block_rows = self._block_rows()
+        processes = number_of_processes(int(np.ceil(windows / float(block_rows))))
+        span_size = ((block_rows - 1) * sp + sw + 1) * self.input_shape[2] * 8.0
+        fcd_size = 2 * windows ** 2 * state_variables * modes * 8.0
+        return fcd_size + node_blocks.BLOCK_MEMORY + processes * (node_blocks.BLOCK_MEMORY / 2 + span_size)
 
 
     def get_required_disk_size(self, **kwargs):
-        return 0
+        """
+        The temporary FC stream, and the FCD results.
+        """
+        windows, _, state_variables, modes = self.algorithm.result_shape(self.input_shape)
+        nodes = self.input_shape[2]
+        fc_stream_size = windows * nodes * (nodes - 1) / 2 * 8.0
+        return self.array_size2kb(fc_stream_size + 2 * windows ** 2 * state_variables * modes * 8.0)
 
 
     def launch(self, time_series, sw, sp):
@@ -123,7 +188,27 @@ class FunctionalConnectivityDynamicsAdapter(ABCAsynchronous):
 
         result = []  # where fcd, fcd_segmented (eventually), and connectivity measures will be stored
 
-        [fcd, fcd_segmented, eigvect_dict, eigval_dict, Connectivity] = self.algorithm.evaluate()
+        self.input_shape = time_series.read_data_shape()
+        result_shape = self.algorithm.result_shape(self.input_shape)
+        sw_points, sp_points = self._window_parameters()
+        starts = [nfcd * sp_points for nfcd in range(result_shape[0])]
+        block_rows = self._block_rows()
+        processes = number_of_processes(int(np.ceil(len(starts) / float(block_rows))))
+
+        fcd = np.zeros(result_shape)
+        pool = multiprocessing.Pool(processes) if processes > 1 else None
+        try:
+            for mode in range(result_shape[3]):
+                for var in range(result_shape[2]):
+                    fcd[:, :, var, mode] = self._compute_fcd(time_series, starts, sw_points, var, mode, pool)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        log_debug_array(self.log, fcd, "FCD")
+
+        fcd_segmented, eigvect_dict, eigval_dict = self._compute_epochs(time_series, fcd, sw_points, sp_points)
+        Connectivity = time_series.connectivity
 
         # Create a Fcd dataType object.
         result_fcd = Fcd(storage_path=self.storage_path, source=time_series, sw=sw, sp=sp)
@@ -134,16 +219,112 @@ class FunctionalConnectivityDynamicsAdapter(ABCAsynchronous):
             result_fcd_segmented = Fcd(storage_path=self.storage_path, source=time_series, sw=sw, sp=sp)
             result_fcd_segmented.array_data = fcd_segmented
             result.append(result_fcd_segmented)
-        for mode in eigvect_dict.keys():
-            for var in eigvect_dict[mode].keys():
-                for ep in eigvect_dict[mode][var].keys():
-                    for eig in range(3):
-                        result_eig = ConnectivityMeasure(storage_path=self.storage_path)
-                        result_eig.connectivity = Connectivity
-                        result_eig.array_data = eigvect_dict[mode][var][ep][eig]
-                        result_eig.title = "Epoch # %d, \n " \
-                                           "eigenvalue = %s,\n " \
-                                           "variable = %s,\n " \
-                                           "mode = %s." % (ep, eigval_dict[mode][var][ep][eig], var, mode)
-                        result.append(result_eig)
+        result.append(self._build_eigenvectors_measure(Connectivity, eigvect_dict, eigval_dict))
         return result
+
+
+    def _build_eigenvectors_measure(self, connectivity, eigvect_dict, eigval_dict):
+        """
+        Stack all the eigenvectors of a run in a single ConnectivityMeasure, with one row per
+        (mode, variable, epoch, eigenvector). The eigenvalue, these indices and a title of each row are stored
+        next to it, in the same file. The measure viewers display one row at a time.
+        """
+        eigenvectors, eigenvalues, indices, titles = [], [], [], []
+        for mode in sorted(eigvect_dict.keys()):
+            for var in sorted(eigvect_dict[mode].keys()):
+                for ep in sorted(eigvect_dict[mode][var].keys()):
+                    for eig in range(NUM_EIGENVECTORS):
+                        eigenvectors.append(eigvect_dict[mode][var][ep][eig])
+                        eigenvalues.append(eigval_dict[mode][var][ep][eig])
+                        indices.append((mode, var, ep, eig))
+                        titles.append("Epoch # %d, \n "
+                                      "eigenvalue = %s,\n "
+                                      "variable = %s,\n "
+                                      "mode = %s." % (ep, eigval_dict[mode][var][ep][eig], var, mode))
+
+        result_eig = ConnectivityMeasure(storage_path=self.storage_path)
+        result_eig.connectivity = connectivity
+        result_eig.array_data = np.array(eigenvectors)
+        result_eig.dimensions_labels = ["Eigenvector", "Region"]
+        result_eig.title = "FCD epochs eigenvectors, %d per epoch" % NUM_EIGENVECTORS
+        result_eig.store_data('eigenvalues', np.array(eigenvalues))
+        result_eig.store_data('eigenvector_indices', np.array(indices, dtype=np.int32))
+        result_eig.store_data(ROW_TITLES, np.array(titles))
+        return result_eig
+
+
+    def _compute_fcd(self, time_series, starts, sw, var, mode, pool):
+        """
+        The windowed FC are computed in chunks (across the pool, when given) and streamed into a temporary
+        file backed array. The FCD is then built block by block, as products of the normalized FC rows.
+        """
+        block_rows = self._block_rows()
+        nodes = self.input_shape[2]
+        jobs = [(time_series.storage_path, time_series.get_storage_file_name(), starts[i:i + block_rows], sw, var, mode)
+                for i in range(0, len(starts), block_rows)]
+
+        file_descriptor, fc_stream_path = tempfile.mkstemp(prefix='fc_stream_', suffix='.dat',
+                                                           dir=TvbProfile.current.TVB_TEMP_FOLDER)
+        os.close(file_descriptor)
+        try:
+            fc_stream = np.memmap(fc_stream_path, dtype=np.float64, mode='w+',
+                                  shape=(len(starts), max(1, nodes * (nodes - 1) // 2)))
+            chunks = pool.imap(_windowed_fc, jobs) if pool is not None else (_windowed_fc(job) for job in jobs)
+            for start_row, chunk in zip(range(0, len(starts), block_rows), chunks):
+                fc_stream[start_row:start_row + len(chunk)] = chunk
+            fc_stream.flush()
+
+            fcd = np.empty((len(starts), len(starts)))
+            for i in range(0, len(starts), block_rows):
+                rows_i = np.array(fc_stream[i:i + block_rows])
+                for j in range(i, len(starts), block_rows):
+                    rows_j = rows_i if j == i else np.array(fc_stream[j:j + block_rows])
+                    block = np.clip(rows_i.dot(rows_j.T), -1, 1)
+                    fcd[i:i + block_rows, j:j + block_rows] = block
+                    fcd[j:j + block_rows, i:i + block_rows] = block.T
+            del fc_stream
+        finally:
+            os.remove(fc_stream_path)
+        return fcd
+
+
+    def _compute_epochs(self, time_series, fcd, sw, sp):
+        """
+        Find the epochs of stability of the FCD (with spectral embedding), and the main eigenvectors of the FC
+        over each epoch, or over the entire time series when at most one epoch is found.
+        """
+        eigvect_dict = {}  # holds eigenvectors of the fcs calculated over the epochs, key1=mode, key2=var, key3=numb ep
+        eigval_dict = {}  # holds eigenvalues of the fcs calculated over the epochs, key1=mode, key2=var, key3=numb ep
+        fcd_segmented = fcd.copy()
+        for mode in range(fcd.shape[3]):
+            eigvect_dict[mode] = {}
+            eigval_dict[mode] = {}
+            for var in range(fcd.shape[2]):
+                eigvect_dict[mode][var] = {}
+                eigval_dict[mode][var] = {}
+                [xir, xir_cutoff] = spectral_embedding(fcd[:, :, var, mode])
+                epochs_extremes = epochs_interval(xir, xir_cutoff, sp, sw)
+                if epochs_extremes.shape[0] <= 1:
+                    # no more than 1 epoch of stability: use the FC over the entire time series
+                    epochs_extremes = np.zeros((2, 2), dtype=float)
+                    epochs_extremes[1, 1] = self.input_shape[0]  # [0,0] set in order to skip the first epoch
+                else:
+                    fcd_segmented[xir > xir_cutoff, :, var, mode] = 1.1
+                    fcd_segmented[:, xir > xir_cutoff, var, mode] = 1.1
+
+                for ep in range(1, epochs_extremes.shape[0]):
+                    eigvect_dict[mode][var][ep] = []
+                    eigval_dict[mode][var][ep] = []
+                    current_slice = (slice(int(epochs_extremes[ep][0]), int(epochs_extremes[ep][1]) + 1),
+                                     slice(var, var + 1), slice(self.input_shape[2]), slice(mode, mode + 1))
+                    data = time_series.read_data_slice(current_slice).squeeze()
+                    eigval_matrix, eigvect_matrix = linalg.eig(np.corrcoef(data.T))
+                    eigval_matrix = np.real(eigval_matrix)
+                    eigvect_matrix = np.real(eigvect_matrix)
+                    eigval_matrix = eigval_matrix / np.sum(np.abs(eigval_matrix))  # normalize eigenvalues to [0, 1)
+                    for _ in range(NUM_EIGENVECTORS):
+                        index = np.argmax(eigval_matrix)
+                        eigvect_dict[mode][var][ep].append(abs(eigvect_matrix[:, index]))
+                        eigval_dict[mode][var][ep].append(eigval_matrix[index])
+                        eigval_matrix[index] = 0
+        return fcd_segmented, eigvect_dict, eigval_dict
@@ -40,6 +40,7 @@ from tvb.analyzers.fmri_balloon import BalloonModel
 from tvb.datatypes.time_series import TimeSeries
 from tvb.datatypes.time_series import TimeSeriesRegion
 from tvb.core.adapters.abcadapter import ABCAsynchronous
+from tvb.adapters.analyzers.node_blocks import block_nodes, evaluate_node_blocks
 from tvb.basic.traits.util import log_debug_array
 from tvb.basic.filters.chain import FilterChain
 from tvb.basic.logger.builder import get_logger
@@ -47,6 +48,22 @@ from tvb.basic.logger.builder import get_logger
 LOG = get_logger(__name__)
 
 
+
+def _bold_nodes(job):
+    """
+    Compute the BOLD signal for a block of nodes, in a worker process.
+
+    :param job: (algorithm parameters, time series sample period, time line, block data)
+    :returns: the BOLD signal, with the nodes on the third dimension
+    """
+    parameters, sample_period, time_line, data = job
+    small_ts = TimeSeries(use_storage=False, sample_period=sample_period, time=time_line, data=data)
+    algorithm = BalloonModel(**parameters)
+    algorithm.time_series = small_ts
+    return algorithm.evaluate().data
+
+
+
 class BalloonModelAdapter(ABCAsynchronous):
     """
     TVB adapter for calling the BalloonModel algorithm.
@@ -104,14 +121,20 @@ class BalloonModelAdapter(ABCAsynchronous):
         self.algorithm.time_series = time_series
 
 
+    def _node_memory(self):
+        """
+        Bytes needed to evaluate one node: its input, the normalised neural activity,
+        the four balloon model state variables and the BOLD signal.
+        """
+        used_shape = (self.input_shape[0], self.input_shape[1], 1, self.input_shape[3])
+        return (numpy.prod(used_shape) + 6 * self.input_shape[0] * self.input_shape[3]) * 8.0
+
+
     def get_required_memory_size(self, **kwargs):
         """
-        Return the required memory to run this algorithm.
+        Return the required memory to run this algorithm: one block of nodes.
         """
-        used_shape = self.input_shape
-        input_size = numpy.prod(used_shape) * 8.0
-        output_size = self.algorithm.result_size(used_shape)
-        return input_size + output_size   
+        return self._node_memory() * block_nodes(self.algorithm.time_series, self._node_memory())
 
 
     def get_required_disk_size(self, **kwargs):
@@ -136,17 +159,14 @@ class BalloonModelAdapter(ABCAsynchronous):
                                        start_time=time_series.start_time,
                                        connectivity=time_series.connectivity)
 
-        ##---------- Iterate over slices and compose final result ------------##
+        parameters = dict(bold_model=bold_model, RBM=RBM, neural_input_transformation=neural_input_transformation)
+        parameters = dict((key, value) for key, value in parameters.items() if value is not None)
+        parameters['dt'] = self.algorithm.dt
 
-        node_slice = [slice(self.input_shape[0]), slice(self.input_shape[1]), None, slice(self.input_shape[3])]
-        small_ts = TimeSeries(use_storage=False, sample_period=time_series.sample_period, time=time_line)
-        
-        for node in range(self.input_shape[2]):
-            node_slice[2] = slice(node, node + 1)
-            small_ts.data = time_series.read_data_slice(tuple(node_slice))
-            self.algorithm.time_series = small_ts
-            partial_bold = self.algorithm.evaluate()
-            bold_signal.write_data_slice(partial_bold.data, grow_dimension=2)
+        ##---------- Iterate over node blocks and compose final result ----------##
+        for partial_bold in evaluate_node_blocks(time_series, self._node_memory(), _bold_nodes,
+                                                 (parameters, time_series.sample_period, time_line)):
+            bold_signal.write_data_slice(partial_bold, grow_dimension=2)
 
         bold_signal.write_time_slice(time_line)
         bold_signal.close_file()
@@ -38,6 +38,7 @@ Adapter that uses the traits module to generate interfaces for FFT Analyzer.
 import psutil
 import numpy
 import math
+from scipy import signal as sp_signal
 import tvb.analyzers.fft as fft
 import tvb.core.adapters.abcadapter as abcadapter
 import tvb.basic.filters.chain as entities_filter
@@ -113,11 +114,33 @@ class FourierAdapter(abcadapter.ABCAsynchronous):
         LOG.debug("Using detrend  is %s" % (str(self.algorithm.detrend)))
 
 
+    def _segments(self, input_shape):
+        """
+        Split the time axis in overlapping segments, the same way the FFT algorithm does.
+
+        :returns: the number of time points in a segment and the first time point of each segment,
+                  or None when the whole time series fits in one segment
+        """
+        sample_period = self.algorithm.time_series.sample_period
+        nseg = int(math.ceil(input_shape[0] * sample_period / self.algorithm.segment_length))
+        if nseg <= 1:
+            return None
+        seg_tpts = int(math.ceil(self.algorithm.segment_length / sample_period))
+        overlap = (seg_tpts * nseg - input_shape[0]) / (nseg - 1.0)
+        starts = [int(max(seg * (seg_tpts - overlap), 0)) for seg in range(nseg)]
+        return seg_tpts, starts
+
+
     def get_required_memory_size(self, **kwargs):
         """
         Returns the required memory to be able to run the adapter.
         """
         input_shape = self.algorithm.time_series.read_data_shape()
+        segments = self._segments(input_shape)
+        if segments is not None:
+            # One segment in memory, its complex spectrum with amplitude, phase and power, and the power sum
+            segment_size = segments[0] * numpy.prod(input_shape[1:]) * 8.0
+            return segment_size * (1 + 2.5 + 0.5) + segment_size / 2
         input_size = numpy.prod(input_shape) * 8.0
         output_size = self.algorithm.result_size(input_shape, self.algorithm.segment_length,
                                                  self.algorithm.time_series.sample_period)
@@ -152,6 +175,10 @@ class FourierAdapter(abcadapter.ABCAsynchronous):
 
         """
         shape = time_series.read_data_shape()
+        segments = self._segments(shape)
+        if segments is not None:
+            return self._launch_streaming(time_series, window_function, *segments)
+
         block_size = int(math.floor(time_series.read_data_shape()[2] / self.memory_factor))
         blocks = int(math.ceil(time_series.read_data_shape()[2] / block_size))
         
@@ -184,3 +211,48 @@ class FourierAdapter(abcadapter.ABCAsynchronous):
         return spectra
 
 
+    def _launch_streaming(self, time_series, window_function, seg_tpts, starts):
+        """
+        Welch like path: read one (overlapping) segment of all nodes at a time, store its spectrum along the
+        segments dimension, and accumulate the power, for the averages to be written once at the end.
+        The result is the same as `FFT.evaluate` on the full time series, with memory bound by the segment length.
+        """
+        shape = time_series.read_data_shape()
+        spectra = spectral.FourierSpectrum(source=time_series,
+                                           segment_length=self.algorithm.segment_length,
+                                           windowing_function=str(window_function),
+                                           storage_path=self.storage_path)
+        nfreq = seg_tpts // 2
+        if nfreq == 0:
+            self.add_operation_additional_info(
+                "Fourier produced empty result (most probably due to a very short input TimeSeries).")
+            return None
+
+        window_mask = None
+        if self.algorithm.window_function != [None]:
+            window_function = fft.SUPPORTED_WINDOWING_FUNCTIONS[self.algorithm.window_function[0]]
+            window_mask = numpy.reshape(window_function(seg_tpts), (seg_tpts, 1, 1, 1))
+
+        power_sum = 0
+        for start in starts:
+            segment = time_series.read_data_slice((slice(start, start + seg_tpts), slice(shape[1]),
+                                                   slice(shape[2]), slice(shape[3])))
+            if self.algorithm.detrend:
+                segment = sp_signal.detrend(segment, axis=0)
+            if window_mask is not None:
+                segment = segment * window_mask
+
+            result = numpy.fft.fft(segment, axis=0)[1:nfreq + 1, :, :, :, numpy.newaxis]
+            power = numpy.abs(result) ** 2
+            spectra.store_data_chunk('array_data', result, grow_dimension=4, close_file=False)
+            spectra.store_data_chunk('amplitude', numpy.abs(result), grow_dimension=4, close_file=False)
+            spectra.store_data_chunk('phase', numpy.angle(result), grow_dimension=4, close_file=False)
+            spectra.store_data_chunk('power', power, grow_dimension=4, close_file=False)
+            power_sum = power_sum + power[..., 0]
+
+        average_power = power_sum / len(starts)
+        spectra.store_data_chunk('average_power', average_power, grow_dimension=2, close_file=False)
+        spectra.store_data_chunk('normalised_average_power', average_power / numpy.sum(average_power, axis=0),
+                                 grow_dimension=2, close_file=False)
+        spectra.close_file()
+        return spectra
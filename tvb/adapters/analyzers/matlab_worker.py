@@ -34,19 +34,143 @@ This module implements a class for executing arbitray MATLAB code
 Conversion between Python types and MATLAB types is handled and dependent
 on scipy.io's loadmat and savemat function.
 
+With Octave, the code is sent over a pipe to long-lived interpreter processes,
+kept in a SessionPool, so that consecutive calls pay the interpreter startup once.
+The pools live in the current process only: operations launched asynchronously,
+each in its own process, do not share sessions.
+
 .. moduleauthor:: Marmaduke Woodman <Marmaduke@tvb.invalid>
 .. moduleauthor:: Stuart A. Knock <Stuart@tvb.invalid>
 """
 
 import os
 import time
+import atexit
 import random
 import tempfile
+import threading
+from subprocess import Popen, PIPE, STDOUT
 from scipy.io import loadmat, savemat
 from tvb.basic.profile import TvbProfile
 from tvb.core.utils import MATLAB, OCTAVE, matlab_cmd
 
 
+OCTAVE_SESSION_OPTIONS = ['--quiet', '--no-window-system']
+# Seconds a block of code may run in a pooled session, before the session is killed
+OCTAVE_SESSION_TIMEOUT = 3600
+
+
+
+class InterpreterSession(object):
+    """
+    A long-lived interpreter process, reading commands from its stdin.
+    After each block of commands it is asked to print a marker line, which tells us the block has finished.
+    """
+
+    def __init__(self, command):
+        self.process = Popen(command, stdin=PIPE, stdout=PIPE, stderr=STDOUT, universal_newlines=True)
+        self.timed_out = False
+
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+
+    def run(self, code, timeout=None):
+        """
+        Send a block of code to the interpreter and wait for it to finish.
+        When it does not finish within timeout seconds, the interpreter is killed and IOError is raised.
+        :returns: the output printed by the interpreter while running the code
+        """
+        marker = "done%s" % hex(random.randint(0, 2 ** 32))
+        self.process.stdin.write(code + "\ndisp('%s');\nfflush(stdout);\n" % marker)
+        self.process.stdin.flush()
+
+        # Killing the process closes its stdout, which unblocks the readline below
+        watchdog = None
+        if timeout is not None:
+            watchdog = threading.Timer(timeout, self._expire)
+            watchdog.daemon = True
+            watchdog.start()
+
+        log_lines = []
+        try:
+            while True:
+                line = self.process.stdout.readline()
+                if not line:
+                    self.process.wait()
+                    if self.timed_out:
+                        raise IOError("Interpreter session did not finish within %s seconds. Log: %s"
+                                      % (timeout, "".join(log_lines)))
+                    raise IOError("Interpreter session exited with code %s. Log: %s"
+                                  % (self.process.poll(), "".join(log_lines)))
+                if line.strip() == marker:
+                    return "".join(log_lines)
+                log_lines.append(line)
+        finally:
+            if watchdog is not None:
+                watchdog.cancel()
+
+
+    def _expire(self):
+        if self.is_alive():
+            self.timed_out = True
+            self.process.kill()
+
+
+    def close(self):
+        if self.is_alive():
+            try:
+                self.process.stdin.write("\nexit\n")
+                self.process.stdin.close()
+            except IOError:
+                pass
+            self.process.wait()
+
+
+
+class SessionPool(object):
+    """
+    Keeps at most max_idle interpreter sessions alive between calls.
+    Sessions are started on demand, so concurrent callers never wait for each other.
+    """
+
+    def __init__(self, command, max_idle=2):
+        self.command = command
+        self.max_idle = max_idle
+        self.started = 0
+        self._idle = []
+        self._lock = threading.Lock()
+
+
+    def acquire(self):
+        with self._lock:
+            while self._idle:
+                session = self._idle.pop()
+                if session.is_alive():
+                    return session
+            self.started += 1
+        return InterpreterSession(self.command)
+
+
+    def release(self, session):
+        """
+        Give a session back to the pool. Sessions which have died, or are in excess, are dropped.
+        """
+        with self._lock:
+            if session.is_alive() and len(self._idle) < self.max_idle:
+                self._idle.append(session)
+                return
+        session.close()
+
+
+    def close(self):
+        with self._lock:
+            sessions, self._idle = self._idle, []
+        for session in sessions:
+            session.close()
+
+
 
 class MatlabWorker(object):
     """
@@ -58,10 +182,13 @@ class MatlabWorker(object):
     """
 
     matlab_paths = []
+    _session_pools = {}
+    session_timeout = OCTAVE_SESSION_TIMEOUT
 
 
-    def __init__(self):
+    def __init__(self, session_pool=None):
         self.mlab_exe = TvbProfile.current.MATLAB_EXECUTABLE
+        self._session_pool = session_pool
         self.hex = hex(random.randint(0, 2 ** 32))
         self.script_name = "script%s" % self.hex
         self.script_fname = self.script_name + '.m'
@@ -89,7 +216,7 @@ class MatlabWorker(object):
         2. set the hexstamp variable in MATLAB
         3. save all working files
         """
-        catch = "\ncatch e\nexception%s = e\nend\n" % self.hex
+        catch = self._matlab_catch()
         save_clause = ""
         if MATLAB in self.mlab_exe:
             save_clause = "hexstamp = '%s'\nsave %s -V7\nsave %s -V7 hexstamp\nquit"
@@ -98,6 +225,24 @@ class MatlabWorker(object):
         return catch + save_clause % (self.hex, self.wkspc_name, self.done_name)
 
 
+    def _matlab_catch(self):
+        return "\ncatch e\nexception%s = e\nend\n" % self.hex
+
+
+    def session_pool(self):
+        """
+        :returns: the SessionPool to run code in, or None when each call should start its own interpreter.
+                  Only Octave sessions are pooled by default.
+        """
+        if self._session_pool is None and self.mlab_exe and OCTAVE in os.path.basename(self.mlab_exe):
+            if self.mlab_exe not in MatlabWorker._session_pools:
+                pool = SessionPool([self.mlab_exe] + OCTAVE_SESSION_OPTIONS)
+                atexit.register(pool.close)
+                MatlabWorker._session_pools[self.mlab_exe] = pool
+            self._session_pool = MatlabWorker._session_pools[self.mlab_exe]
+        return self._session_pool
+
+
     def cleanup(self):
         """
         Make sure Matlab is closed after execution.
@@ -138,8 +283,12 @@ class MatlabWorker(object):
         os.chdir(wdir)
         os.chdir(work_dir or os.getcwd())
 
-        pre, post = self._matlab_pre(), self._matlab_post()
         code = ("\nsuccess%s = 0\n" + code + "\nsuccess%s = 1\n") % (self.hex, self.hex)
+        pool = self.session_pool()
+        if pool is not None:
+            return self._matlab_in_session(pool, code, data, cleanup)
+
+        pre, post = self._matlab_pre(), self._matlab_post()
 
         if data:
             pre += "\nload %s\n" % self.wkspc_name
@@ -159,3 +308,30 @@ class MatlabWorker(object):
             self.cleanup()
         return pre + code + post, logtext, retdata
 
+
+    def _matlab_in_session(self, pool, code, data, cleanup):
+        """
+        Run code in a pooled interpreter. Data is still exchanged through a .mat file,
+        but the code goes over the pipe and completion is signaled on stdout.
+        The file path is absolute, as the interpreter was started in another working directory.
+        """
+        wkspc_path = os.path.abspath(self.wkspc_fname)
+        pre = "\nclear\n" + self._matlab_pre()
+        if data:
+            pre += "\nload('%s')\n" % wkspc_path
+            savemat(wkspc_path, data, format="5")
+        post = self._matlab_catch() + "hexstamp = '%s'\nsave('%s', '-V7')\n" % (self.hex, wkspc_path)
+
+        session = pool.acquire()
+        try:
+            logtext = session.run(pre + code + post, self.session_timeout)
+        finally:
+            pool.release(session)
+        retdata = loadmat(wkspc_path, squeeze_me=True)
+
+        if cleanup:
+            try:
+                os.remove(wkspc_path)
+            except Exception:
+                pass
+        return pre + code + post, logtext, retdata
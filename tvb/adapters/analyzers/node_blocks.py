@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Iterate the nodes of a 4D (time, state variable, node, mode) time series in blocks, for the analyzers
+which evaluate their algorithm on each node independently.
+
+A block is read at once, spans whole storage chunks along the node dimension, and is evaluated
+across a local pool of processes, each worker receiving a consecutive part of its nodes.
+
+The memory budget of a block and the number of worker processes are shared with the other analyzers
+computing their results in blocks (FCD, cross-correlation).
+
+"""
+
+import multiprocessing
+import numpy
+from tvb.basic.profile import TvbProfile
+from tvb.core.entities.file.hdf5_storage_manager import HDF5StorageManager
+
+
+# Bytes held in memory at once by an analyzer working in blocks (of nodes, or of windows),
+# for the input of a block together with the values computed from it
+BLOCK_MEMORY = 128 * 2 ** 20
+
+
+
+def number_of_processes(tasks):
+    """
+    Share the local cores with the other operations allowed to run at the same time.
+    """
+    cores = max(1, multiprocessing.cpu_count() // TvbProfile.current.MAX_THREADS_NUMBER)
+    return max(1, min(cores, tasks))
+
+
+
+def block_nodes(time_series, node_memory):
+    """
+    :param time_series: a stored 4D time series
+    :param node_memory: bytes needed to evaluate one node: its input, together with its results
+    :returns: the number of nodes in a block, a multiple of the node extent of the chunks of the time series data
+    """
+    nodes = time_series.read_data_shape()[2]
+    chunks = HDF5StorageManager(time_series.storage_path,
+                                time_series.get_storage_file_name()).get_data_chunks('data', ignore_errors=True)
+    chunk_nodes = chunks[2] if chunks else 1
+    block = int(BLOCK_MEMORY // max(node_memory, 1)) // chunk_nodes * chunk_nodes
+    return max(1, min(nodes, max(chunk_nodes, block)))
+
+
+
+def evaluate_node_blocks(time_series, node_memory, worker, arguments=()):
+    """
+    Evaluate `worker` on all the nodes of a time series, one block of nodes at a time.
+
+    :param worker: a module level function, called with a tuple: `arguments` followed by a part of a block,
+                   and returning the results for the nodes of that part, on the third dimension
+    :returns: a generator of the results for each block, in node order
+    """
+    nodes = time_series.read_data_shape()[2]
+    block = block_nodes(time_series, node_memory)
+    processes = number_of_processes(block)
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    try:
+        for start in range(0, nodes, block):
+            data = time_series.read_data_slice((slice(None), slice(None), slice(start, min(start + block, nodes)),
+                                                slice(None)))
+            jobs = [tuple(arguments) + (part,) for part in numpy.array_split(data, processes, axis=2)
+                    if part.shape[2] > 0]
+            results = pool.map(worker, jobs) if pool is not None else [worker(job) for job in jobs]
+            yield numpy.concatenate(results, axis=2)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
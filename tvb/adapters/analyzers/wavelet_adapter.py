@@ -42,6 +42,7 @@ from tvb.analyzers.wavelet import ContinuousWaveletTransform
 from tvb.datatypes.time_series import TimeSeries
 from tvb.datatypes.spectral import WaveletCoefficients
 from tvb.core.adapters.abcadapter import ABCAsynchronous
+from tvb.adapters.analyzers.node_blocks import block_nodes, evaluate_node_blocks
 from tvb.basic.traits.types_basic import Range
 from tvb.basic.traits.util import log_debug_array
 from tvb.basic.filters.chain import FilterChain
@@ -50,6 +51,24 @@ from tvb.basic.logger.builder import get_logger
 LOG = get_logger(__name__)
 
 
+
+def _wavelet_nodes(job):
+    """
+    Compute the wavelet coefficients for a block of nodes, in a worker process.
+
+    :param job: (algorithm parameters, frequency range as a dictionary, time series sample rate and period, block data)
+    :returns: the complex coefficients, with the nodes on the fourth dimension
+    """
+    parameters, frequencies, sample_rate, sample_period, data = job
+    small_ts = TimeSeries(use_storage=False, data=data)
+    small_ts.sample_rate = sample_rate
+    small_ts.sample_period = sample_period
+    algorithm = ContinuousWaveletTransform(frequencies=Range(**frequencies), **parameters)
+    algorithm.time_series = small_ts
+    return algorithm.evaluate().array_data
+
+
+
 class ContinuousWaveletTransformAdapter(ABCAsynchronous):
     """
     TVB adapter for calling the ContinuousWaveletTransform algorithm.
@@ -110,14 +129,19 @@ class ContinuousWaveletTransformAdapter(ABCAsynchronous):
         self.algorithm.time_series = time_series
 
 
-    def get_required_memory_size(self, **kwargs):
+    def _node_memory(self):
         """
-        Return the required memory to run this algorithm.
+        Bytes needed to evaluate one node: its input and its coefficients, with amplitude, phase and power.
         """
         used_shape = (self.input_shape[0], self.input_shape[1], 1, self.input_shape[3])
-        input_size = numpy.prod(used_shape) * 8.0
-        output_size = self.algorithm.result_size(used_shape)
-        return input_size + output_size   
+        return numpy.prod(used_shape) * 8.0 + 2.5 * self.algorithm.result_size(used_shape)
+
+
+    def get_required_memory_size(self, **kwargs):
+        """
+        Return the required memory to run this algorithm: one block of nodes.
+        """
+        return self._node_memory() * block_nodes(self.algorithm.time_series, self._node_memory())
 
 
     def get_required_disk_size(self, **kwargs):
@@ -142,18 +166,20 @@ class ContinuousWaveletTransformAdapter(ABCAsynchronous):
                                       normalisation=self.algorithm.normalisation, storage_path=self.storage_path)
         
         ##------------- NOTE: Assumes 4D, Simulator timeSeries. --------------##
-        node_slice = [slice(self.input_shape[0]), slice(self.input_shape[1]), None, slice(self.input_shape[3])]
-        
-        ##---------- Iterate over slices and compose final result ------------##
-        small_ts = TimeSeries(use_storage=False)
-        small_ts.sample_rate = time_series.sample_rate
-        small_ts.sample_period = time_series.sample_period
-        for node in range(self.input_shape[2]):
-            node_slice[2] = slice(node, node + 1)
-            small_ts.data = time_series.read_data_slice(tuple(node_slice))
-            self.algorithm.time_series = small_ts
-            partial_wavelet = self.algorithm.evaluate()
-            wavelet.write_data_slice(partial_wavelet)
+        parameters = dict(mother=mother, sample_period=sample_period, normalisation=normalisation, q_ratio=q_ratio)
+        parameters = dict((key, value) for key, value in parameters.items() if value is not None)
+        frequency_range = dict(lo=self.algorithm.frequencies.lo, hi=self.algorithm.frequencies.hi,
+                               step=self.algorithm.frequencies.step)
+
+        ##---------- Iterate over node blocks and compose final result ----------##
+        for coefficients in evaluate_node_blocks(time_series, self._node_memory(), _wavelet_nodes,
+                                                 (parameters, frequency_range, time_series.sample_rate,
+                                                  time_series.sample_period)):
+            # Nodes are appended on the third dimension, after their state variables, as one node at a time did
+            shape = coefficients.shape
+            coefficients = coefficients.transpose((0, 1, 3, 2, 4)).reshape((shape[0], shape[1], shape[2] * shape[3],
+                                                                           1, shape[4]))
+            wavelet.write_data_slice(WaveletCoefficients(array_data=coefficients, use_storage=False))
         
         wavelet.close_file()
         return wavelet
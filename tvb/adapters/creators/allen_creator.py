@@ -131,15 +131,18 @@ class AllenConnectomeBuilder(ABCAsynchronous):
         # grab the StructureTree instance
         structure_tree = cache.get_structure_tree()
 
+        # relabel the annotation volume once; structure volumes and centres are then read from its statistics
+        annotation = AnnotationIndex(vol, structure_tree)
+
         # rotate template in the TVB 3D reference:
         template = rotate_reference(template)
 
         # the method includes in the parcellation only brain regions whose volume is greater than vol_thresh
-        projmaps = areas_volume_threshold(cache, projmaps, vol_thresh, resolution)
+        projmaps = areas_volume_threshold(annotation, projmaps, vol_thresh, resolution)
 
         # the method includes in the parcellation only brain regions where at least one injection experiment
         # had infected more than N voxel (where N is inf_vox_thresh)
-        projmaps = areas_voxel_threshold(cache, projmaps, inf_vox_thresh, vol, structure_tree)
+        projmaps = areas_voxel_threshold(cache, projmaps, inf_vox_thresh, annotation)
 
         # the method creates file order and keyword that will be the link between the SC order and the
         # id key in the Allen database
@@ -149,18 +152,19 @@ class AllenConnectomeBuilder(ABCAsynchronous):
         structural_conn = construct_structural_conn(projmaps, order, key_ord)
 
         # the method returns the coordinate of the centres and the name of the brain areas in the selected parcellation
-        [centres, names] = construct_centres(cache, order, key_ord)
+        [centres, names] = construct_centres(annotation, order, key_ord)
 
         # the method returns the tract lengths between the brain areas in the selected parcellation
         tract_lengths = construct_tract_lengths(centres)
 
         # the method associated the parent and the grandparents to the child in the selected parcellation with
         # the biggest volume
-        [unique_parents, unique_grandparents] = parents_and_grandparents_finder(cache, order, key_ord, structure_tree)
+        [unique_parents, unique_grandparents] = parents_and_grandparents_finder(annotation, order, key_ord,
+                                                                                structure_tree)
 
         # the method returns a volume indexed between 0 and N-1, with N=tot brain areas in the parcellation.
         # -1=background and areas that are not in the parcellation
-        vol_parcel = mouse_brain_visualizer(vol, order, key_ord, unique_parents, unique_grandparents,
+        vol_parcel = mouse_brain_visualizer(annotation, order, key_ord, unique_parents, unique_grandparents,
                                             structure_tree, projmaps)
 
         # results: Connectivity, Volume & RegionVolumeMapping
@@ -196,6 +200,91 @@ class AllenConnectomeBuilder(ABCAsynchronous):
         return -1
 
 
+class AnnotationIndex(object):
+    """
+    The annotation volume relabeled once, on the sorted list of the structure ids it contains,
+    together with per label voxel counts and (right hemisphere) coordinate sums.
+    Structure volumes, centres and the parcellation volume are then computed from these statistics and
+    lookup tables, without another pass over the volume for each structure.
+    As for the structure masks of the Allen cache, a structure covers its own label and the labels of
+    all its descendants.
+    """
+
+    def __init__(self, vol, structure_tree):
+        self.shape = vol.shape
+        self.structure_tree = structure_tree
+        self.labels, inverse = np.unique(vol, return_inverse=True)
+        self.label_volume = inverse.reshape(vol.shape)
+        nr_labels = len(self.labels)
+        self.voxel_counts = np.bincount(self.label_volume.ravel(), minlength=nr_labels)
+
+        # the right hemisphere is the first half of the Allen z axis
+        right = self.label_volume[:, :, :self.shape[2] / 2]
+        self.right_voxel_counts = np.zeros(nr_labels, dtype=np.int64)
+        self.right_coordinate_sums = np.zeros((nr_labels, 3))
+        y_grid, z_grid = np.indices(right.shape[1:])
+        y_grid, z_grid = y_grid.ravel(), z_grid.ravel()
+        for x in range(right.shape[0]):
+            slab = right[x].ravel()
+            slab_counts = np.bincount(slab, minlength=nr_labels)
+            self.right_voxel_counts += slab_counts
+            self.right_coordinate_sums[:, 0] += x * slab_counts
+            self.right_coordinate_sums[:, 1] += np.bincount(slab, y_grid, nr_labels)
+            self.right_coordinate_sums[:, 2] += np.bincount(slab, z_grid, nr_labels)
+
+
+    def label_index(self, structure_ids):
+        """
+        :returns: the label indices of the given structure ids, -1 for those not in the volume
+        """
+        structure_ids = np.asarray(structure_ids)
+        indices = np.searchsorted(self.labels, structure_ids).clip(0, len(self.labels) - 1)
+        return np.where(self.labels[indices] == structure_ids, indices, -1)
+
+
+    def structure_labels(self, structure_id):
+        """
+        :returns: the label indices of the structure and of its descendants
+        """
+        indices = self.label_index(self.structure_tree.descendant_ids([structure_id])[0])
+        return indices[indices >= 0]
+
+
+    def voxel_count(self, structure_id):
+        return self.voxel_counts[self.structure_labels(structure_id)].sum()
+
+
+    def right_centre(self, structure_id):
+        """
+        :returns: the centre of the structure in the right hemisphere, in the TVB reference (see rotate_reference)
+                  or [0, 0, 0] when the structure is not in that hemisphere
+        """
+        labels = self.structure_labels(structure_id)
+        count = self.right_voxel_counts[labels].sum()
+        if count == 0:
+            return [0, 0, 0]
+        x_mean, y_mean, z_mean = self.right_coordinate_sums[labels].sum(axis=0) / count
+        return [z_mean, x_mean, self.shape[1] - 1 - y_mean]
+
+
+    def injection_fractions(self, inj_f):
+        """
+        :returns: the sum of the injection fractions over the voxels of each label (negative values are ignored)
+        """
+        return np.bincount(self.label_volume.ravel(), np.clip(inj_f, 0, None).ravel(), len(self.labels))
+
+
+
+def _filter_targets(projmap, structure_ids):
+    """
+    Keep only the target columns (and matrix columns) of the given structures
+    """
+    keep = [index for index, column in enumerate(projmap['columns']) if column['structure_id'] in structure_ids]
+    projmap['columns'] = [projmap['columns'][index] for index in keep]
+    projmap['matrix'] = projmap['matrix'][:, keep]
+
+
+
 # the method creates a dictionary with information about which experiments need to be downloaded
 def dictionary_builder(tvb_mcc, transgenic_line):
     # open up a list of all of the experiments
@@ -266,15 +355,9 @@ def pms_cleaner(projmaps):
             del projmaps[inj_id]
     # 3) All the target sites are also injection sites? if not remove those targets from the columns and from the matrix
     if len(sis0) != len(projmaps.keys()):
-        for inj_id in range(len(projmaps.values())):
-            targ_id = -1
-            while len(projmaps.values()[inj_id]['columns']) != (3 * len(projmaps.keys())):
-                # there is -3 since for each id-target I have 3 regions since I have 3 hemisphere to consider
-                targ_id += 1
-                if projmaps.values()[inj_id]['columns'][targ_id]['structure_id'] not in projmaps.keys():
-                    del projmaps.values()[inj_id]['columns'][targ_id]
-                    projmaps.values()[inj_id]['matrix'] = np.delete(projmaps.values()[inj_id]['matrix'], targ_id, 1)
-                    targ_id = -1
+        # for each id-target there are 3 columns, since there are 3 hemispheres to consider
+        for projmap in projmaps.values():
+            _filter_targets(projmap, projmaps)
     # 4) Exclude the areas that have NaN values (in all the experiments)
     nan_id = {}
     for inj_id in projmaps.keys():
@@ -322,30 +405,23 @@ def pms_cleaner(projmaps):
     return projmaps
 
 
-def areas_volume_threshold(tvb_mcc, projmaps, vol_thresh, resolution):
+def areas_volume_threshold(annotation, projmaps, vol_thresh, resolution):
     """
     the method includes in the parcellation only brain regions whose volume is greater than vol_thresh
     """
     threshold = vol_thresh / (resolution ** 3)
     id_ok = []
     for ID in projmaps.keys():
-        mask, _ = tvb_mcc.get_structure_mask(ID)
-        tot_voxels = (np.count_nonzero(mask)) / 2  # mask contains both left and right hemisphere
+        tot_voxels = annotation.voxel_count(ID) / 2  # the volume contains both left and right hemisphere
         if tot_voxels > threshold:
             id_ok.append(ID)
             # Remove areas that are not in id_ok from the injection list
     for checkid in projmaps.keys():
         if checkid not in id_ok:
             projmaps.pop(checkid, None)
-    # Remove areas that are not in id_ok from target list (columns+matrix)
-    for inj_id in range(len(projmaps.values())):
-        targ_id = -1
-        while len(projmaps.values()[inj_id]['columns']) != (len(id_ok) * 3):  # I have 3 hemispheres
-            targ_id += 1
-            if projmaps.values()[inj_id]['columns'][targ_id]['structure_id'] not in id_ok:
-                del projmaps.values()[inj_id]['columns'][targ_id]
-                projmaps.values()[inj_id]['matrix'] = np.delete(projmaps.values()[inj_id]['matrix'], targ_id, 1)
-                targ_id = -1
+    # Remove areas that are not in id_ok from target list (columns+matrix), there are 3 hemispheres
+    for projmap in projmaps.values():
+        _filter_targets(projmap, id_ok)
     return projmaps
 
 
@@ -354,53 +430,31 @@ def areas_volume_threshold(tvb_mcc, projmaps, vol_thresh, resolution):
 # what can be download is the Injection fraction: fraction of pixels belonging to manually annotated injection site
 # (http://help.brain-map.org/display/mouseconnectivity/API)
 # when this fraction is greater than inf_vox_thresh that area is included in the parcellation
-def areas_voxel_threshold(tvb_mcc, projmaps, inf_vox_thresh, vol, structure_tree):
+def areas_voxel_threshold(tvb_mcc, projmaps, inf_vox_thresh, annotation):
+    structure_tree = annotation.structure_tree
+    # injection fraction sums per annotation label, for each experiment downloaded so far
+    experiment_fractions = {}
     id_ok = []
     for ID in projmaps.keys():
+        # the infected voxels of the area itself and of its direct children are taken into account
+        area_labels = annotation.label_index([ID] + [child['id'] for child in structure_tree.children([ID])[0]])
+        area_labels = area_labels[area_labels >= 0]
         for exp in projmaps[ID]['rows']:
-            inj_f, inf_info = tvb_mcc.get_injection_fraction(exp)
-            inj_voxels = np.where(inj_f >= 0)  # coordinates of the injected voxels with inj fraction >= 0
-            id_infected = vol[inj_voxels]  # id of area located in Vol where injf >= 0
-            #  (thus the id of the infected structure)
-            myid_infected = np.where(id_infected == ID)
-            inj_f_id = 0  # fraction of injected voxels for the ID I am currently examining
-            for index in myid_infected[0]:
-                inj_f_id += inj_f[inj_voxels[0][index], inj_voxels[1][index], inj_voxels[2][index]]
-                if inj_f_id >= inf_vox_thresh:
-                    break
+            if exp not in experiment_fractions:
+                inj_f, inf_info = tvb_mcc.get_injection_fraction(exp)
+                experiment_fractions[exp] = annotation.injection_fractions(inj_f)
+            # fraction of injected voxels (with inj fraction >= 0) for the ID I am currently examining
+            inj_f_id = experiment_fractions[exp][area_labels].sum()
             if inj_f_id >= inf_vox_thresh:
                 id_ok.append(ID)
                 break
-            else:  # check for child of that area
-                child = []
-                for ii in range(len(structure_tree.children([ID])[0])):
-                    child.append(structure_tree.children([ID])[0][ii]['id'])
-                while len(child) != 0:
-                    myid_infected = np.where(id_infected == child[0])
-                    if len(myid_infected[0]) != 0:
-                        for index in myid_infected[0]:
-                            inj_f_id += inj_f[inj_voxels[0][index], inj_voxels[1][index], inj_voxels[2][index]]
-                            if inj_f_id >= inf_vox_thresh:
-                                break
-                        if inj_f_id >= inf_vox_thresh:
-                            id_ok.append(ID)
-                            break
-                    child.remove(child[0])
-            if inj_f_id >= inf_vox_thresh:
-                break
     # Remove areas that are not in id_ok from the injection list
     for checkid in projmaps.keys():
         if checkid not in id_ok:
             projmaps.pop(checkid, None)
-    # Remove areas that are not in id_ok from target list (columns+matrix)
-    for indexinj in range(len(projmaps.values())):
-        indextarg = -1
-        while len(projmaps.values()[indexinj]['columns']) != (len(id_ok) * 3):  # I have 3 hemispheres
-            indextarg += 1
-            if projmaps.values()[indexinj]['columns'][indextarg]['structure_id'] not in id_ok:
-                del projmaps.values()[indexinj]['columns'][indextarg]
-                projmaps.values()[indexinj]['matrix'] = np.delete(projmaps.values()[indexinj]['matrix'], indextarg, 1)
-                indextarg = -1
+    # Remove areas that are not in id_ok from target list (columns+matrix), there are 3 hemispheres
+    for projmap in projmaps.values():
+        _filter_targets(projmap, id_ok)
     return projmaps
 
 
@@ -424,39 +478,19 @@ def create_file_order(projmaps, structure_tree):
 def construct_structural_conn(projmaps, order, key_ord):
     len_right = len(projmaps.keys())
     structural_conn = np.zeros((len_right, 2 * len_right), dtype=float)
-    row = -1
-    for graph_ord_inj in key_ord:
-        row += 1
+    # SC column of each target structure id
+    column_of = dict((order[graph_ord_targ][0], col) for col, graph_ord_targ in enumerate(key_ord))
+    for row, graph_ord_inj in enumerate(key_ord):
         inj_id = order[graph_ord_inj][0]
         target = projmaps[inj_id]['columns']
-        matrix = projmaps[inj_id]['matrix']
-        # average on the experiments (NB: if there are NaN values not average!)
-        if np.isnan(np.sum(matrix)):
-            matrix_temp = np.zeros((matrix.shape[1], 1), dtype=float)
-            for i in range(matrix.shape[1]):
-                if np.isnan(sum(matrix[:, i])):
-                    occ = 0
-                    for jj in range(matrix.shape[0]):
-                        if matrix[jj, i] == matrix[jj, i]:  # since nan!=nan
-                            occ += 1
-                            matrix_temp[i, 0] = matrix_temp[i, 0] + matrix[jj, i]
-                    matrix_temp[i, 0] = matrix_temp[i, 0] / occ
-                else:
-                    matrix_temp[i, 0] = sum(matrix[:, i]) / matrix.shape[0]
-            matrix = matrix_temp
-        else:
-            matrix = (np.array([sum(matrix[:, i]) for i in range(matrix.shape[1])]) / (matrix.shape[0]))
-        # order the target
-        col = -1
-        for graph_ord_targ in key_ord:
-            col += 1
-            targ_id = order[graph_ord_targ][0]
-            for index in range(len(target)):
-                if target[index]['structure_id'] == targ_id:
-                    if target[index]['hemisphere_id'] == 2:
-                        structural_conn[row, col] = matrix[index]
-                    if target[index]['hemisphere_id'] == 1:
-                        structural_conn[row, col + len_right] = matrix[index]
+        # average on the experiments (NB: NaN values are left out of the average)
+        matrix = np.nanmean(projmaps[inj_id]['matrix'], axis=0)
+        # order the target: right hemisphere (id 2) in the first half, left hemisphere (id 1) in the second half
+        columns = np.array([column_of.get(targ['structure_id'], -1) for targ in target], dtype=int)
+        hemispheres = np.array([targ['hemisphere_id'] for targ in target])
+        for hemisphere_id, offset in [(2, 0), (1, len_right)]:
+            selected = (columns >= 0) & (hemispheres == hemisphere_id)
+            structural_conn[row, columns[selected] + offset] = matrix[selected]
     # save the complete matrix (both left and right inj):
     first_quarter = structural_conn[:, :(structural_conn.shape[1] / 2)]
     second_quarter = structural_conn[:, (structural_conn.shape[1] / 2):]
@@ -467,52 +501,27 @@ def construct_structural_conn(projmaps, order, key_ord):
 
 
 # the method returns the centres of the brain areas in the selected parcellation
-def construct_centres(tvb_mcc, order, key_ord):
+def construct_centres(annotation, order, key_ord):
     centres = np.zeros((len(key_ord) * 2, 3), dtype=float)
     names = []
-    row = -1
-    for graph_ord_inj in key_ord:
+    for row, graph_ord_inj in enumerate(key_ord):
         node_id = order[graph_ord_inj][0]
-        coord = [0, 0, 0]
-        mask, _ = tvb_mcc.get_structure_mask(node_id)
-        mask = rotate_reference(mask)
-        mask_r = mask[:mask.shape[0] / 2, :, :]
-        xyz = np.where(mask_r)
-        if xyz[0].shape[0] > 0:  # Check if the area is in the annotation volume
-            coord[0] = np.mean(xyz[0])
-            coord[1] = np.mean(xyz[1])
-            coord[2] = np.mean(xyz[2])
-        row += 1
+        coord = annotation.right_centre(node_id)
         centres[row, :] = coord
-        coord[0] = (mask.shape[0]) - coord[0]
+        # mirror on the hemispheres axis (the Allen z axis is the first axis in the TVB reference)
+        coord[0] = annotation.shape[2] - coord[0]
         centres[row + len(key_ord), :] = coord
-        n = order[graph_ord_inj][1]
-        right = 'Right '
-        right += n
-        right = str(right)
-        names.append(right)
+        names.append(str('Right ' + order[graph_ord_inj][1]))
     for graph_ord_inj in key_ord:
-        n = order[graph_ord_inj][1]
-        left = 'Left '
-        left += n
-        left = str(left)
-        names.append(left)
+        names.append(str('Left ' + order[graph_ord_inj][1]))
     return centres, names
 
 
 # the method returns the tract lengths between the brain areas in the selected parcellation
 def construct_tract_lengths(centres):
     len_right = len(centres) / 2
-    tracts = np.zeros((len_right, len(centres)), dtype=float)
-    for inj in range(len_right):
-        center_inj = centres[inj]
-        for targ in range(len_right):
-            targ_r = centres[targ]
-            targ_l = centres[targ + len_right]
-            tracts[inj, targ] = np.sqrt(
-                (center_inj[0] - targ_r[0]) ** 2 + (center_inj[1] - targ_r[1]) ** 2 + (center_inj[2] - targ_r[2]) ** 2)
-            tracts[inj, targ + len_right] = np.sqrt(
-                (center_inj[0] - targ_l[0]) ** 2 + (center_inj[1] - targ_l[1]) ** 2 + (center_inj[2] - targ_l[2]) ** 2)
+    # distances from the right areas to all the areas (right first, then left)
+    tracts = np.sqrt(np.sum((centres[:len_right, np.newaxis, :] - centres[np.newaxis, :, :]) ** 2, axis=2))
     # Save the complete matrix (both left and right inj):
     first_quarter = tracts[:, :(tracts.shape[1] / 2)]
     second_quarter = tracts[:, (tracts.shape[1] / 2):]
@@ -530,7 +539,7 @@ def construct_tract_lengths(centres):
 # In order to have an univocal relation, since some areas in the parcellation have some parent
 # for each parent it will be link the child with the biggest volume in the parcellation
 # the same is done for the grandparents
-def parents_and_grandparents_finder(tvb_mcc, order, key_ord, structure_tree):
+def parents_and_grandparents_finder(annotation, order, key_ord, structure_tree):
     parents = []  # Here it will be the id of the parents of the areas in the parcellation
     grandparents = []  # Here it will be the id of the grandparents of the areas in the parcellation
     vol_areas = []  # Here it will be the volume of the areas in the parcellation
@@ -542,9 +551,7 @@ def parents_and_grandparents_finder(tvb_mcc, order, key_ord, structure_tree):
         grandparents.append(structure_tree.get_structures_by_id([node_id])[0]['structure_id_path'][-3])
         vec_index.append(index)
         index += 1
-        mask, _ = tvb_mcc.get_structure_mask(node_id)
-        tot_voxels = np.count_nonzero(mask)
-        vol_areas.append(tot_voxels)
+        vol_areas.append(annotation.voxel_count(node_id))
     # I will order parents, grandparents, vec_index according to the volume of the areas
     parents = [parents for (vv, parents) in sorted(zip(vol_areas, parents))]
     grandparents = [grandparents for (vv, grandparents) in sorted(zip(vol_areas, grandparents))]
@@ -567,87 +574,47 @@ def parents_and_grandparents_finder(tvb_mcc, order, key_ord, structure_tree):
     return unique_parents, unique_gradparents
 
 
-def mouse_brain_visualizer(vol, order, key_ord, unique_parents, unique_grandparents, structure_tree, projmaps):
+def mouse_brain_visualizer(annotation, order, key_ord, unique_parents, unique_grandparents, structure_tree, projmaps):
     """
     the method returns a volume indexed between 0 and N-1, with N=tot brain areas in the parcellation.
     -1=background and areas that are not in the parcellation
+    The region of each annotation label is decided once, in lookup tables for the right and left hemisphere,
+    which are then applied to the relabeled annotation volume.
     """
-    tot_areas = len(key_ord) * 2
-    indexed_vec = np.arange(tot_areas).reshape(tot_areas, )
-    # vec indexed between 0 and (N-1), with N=total number of area in the parcellation
-    indexed_vec = indexed_vec + 1  # vec indexed between 1 and N
-    indexed_vec = indexed_vec * (10 ** (-(1 + int(np.log10(tot_areas)))))
-    # vec indexed between 0 and 0,N (now all the entries of vec_indexed are < 1 in order to not create confusion
-    # with the entry of Vol (always greater than 1)
-    vol_r = vol[:, :, :(vol.shape[2] / 2)]
-    vol_r = vol_r.astype(np.float64)
-    vol_l = vol[:, :, (vol.shape[2] / 2):]
-    vol_l = vol_l.astype(np.float64)
-    index_vec = 0  # this is the index of the vector
-    left = len(indexed_vec) / 2
-    for graph_ord_inj in key_ord:
+    left = len(key_ord)
+    # region index (in the right hemisphere) of each annotation label, -1 when not in the parcellation
+    label_region = np.full(len(annotation.labels), -1, dtype=int)
+    in_right = annotation.right_voxel_counts > 0
+
+    # the areas in the parcellation and their children which are not in the parcellation.
+    # Labels that appear only in the left hemisphere are left to the ancestor search below.
+    for index_vec, graph_ord_inj in enumerate(key_ord):
         node_id = order[graph_ord_inj][0]
-        if node_id in vol_r:  # check if the area is in the annotation volume
-            vol_r[vol_r == node_id] = indexed_vec[index_vec]
-            vol_l[vol_l == node_id] = indexed_vec[index_vec + left]
-        child = []
-        for ii in range(len(structure_tree.children([node_id])[0])):
-            child.append(structure_tree.children([node_id])[0][ii]['id'])
-        while len(child) != 0:
-            if (child[0] in vol_r) and (child[0] not in projmaps.keys()):
-                vol_r[vol_r == child[0]] = indexed_vec[index_vec]
-                vol_l[vol_l == child[0]] = indexed_vec[index_vec + left]
-            child.remove(child[0])
-        index_vec += 1  # index of vector
-    vol_parcel = np.concatenate((vol_r, vol_l), axis=2)
+        structure_ids = [node_id] + [child['id'] for child in structure_tree.children([node_id])[0]
+                                     if child['id'] not in projmaps.keys()]
+        for label in annotation.label_index(structure_ids):
+            if label >= 0 and in_right[label] and label_region[label] == -1:
+                label_region[label] = index_vec
+
     # Since the parcellation is reduced some areas are in the annotation volume but not in the parcellation,
     # so it is possible to plot also those areas with trick explained in ParentsAndGrandPArentsFinder
-    # Parents:
-    bool_idx = (vol_parcel > np.amax(indexed_vec))
-    # Find the elements of vol_parcel that are yet not associated to a value of the indexed_vec in the parcellation
-    not_assigned = np.unique(vol_parcel[bool_idx])
-    vol_r = vol_parcel[:, :, :(vol.shape[2] / 2)]
-    vol_r = vol_r.astype(np.float64)
-    vol_l = vol_parcel[:, :, (vol.shape[2] / 2):]
-    vol_l = vol_l.astype(np.float64)
-    for node_id in not_assigned:
-        node_id = int(node_id)
-        ancestor = structure_tree.get_structures_by_id([node_id])[0]['structure_id_path']
-        while len(ancestor) > 0:
-            pp = ancestor[-1]
-            if pp in unique_parents.keys():
-                vol_r[vol_r == node_id] = indexed_vec[unique_parents[pp]]
-                vol_l[vol_l == node_id] = indexed_vec[unique_parents[pp] + left]
-                ancestor = []
-            else:
-                ancestor.remove(pp)
-    vol_parcel = np.concatenate((vol_r, vol_l), axis=2)
-    # Grand parents:
-    bool_idx = (vol_parcel > np.amax(indexed_vec))
-    # Find the elements of vol_parcel that are yet not associated to a value of the indexed_vec in the parcellation
-    not_assigned = np.unique(vol_parcel[bool_idx])
-    vol_r = vol_parcel[:, :, :(vol.shape[2] / 2)]
-    vol_r = vol_r.astype(np.float64)
-    vol_l = vol_parcel[:, :, (vol.shape[2] / 2):]
-    vol_l = vol_l.astype(np.float64)
-    for node_id in not_assigned:
-        node_id = int(node_id)
-        ancestor = structure_tree.get_structures_by_id([node_id])[0]['structure_id_path']
-        while len(ancestor) > 0:
-            pp = ancestor[-1]
-            if pp in unique_grandparents.keys():
-                vol_r[vol_r == node_id] = indexed_vec[unique_parents[pp]]
-                vol_l[vol_l == node_id] = indexed_vec[unique_parents[pp] + left]
-                ancestor = []
-            else:
-                ancestor.remove(pp)
-    vol_parcel = np.concatenate((vol_r, vol_l), axis=2)
-    vol_parcel[vol_parcel >= 1] = 0  # set all the areas not in the parcellation to 0 since the background is zero
-    vol_parcel = vol_parcel * (10 ** (1 + int(np.log10(tot_areas))))  # return to indexed between
-    # 1 and N (with N=tot number of areas in the parcellation)
-    vol_parcel = vol_parcel - 1  # with this operation background and areas not in parcellation will be -1
-    # and all the others with the indexed between 0 and N-1
-    vol_parcel = np.round(vol_parcel)
+    for ancestors_map in [unique_parents, unique_grandparents]:
+        for label in np.nonzero(label_region == -1)[0]:
+            node_id = int(annotation.labels[label])
+            if node_id == 0:
+                continue  # background
+            for pp in reversed(structure_tree.get_structures_by_id([node_id])[0]['structure_id_path']):
+                if pp in ancestors_map.keys():
+                    # NB: the region of a grandparent is also read from unique_parents
+                    label_region[label] = unique_parents[pp]
+                    break
+
+    right_lut = label_region
+    left_lut = np.where(label_region >= 0, label_region + left, -1)
+    half = annotation.shape[2] / 2
+    vol_parcel = np.empty(annotation.shape, dtype=float)
+    vol_parcel[:, :, :half] = right_lut[annotation.label_volume[:, :, :half]]
+    vol_parcel[:, :, half:] = left_lut[annotation.label_volume[:, :, half:]]
     vol_parcel = rotate_reference(vol_parcel)
     return vol_parcel
 
@@ -655,13 +622,5 @@ def mouse_brain_visualizer(vol, order, key_ord, unique_parents, unique_grandpare
 # the method rotate the Allen 3D (x1,y1,z1) reference in the TVB 3D reference (x2,y2,z2).
 # the relation between the different reference system is: x1=z2, y1=x2, z1=y2
 def rotate_reference(allen):
-    # first rotation in order to obtain: x1=x2, y1=z2, z1=y2
-    vol_trans = np.zeros((allen.shape[0], allen.shape[2], allen.shape[1]), dtype=float)
-    for x in range(allen.shape[0]):
-        vol_trans[x, :, :] = (allen[x, :, :][::-1]).transpose()
-
-    # second rotation in order to obtain: x1=z2, y1=x1, z1=y2
-    allen_rotate = np.zeros((allen.shape[2], allen.shape[0], allen.shape[1]), dtype=float)
-    for y in range(allen.shape[1]):
-        allen_rotate[:, :, y] = (vol_trans[:, :, y]).transpose()
-    return allen_rotate
+    # first flip the Allen y axis, then move the axes in order to obtain: x1=z2, y1=x2, z1=y2
+    return np.ascontiguousarray(np.transpose(allen[:, ::-1, :], (2, 0, 1)), dtype=float)
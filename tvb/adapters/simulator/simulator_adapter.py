@@ -283,6 +283,10 @@ class SimulatorAdapter(ABCAsynchronous):
                 ts.labels_dimensions[state_variable_dimension_name] = selected_vois
 
             ts.start_time = start_time
+            # Zoomed-out views will page from a decimated min/max copy of the data,
+            # and take the ranges of the channels from their statistics
+            ts.configure_min_max_pyramid('data')
+            ts.configure_channel_statistics('data')
             result_datatypes[m_name] = ts
 
         #### Create Simulator State entity and persist it in DB. H5 file will be empty now.
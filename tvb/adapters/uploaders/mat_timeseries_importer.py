@@ -128,6 +128,7 @@ class MatTimeSeriesImporter(ABCUploader):
             ts.write_time_slice(numpy.r_[:data.shape[0]] * ts.sample_period)
             # we expect empirical data shape to be time, channel.
             # But tvb expects time, state, channel, mode. Introduce those dimensions
+            ts.configure_channel_statistics('data')
             ts.write_data_slice(data[:, numpy.newaxis, :, numpy.newaxis])
             ts.close_file()
 
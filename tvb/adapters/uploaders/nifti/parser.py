@@ -34,6 +34,7 @@
 """
 
 import os
+import numpy
 import nibabel as nib
 from tvb.basic.logger.builder import get_logger
 from tvb.core.adapters.exceptions import ParseException
@@ -45,6 +46,9 @@ class NIFTIParser():
     This class reads content of a NIFTI file and writes a 4D array [time, x, y, z].
     """
 
+    # Upper bound (in bytes) for one block of time points read from the NIFTI file and appended in our storage
+    MAX_BLOCK_SIZE = 128 * 1024 * 1024
+
 
     def __init__(self, data_file):
 
@@ -78,21 +82,42 @@ class NIFTIParser():
 
 
 
-    def parse(self, result_dt, keep_result_4d=True):
+    def compute_time_block_size(self, max_block_size=None):
+        """
+        :returns: how many time points can be read at once, without exceeding max_block_size bytes in memory.
+        """
+        max_block_size = max_block_size or self.MAX_BLOCK_SIZE
+        shape = self.nifti_image.shape
+        # Scaling (scl_slope / scl_inter) might promote stored values to float64
+        item_size = max(numpy.dtype(self.nifti_image.get_data_dtype()).itemsize, numpy.dtype(numpy.float64).itemsize)
+        time_point_size = item_size * int(numpy.prod([dim for idx, dim in enumerate(shape) if idx != 3]))
+        # One block is read as [x, y, z, time], then copied contiguously as [time, x, y, z]
+        return int(max(1, min(self.time_dim_size, max_block_size // (2 * time_point_size))))
+
+
+    def parse(self, result_dt, keep_result_4d=True, max_block_size=None):
         """
         Parse NIFTI file and write in result_dt a 4D or 3D array [time*, x, y, z].
+
+        Time points are streamed through nibabel's array proxy in blocks of at most max_block_size bytes,
+        so the NIFTI volume is never fully loaded in memory, and the storage gets a few large appends.
         """
 
         # Copy data from NIFTI file to our TVB storage
         # In NIFTI format time is the 4th dimension, while our TimeSeries has
         # it as first dimension, so we have to adapt imported data
 
-        nifti_data = self.nifti_image.get_data()
+        nifti_proxy = self.nifti_image.dataobj
 
         if self.has_time_dimension:
-            for i in range(self.time_dim_size):
-                result_dt.write_data_slice([nifti_data[:, :, :, i, ...]])
+            block_size = self.compute_time_block_size(max_block_size)
+            for start in range(0, self.time_dim_size, block_size):
+                end = min(start + block_size, self.time_dim_size)
+                block = numpy.asarray(nifti_proxy[:, :, :, start:end, ...])
+                result_dt.write_data_slice(numpy.ascontiguousarray(numpy.rollaxis(block, 3)))
+                del block
         else:
+            nifti_data = numpy.asarray(nifti_proxy)
             if keep_result_4d:
                 result_dt.write_data_slice([nifti_data])
             else:
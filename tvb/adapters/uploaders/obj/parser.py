@@ -34,6 +34,8 @@ Handlers for reading/writing from/into OBJ format Surfaces are defined in this m
 .. moduleauthor:: Mihai Andrei <mihai.andrei@codemart.ro>
 """
 
+import warnings
+import numpy
 from tvb.basic.logger.builder import get_logger
 
 
@@ -109,8 +111,118 @@ class ObjParser(object):
 
 
 
+class UnsupportedObjFeature(Exception):
+    """
+    Raised by the BulkObjParser for files outside the subset it handles.
+    The caller is expected to fall back to the line based ObjParser.
+    """
+
+
+
+class BulkObjParser(object):
+    """
+    Vectorized reader for the common subset of wavefront obj files:
+    3 component vertices and normals, triangular faces, with the same vertex info format ("v", "v/t", "v//n" or
+    "v/t/n") in all of them and positive indices. Lines of other types (groups, materials, ...) are ignored.
+    Anything else (polygons, mixed face formats, relative indices, w components, inline comments ...)
+    raises UnsupportedObjFeature.
+
+    ``self.vertices``, ``self.normals``, ``self.tex_coords`` are ndarrays with a vector per row.
+    ``self.triangles`` is a (n, 3) array of vertex indices, ``self.triangle_normals`` a (n, 3) array of normal
+    indices, or None if the faces reference no normals. Indices are 0 based.
+    """
+
+
+    def __init__(self):
+        self.vertices = None
+        self.normals = None
+        self.tex_coords = None
+        self.triangles = None
+        self.triangle_normals = None
+
+
+    @staticmethod
+    def _parse_numbers(lines, dtype, columns):
+        """
+        Parse all the given lines at once, as a (len(lines), columns) array.
+        """
+        if not lines:
+            return numpy.zeros((0, columns), dtype=dtype)
+        try:
+            with warnings.catch_warnings():
+                # numpy warns (or raises, in newer versions) when the text can not be parsed to its end
+                warnings.simplefilter("ignore")
+                data = numpy.fromstring(' '.join(lines), dtype=dtype, sep=' ')
+        except ValueError:
+            raise UnsupportedObjFeature("Values which are not numbers")
+        if data.size != len(lines) * columns:
+            raise UnsupportedObjFeature("Expected %d values per line" % columns)
+        return data.reshape((len(lines), columns))
+
+
+    def _parse_faces(self, lines):
+        if not lines:
+            raise UnsupportedObjFeature("No faces")
+        first = lines[0].split()
+        if len(first) != 3:
+            raise UnsupportedObjFeature("Only triangular faces are supported")
+
+        vertex_info = first[0]
+        slashes, double_slashes = vertex_info.count('/'), vertex_info.count('//')
+        if slashes > 2:
+            raise UnsupportedObjFeature("Unknown face format %s" % vertex_info)
+        content = ' '.join(lines)
+        # All faces should have the format of the first one. The value count checks the rest.
+        if (content.count('/') != slashes * 3 * len(lines) or
+                content.count('//') != double_slashes * 3 * len(lines)):
+            raise UnsupportedObjFeature("Mixed face formats")
+
+        columns = 1 + slashes - double_slashes
+        indices = self._parse_numbers([content.replace('/', ' ')], numpy.int64, columns * 3 * len(lines))
+        indices = indices.reshape((len(lines), 3, columns))
+        if indices.size and indices.min() < 1:
+            raise UnsupportedObjFeature("Relative or zero indices")
+        indices -= 1
+
+        self.triangles = indices[:, :, 0]
+        if double_slashes:
+            self.triangle_normals = indices[:, :, 1]
+        elif slashes == 2:
+            self.triangle_normals = indices[:, :, 2]
+
+
+    def read(self, content):
+        """
+        :param content: the whole obj file, as a string
+        """
+        if '\t' in content or '\n ' in content or content.startswith(' '):
+            raise UnsupportedObjFeature("Tabs or indented lines")
+        lines = content.splitlines()
+
+        self.vertices = self._parse_numbers([line[2:] for line in lines if line.startswith('v ')], numpy.float64, 3)
+        self.normals = self._parse_numbers([line[3:] for line in lines if line.startswith('vn ')], numpy.float64, 3)
+        tex_coords = [line[3:] for line in lines if line.startswith('vt ')]
+        if tex_coords:
+            columns = len(tex_coords[0].split())
+            if columns not in (2, 3):
+                raise UnsupportedObjFeature("Texture coordinates with %d components" % columns)
+            self.tex_coords = self._parse_numbers(tex_coords, numpy.float64, columns)
+        else:
+            self.tex_coords = numpy.zeros((0, 2))
+        self._parse_faces([line[2:] for line in lines if line.startswith('f ')])
+
+        if self.triangles.max() >= len(self.vertices):
+            raise ValueError("Face references a missing vertex")
+        if self.triangle_normals is not None and self.triangle_normals.max() >= len(self.normals):
+            raise ValueError("Face references a missing normal")
+
+
+
 class ObjWriter(object):
 
+    WRITE_BLOCK_ROWS = 50000
+    "Rows formatted at once by the vectorized writer"
+
     def __init__(self, obj_file):
         self.logger = get_logger(__name__)
         self.file = obj_file
@@ -133,6 +245,32 @@ class ObjWriter(object):
         self.file.write('f %s \n' % ' '.join(fs))
 
 
+    def _write_vectors(self, type_code, vectors):
+        """
+        Write a (n, 3) array, formatting a block of rows with a single string operation.
+        """
+        if len(vectors) == 0:
+            return
+        line_format = type_code + ' %s %s %s\n'
+        for start in range(0, len(vectors), self.WRITE_BLOCK_ROWS):
+            block = vectors[start:start + self.WRITE_BLOCK_ROWS]
+            self.file.write((line_format * len(block)) % tuple(block.ravel().tolist()))
+
+
+    def _write_faces(self, faces, write_normals):
+        if len(faces) == 0:
+            return
+        faces = faces.astype(numpy.int64) + 1
+        if write_normals:
+            line_format = 'f %d//%d %d//%d %d//%d \n'
+            faces = faces.repeat(2, axis=1)
+        else:
+            line_format = 'f %d %d %d \n'
+        for start in range(0, len(faces), self.WRITE_BLOCK_ROWS):
+            block = faces[start:start + self.WRITE_BLOCK_ROWS]
+            self.file.write((line_format * len(block)) % tuple(block.ravel().tolist()))
+
+
     def write(self, vertices, faces, normals=None, comment=''):
         """
         :param vertices:, :param normals: are lists of vectors or ndarrays of shape (n,3)
@@ -140,6 +278,21 @@ class ObjWriter(object):
         Normal indices not supported. Texture uv's not supported.
         This method does not yet validate the input, so send valid data.
         """
+        vertices, faces = numpy.asarray(vertices), numpy.asarray(faces)
+        if normals is not None:
+            normals = numpy.asarray(normals)
+
+        if vertices.ndim == 2 and vertices.shape[1] == 3 and faces.ndim == 2 and faces.shape[1] == 3 and (
+                normals is None or (normals.ndim == 2 and normals.shape[1] == 3)):
+            self.file.write('# %s\n' % comment)
+            self._write_vectors('v', vertices)
+            self.file.write('\n')
+            if normals is not None:
+                self._write_vectors('vn', normals)
+                self.file.write('\n')
+            self._write_faces(faces, normals is not None)
+            return
+
         self.file.write('# %s\n' % comment)
         for v in vertices:
             self._write_vector('v', v)
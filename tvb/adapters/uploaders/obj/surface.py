@@ -33,7 +33,7 @@
 """
 
 import numpy as np
-from tvb.adapters.uploaders.obj.parser import ObjParser
+from tvb.adapters.uploaders.obj.parser import ObjParser, BulkObjParser, UnsupportedObjFeature
 from tvb.basic.logger.builder import get_logger
 from tvb.core.adapters.exceptions import ParseException
 
@@ -52,27 +52,14 @@ class ObjSurface(object):
         self.logger = get_logger(__name__)
 
         try:
-            obj = ObjParser()
-            obj.read(obj_file)
-
-            self.triangles = []
-            self.vertices = obj.vertices
-            self.normals = [(0.0, 0.0, 0.0)] * len(self.vertices)
-            self.have_normals = len(obj.normals)
-
-            for face in obj.faces:
-                triangles = self._triangulate(face)
-                for v_idx, t_idx, n_idx in triangles:
-                    self.triangles.append(v_idx)
-                    if n_idx != -1:
-                        # last normal index wins
-                        # alternative: self.normals[v_idx] += obj.normals[n_idx]
-                        # The correct behaviour is to duplicate the vertex
-                        # self.vertices.append(self.vertices[v_idx])
-                        # self.tex_coords.append(self.tex_coords[v_idx])
-                        self.normals[v_idx] = obj.normals[n_idx]
+            content = obj_file.read()
+            try:
+                self._read_bulk(content)
+            except UnsupportedObjFeature as ex:
+                self.logger.info("Falling back to the line parser for this obj: %s" % ex)
+                self._read_lines(content.splitlines())
             # checks
-            if not self.vertices or not self.triangles:
+            if len(self.vertices) == 0 or len(self.triangles) == 0:
                 raise ParseException("No geometry data in file.")
             self._to_numpy()
         except ValueError as ex:
@@ -80,6 +67,44 @@ class ObjSurface(object):
             raise ParseException(str(ex))
 
 
+    def _read_bulk(self, content):
+        """
+        Vectorized read, for the usual triangle meshes.
+        """
+        obj = BulkObjParser()
+        obj.read(content)
+
+        self.vertices = obj.vertices
+        self.triangles = obj.triangles
+        self.have_normals = len(obj.normals)
+        self.normals = np.zeros_like(self.vertices)
+        if obj.triangle_normals is not None:
+            # as in _read_lines the last normal index of a vertex wins
+            self.normals[self.triangles.ravel()] = obj.normals[obj.triangle_normals.ravel()]
+
+
+    def _read_lines(self, lines):
+        obj = ObjParser()
+        obj.read(lines)
+
+        self.triangles = []
+        self.vertices = obj.vertices
+        self.normals = [(0.0, 0.0, 0.0)] * len(self.vertices)
+        self.have_normals = len(obj.normals)
+
+        for face in obj.faces:
+            triangles = self._triangulate(face)
+            for v_idx, t_idx, n_idx in triangles:
+                self.triangles.append(v_idx)
+                if n_idx != -1:
+                    # last normal index wins
+                    # alternative: self.normals[v_idx] += obj.normals[n_idx]
+                    # The correct behaviour is to duplicate the vertex
+                    # self.vertices.append(self.vertices[v_idx])
+                    # self.tex_coords.append(self.tex_coords[v_idx])
+                    self.normals[v_idx] = obj.normals[n_idx]
+
+
     def _triangulate(self, face):
         """
         Triangulate a quad. Higher order will get truncated.
@@ -96,11 +121,10 @@ class ObjSurface(object):
         self.vertices = np.array(self.vertices)
 
         if self.have_normals:
-            self.normals = np.array(self.normals)
+            self.normals = np.array(self.normals, dtype=np.float64)
             # normalise to unit vectors
-            for k in range(len(self.normals)):
-                self.normals[k, :] = self.normals[k, :] / np.sqrt(np.sum(self.normals[k, :] ** 2, axis=0))
+            self.normals /= np.sqrt(np.sum(self.normals ** 2, axis=1))[:, np.newaxis]
         else:
             self.normals = None
 
-        self.triangles = np.array(self.triangles).reshape((len(self.triangles) / 3, 3))
+        self.triangles = np.array(self.triangles).reshape((-1, 3))
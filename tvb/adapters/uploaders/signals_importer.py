@@ -89,6 +89,7 @@ class FieldTripUploader(ABCUploader):
         dat = mat['dat'].T[:, numpy.newaxis, :, numpy.newaxis]
 
         # write data
+        ts.configure_channel_statistics('data')
         ts.write_data_slice(dat)
 
         # fill in header info
@@ -182,6 +183,7 @@ class VHDR(ABCUploader):
             storage_path=self.storage_path
         )
         dat = self.data.T[:, numpy.newaxis, :, numpy.newaxis]
+        ts.configure_channel_statistics('data')
         ts.write_data_slice(dat)
         ts.length_1d, ts.length_2d, ts.length_3d, ts.length_4d = dat.shape
         ts.labels_ordering = 'Time 1 Channel 1'.split()
@@ -261,6 +263,7 @@ class EEGLAB(ABCUploader):
         dat = self.data.T[:, numpy.newaxis, :, numpy.newaxis]
 
         # write data
+        ts.configure_channel_statistics('data')
         ts.write_data_slice(dat)
 
         # fill in header info
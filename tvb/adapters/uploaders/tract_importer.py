@@ -62,6 +62,8 @@ class _TrackImporterBase(ABCUploader):
     _ui_description = "Import tracts"
 
     READ_CHUNK = 4*1024
+    # Region volume maps up to this number of voxels are read in memory at once, bigger ones in slabs of this size
+    MAX_RMAP_BLOCK = 256*256*256
 
     def get_upload_input_tree(self):
         return [{'name': 'data_file', 'type': 'upload', 'required_type': '.trk',
@@ -74,31 +76,48 @@ class _TrackImporterBase(ABCUploader):
         return [Tracts]
 
 
-    def _get_tract_region(self, start_vertex):
-        # Map to voxel index space
+    def _to_voxel_indices(self, start_vertices):
+        """
+        Map tract start vertices to voxel indices in the region volume map.
+        """
         # Lacking any affine matrix between these, we assume they are in the same geometric space
         # What remains is to map geometry to the discrete region volume mapping indices
-        x_plane, y_plane, z_plane = [int(i) for i in start_vertex]
+        voxels = numpy.asarray(start_vertices).astype(numpy.int32).reshape((-1, 3))
 
-        if not (0 <= x_plane < self.region_volume_shape[0] and
-                0 <= y_plane < self.region_volume_shape[1] and
-                0 <= z_plane < self.region_volume_shape[2]):
+        if not (numpy.all(voxels >= 0) and numpy.all(voxels < numpy.array(self.region_volume_shape[:3]))):
             raise IndexError('vertices outside the region volume map cube')
+        return voxels
+
+
+    def _get_tract_regions(self, voxels):
+        """
+        Look up the regions of all the given voxel indices at once.
+        """
+        if len(voxels) == 0:
+            return numpy.array([], dtype=numpy.int16)
 
         # in memory data set
         if self.full_rmap_cache is not None:
-            region_id = self.full_rmap_cache[x_plane, y_plane, z_plane]
-            return region_id
+            return self.full_rmap_cache[voxels[:, 0], voxels[:, 1], voxels[:, 2]]
 
-        # not in memory have to go to disk
-        slices = slice(x_plane, x_plane + 1), slice(y_plane, y_plane + 1), slice(z_plane, z_plane + 1)
-        region_id = self.region_volume.read_data_slice(slices)[0, 0, 0]
-        return region_id
+        # not in memory, read from disk only the x slabs which contain start points, each of them once
+        a, b, c = self.region_volume_shape[:3]
+        slab_size = max(1, self.MAX_RMAP_BLOCK // (b * c))
+        slab_indices = voxels[:, 0] // slab_size
+        regions = numpy.zeros(len(voxels), dtype=numpy.int16)
+
+        for slab_idx in numpy.unique(slab_indices):
+            x_start = slab_idx * slab_size
+            slices = slice(x_start, min(x_start + slab_size, a)), slice(b), slice(c)
+            slab = self.region_volume.read_data_slice(slices)
+            in_slab = slab_indices == slab_idx
+            regions[in_slab] = slab[voxels[in_slab, 0] - x_start, voxels[in_slab, 1], voxels[in_slab, 2]]
+        return regions
 
 
     def _attempt_to_cache_regionmap(self, region_volume):
         a, b, c = region_volume.read_data_shape()
-        if a*b*c <= 256*256*256:
+        if a*b*c <= self.MAX_RMAP_BLOCK:
             # read all
             slices = slice(a), slice(b), slice(c)
             self.full_rmap_cache = region_volume.read_data_slice(slices)
@@ -114,8 +133,8 @@ class _TrackImporterBase(ABCUploader):
 
         if region_volume is not None:
             self._attempt_to_cache_regionmap(region_volume)
-            # this is called here and not in _get_tract_region because it goes to disk to get this info
-            # which would massively dominate the runtime of the import
+            # this is read here, once per import, and not in _to_voxel_indices for every chunk of tracts,
+            # because it goes to disk to get this info
             self.region_volume_shape = region_volume.read_data_shape()
 
         datatype = Tracts()
@@ -124,6 +143,15 @@ class _TrackImporterBase(ABCUploader):
         return datatype
 
 
+    def _compute_tract_region(self, start_voxels):
+        """
+        :param start_voxels: list of chunks of tract start voxel indices, as returned by _to_voxel_indices
+        """
+        if not start_voxels:
+            return numpy.array([], dtype=numpy.int16)
+        return numpy.asarray(self._get_tract_regions(numpy.concatenate(start_voxels)), dtype=numpy.int16)
+
+
 class _SpaceTransform(object):
     """
     Performs voxel to TVB space transformation
@@ -173,7 +201,7 @@ class TrackvizTractsImporter(_TrackImporterBase):
 
         vox2ras = _SpaceTransform(hdr)
         tract_start_indices = [0]
-        tract_region = []
+        start_voxels = []
 
         # we process tracts in bigger chunks to optimize disk write costs
         for tract_bundle in chunk_iter(tract_gen, self.READ_CHUNK):
@@ -181,8 +209,8 @@ class TrackvizTractsImporter(_TrackImporterBase):
 
             for tr in tract_bundle:
                 tract_start_indices.append(tract_start_indices[-1] + len(tr))
-                if region_volume is not None:
-                    tract_region.append(self._get_tract_region(tr[0]))
+            if region_volume is not None:
+                start_voxels.append(self._to_voxel_indices([tr[0] for tr in tract_bundle]))
 
             vertices = numpy.concatenate(tract_bundle) # in voxel space
             vertices = vox2ras.transform(vertices)
@@ -190,7 +218,7 @@ class TrackvizTractsImporter(_TrackImporterBase):
             datatype.store_data_chunk("vertices", vertices, grow_dimension=0, close_file=False)
 
         datatype.tract_start_idx = tract_start_indices
-        datatype.tract_region = numpy.array(tract_region, dtype=numpy.int16)
+        datatype.tract_region = self._compute_tract_region(start_voxels)
         return datatype
 
 
@@ -213,22 +241,28 @@ class ZipTxtTractsImporter(_TrackImporterBase):
         datatype = self._base_before_launch(data_file, region_volume)
 
         tract_start_indices = [0]
-        tract_region = []
+        start_voxels = []
 
         with TvbZip(data_file) as zipf:
-            for tractf in sorted(zipf.namelist()): # one track per file
-                if not tractf.endswith('.txt'): # omit directories and other non track files
-                    continue
-                vertices_file = zipf.open(tractf)
-                tract_vertices = numpy.loadtxt(vertices_file, dtype=numpy.float32)
-
-                tract_start_indices.append(tract_start_indices[-1] + len(tract_vertices))
-                datatype.store_data_chunk("vertices", tract_vertices, grow_dimension=0, close_file=False)
+            # one track per file; omit directories and other non track files
+            tract_files = [tractf for tractf in sorted(zipf.namelist()) if tractf.endswith('.txt')]
+
+            # we aggregate tracts in bigger chunks to optimize disk write costs
+            for tract_files_bundle in chunk_iter(tract_files, self.READ_CHUNK):
+                tract_bundle = []
+                for tractf in tract_files_bundle:
+                    vertices_file = zipf.open(tractf)
+                    tract_vertices = numpy.loadtxt(vertices_file, dtype=numpy.float32, ndmin=2)
+                    vertices_file.close()
+                    tract_start_indices.append(tract_start_indices[-1] + len(tract_vertices))
+                    tract_bundle.append(tract_vertices)
 
                 if region_volume is not None:
-                    tract_region.append(self._get_tract_region(tract_vertices[0]))
-                vertices_file.close()
+                    start_voxels.append(self._to_voxel_indices([tr[0] for tr in tract_bundle]))
+
+                datatype.store_data_chunk("vertices", numpy.concatenate(tract_bundle), grow_dimension=0,
+                                          close_file=False)
 
         datatype.tract_start_idx = tract_start_indices
-        datatype.tract_region = numpy.array(tract_region, dtype=numpy.int16)
+        datatype.tract_region = self._compute_tract_region(start_voxels)
         return datatype
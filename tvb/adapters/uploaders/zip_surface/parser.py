@@ -33,6 +33,7 @@
 """
 import os
 import re
+import warnings
 import numpy
 from tvb.core.entities.file.files_helper import TvbZip
 
@@ -137,6 +138,30 @@ class ZipSurfaceParser(object):
             return lefts, rights
 
 
+    @staticmethod
+    def _read_array(zip_entry, dtype):
+        """
+        Read a whitespace separated text matrix, parsing the whole content at once.
+        Falls back to numpy.loadtxt for anything else (comments, other delimiters, ragged rows).
+        """
+        content = zip_entry.read()
+        lines = content.splitlines()
+        # rows should all have the column count of the first one
+        columns = len(lines[0].split()) if lines else 0
+        rows = len(lines) - lines.count('') if columns else 0
+
+        try:
+            with warnings.catch_warnings():
+                # numpy warns (or raises, in newer versions) when the text can not be parsed to its end
+                warnings.simplefilter("ignore")
+                data = numpy.fromstring(content, dtype=dtype, sep=' ')
+        except ValueError:
+            return numpy.loadtxt(lines, dtype=dtype)
+        if columns and data.size == rows * columns and len(content.split()) == data.size:
+            return data.reshape((rows, columns))
+        return numpy.loadtxt(lines, dtype=dtype)
+
+
     def _read_files(self, vertices_files, normals_files, triangles_files):
         """
         Read vertices, normals and triangles from files.
@@ -147,10 +172,10 @@ class ZipSurfaceParser(object):
             vertices_file = self._zipf.open(vertices_file)
             triangles_file = self._zipf.open(triangles_file)
 
-            current_vertices = numpy.loadtxt(vertices_file, dtype=numpy.float32)
+            current_vertices = self._read_array(vertices_file, numpy.float32)
             self.vertices.append(current_vertices)
 
-            current_triangles = numpy.loadtxt(triangles_file, dtype=numpy.int32)
+            current_triangles = self._read_array(triangles_file, numpy.int32)
             # offset triangles by amount of previously read vertices
             current_triangles += self._read_vertices
             self.triangles.append(current_triangles)
@@ -162,7 +187,7 @@ class ZipSurfaceParser(object):
         for normals_file in normals_files:
             normals_file = self._zipf.open(normals_file)
 
-            current_normals = numpy.loadtxt(normals_file, dtype=numpy.float32)
+            current_normals = self._read_array(normals_file, numpy.float32)
             self.normals.append(current_normals)
 
             normals_file .close()
\ No newline at end of file
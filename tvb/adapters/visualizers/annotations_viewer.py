@@ -33,6 +33,7 @@
 """
 
 import json
+from tvb.adapters.visualizers.surface_view import prepare_region_boundaries_urls
 from tvb.basic.profile import TvbProfile
 from tvb.basic.traits.core import KWARG_FILTERS_UI
 from tvb.basic.filters.chain import FilterChain, UIFilter
@@ -90,7 +91,7 @@ class ConnectivityAnnotationsView(ABCDisplayer):
                     "Can not launch this viewer unless we have at least a RegionMapping for the current Connectivity!")
             region_map = region_map[0]
 
-        boundary_url = region_map.surface.get_url_for_region_boundaries(region_map)
+        boundary_url = prepare_region_boundaries_urls(region_map.surface, region_map)
         url_vertices_pick, url_normals_pick, url_triangles_pick = region_map.surface.get_urls_for_pick_rendering()
         url_vertices, url_normals, _, url_triangles, url_region_map = \
             region_map.surface.get_urls_for_rendering(True, region_map)
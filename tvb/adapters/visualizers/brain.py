@@ -38,6 +38,7 @@ import json
 import numpy
 from tvb.adapters.visualizers.eeg_monitor import EegMonitor
 from tvb.adapters.visualizers.surface_view import prepare_shell_surface_urls
+from tvb.adapters.visualizers.surface_view import prepare_region_boundaries_urls
 from tvb.adapters.visualizers.sensors import prepare_sensors_as_measure_points_params
 from tvb.adapters.visualizers.sensors import prepare_mapped_sensors_as_measure_points_params
 from tvb.basic.filters.chain import FilterChain
@@ -91,16 +92,14 @@ class BrainViewer(ABCDisplayer):
         """
         self.populate_surface_fields(time_series)
 
-        url_vertices, url_normals, url_lines, url_triangles, url_region_map = self.surface.get_urls_for_rendering(True, self.region_map)
+        url_vertices, url_normals, url_lines, url_triangles, url_region_map = \
+            [self.to_binary_urls(urls) for urls in self.surface.get_urls_for_rendering(True, self.region_map)]
         params = self.retrieve_measure_points_prams(time_series)
 
         base_activity_url, time_urls = self._prepare_data_slices(time_series)
-        min_val, max_val = time_series.get_min_max_values()
+        min_val, max_val = self._get_min_max_values(time_series)
 
-        if self.surface and self.region_map:
-            boundary_url = self.surface.get_url_for_region_boundaries(self.region_map)
-        else:
-            boundary_url = ''
+        boundary_url = prepare_region_boundaries_urls(self.surface, self.region_map)
 
         params.update(urlVertices=json.dumps(url_vertices), urlTriangles=json.dumps(url_triangles),
                       urlLines=json.dumps(url_lines), urlNormals=json.dumps(url_normals),
@@ -158,7 +157,7 @@ class BrainViewer(ABCDisplayer):
                     'urlMeasurePointsLabels': [],
                     'noOfMeasurePoints': 0}
 
-        measure_points = ABCDisplayer.paths2url(self.connectivity, 'centres')
+        measure_points = ABCDisplayer.paths2url(self.connectivity, 'centres', binary=True)
         measure_points_labels = ABCDisplayer.paths2url(self.connectivity, 'region_labels')
         self.measure_points_no = self.connectivity.number_of_regions
 
@@ -179,7 +178,8 @@ class BrainViewer(ABCDisplayer):
         """
         self.populate_surface_fields(time_series)
 
-        url_vertices, url_normals, url_lines, url_triangles, url_region_map = self.surface.get_urls_for_rendering(True, self.region_map)
+        url_vertices, url_normals, url_lines, url_triangles, url_region_map = \
+            [self.to_binary_urls(urls) for urls in self.surface.get_urls_for_rendering(True, self.region_map)]
         hemisphere_chunk_mask = self.surface.get_slices_to_hemisphere_mask()
 
         params = self.retrieve_measure_points_prams(time_series)
@@ -188,16 +188,13 @@ class BrainViewer(ABCDisplayer):
             raise Exception("Max number of measure points " + str(MAX_MEASURE_POINTS_LENGTH) + " exceeded.")
 
         base_activity_url, time_urls = self._prepare_data_slices(time_series)
-        min_val, max_val = time_series.get_min_max_values()
+        min_val, max_val = self._get_min_max_values(time_series)
         legend_labels = self._compute_legend_labels(min_val, max_val)
 
         data_shape = time_series.read_data_shape()
         state_variables = time_series.labels_dimensions.get(time_series.labels_ordering[1], [])
 
-        if self.surface and self.region_map:
-            boundary_url = self.surface.get_url_for_region_boundaries(self.region_map)
-        else:
-            boundary_url = ''
+        boundary_url = prepare_region_boundaries_urls(self.surface, self.region_map)
 
         params.update(dict(title="Cerebral Activity: " + time_series.title, isOneToOneMapping=self.one_to_one_map,
                            urlVertices=json.dumps(url_vertices), urlTriangles=json.dumps(url_triangles),
@@ -270,6 +267,18 @@ class BrainViewer(ABCDisplayer):
         return [processed_max_val] + inter_values + [processed_min_val]
 
 
+    @staticmethod
+    def _get_min_max_values(time_series):
+        """
+        Read the activity range from the per-channel statistics written with the data, ignoring NaN values.
+        Time series stored before those statistics existed fall back to the array meta-data.
+        """
+        statistics = time_series.get_channel_statistics('data')
+        if statistics is None or numpy.isnan(statistics['min']).all():
+            return time_series.get_min_max_values()
+        return float(numpy.nanmin(statistics['min'])), float(numpy.nanmax(statistics['max']))
+
+
     def _prepare_data_slices(self, time_series):
         """
         Prepare data URL for retrieval with slices of timeSeries activity and Time-Line.
@@ -278,8 +287,8 @@ class BrainViewer(ABCDisplayer):
         """
         overall_shape = time_series.read_data_shape()
 
-        activity_base_url = ABCDisplayer.VISUALIZERS_URL_PREFIX + time_series.gid
-        time_urls = [self.paths2url(time_series, 'read_time_page',
+        activity_base_url = ABCDisplayer.get_url_prefix(binary=True) + time_series.gid
+        time_urls = [self.paths2url(time_series, 'read_time_page', binary=True,
                                     parameter="current_page=0;page_size=" + str(overall_shape[0]))]
         return activity_base_url, time_urls
 
@@ -36,9 +36,9 @@
 import json
 import math
 import numpy
-from copy import copy
 from tvb.basic.traits.core import KWARG_FILTERS_UI
 from tvb.basic.filters.chain import FilterChain, UIFilter
+from tvb.adapters.visualizers.stacked_measure import measure_conditions, measure_row_of, row_input_tree
 from tvb.config import CONNECTIVITY_CREATOR_MODULE, CONNECTIVITY_CREATOR_CLASS
 from tvb.core.adapters.abcdisplayer import ABCDisplayer
 from tvb.core.adapters.exceptions import LaunchException
@@ -78,8 +78,7 @@ class ConnectivityViewer(ABCDisplayer):
                                 'to the full brain cortical surface.  This surface will be displayed as a shadow '
                                 '(only used in 3D Edges tab).'},
                 {'name': 'colors', 'label': 'Node Colors', 'type': ConnectivityMeasure,
-                 'conditions': FilterChain(fields=[FilterChain.datatype + '._nr_dimensions'],
-                                           operations=["=="], values=[1]),
+                 'conditions': measure_conditions(),
                  'description': 'A ConnectivityMeasure DataType that establishes a colormap for the nodes '
                                 'displayed in the 2D Connectivity tabs.'},
                 {'name': 'step', 'label': 'Color Threshold', 'type': 'float',
@@ -87,10 +86,10 @@ class ConnectivityViewer(ABCDisplayer):
                                 'as red discs, otherwise (<) they will be yellow. (This applies to 2D Connectivity  '
                                 'tabs and the threshold will depend on the metric used to set the Node Color)'},
                 {'name': 'rays', 'label': 'Shapes Dimensions', 'type': ConnectivityMeasure,
-                 'conditions': FilterChain(fields=[FilterChain.datatype + '._nr_dimensions'],
-                                           operations=["=="], values=[1]),
+                 'conditions': measure_conditions(),
                  'description': 'A ConnectivityMeasure datatype used to establish the size of the spheres representing '
-                                'each node. (It only applies to 3D Nodes tab).'}]
+                                'each node. (It only applies to 3D Nodes tab).'},
+                row_input_tree()]
 
 
     def get_required_memory_size(self, input_data, surface_data, **kwargs):
@@ -104,7 +103,7 @@ class ConnectivityViewer(ABCDisplayer):
         return -1
 
 
-    def launch(self, input_data, surface_data=None, colors=None, rays=None, step=None):
+    def launch(self, input_data, surface_data=None, colors=None, rays=None, step=None, measure_row=0):
         """
         Given the input connectivity data and the surface data, 
         build the HTML response to be displayed.
@@ -120,7 +119,9 @@ class ConnectivityViewer(ABCDisplayer):
         :param step: a threshold applied to the 2D Connectivity Viewers to differentiate 2 types of nodes \
                      the ones with a value greater that this will be displayed as red discs, instead of yellow
         :type step:  float
+        :param measure_row: the row of colors and rays to use, when they stack several measures
         """
+        colors, rays = measure_row_of(colors, measure_row), measure_row_of(rays, measure_row)
         global_params, global_pages = self.compute_connectivity_global_params(input_data, surface_data)
         global_params['isSingleMode'] = False
 
@@ -135,12 +136,13 @@ class ConnectivityViewer(ABCDisplayer):
 
 
     def generate_preview(self, input_data, figure_size=None, surface_data=None,
-                         colors=None, rays=None, step=None, **kwargs):
+                         colors=None, rays=None, step=None, measure_row=0, **kwargs):
         """
         Generate the preview for the BURST cockpit.
 
         see `launch_`
         """
+        colors, rays = measure_row_of(colors, measure_row), measure_row_of(rays, measure_row)
         parameters, _ = Connectivity2DViewer().compute_preview_parameters(input_data, figure_size[0], figure_size[1],
                                                                           colors, rays, step)
         return self.build_display_result("connectivity/portlet_preview", parameters)
@@ -172,14 +174,15 @@ class ConnectivityViewer(ABCDisplayer):
                              position relative to the full brain cortical surface
         :type surface_data: `CorticalSurface`
         """
-        path_weights = self.paths2url(input_data, 'ordered_weights')
-        path_pos = self.paths2url(input_data, 'ordered_centres')
-        path_tracts = self.paths2url(input_data, 'ordered_tracts')
+        path_weights = self.paths2url(input_data, 'ordered_weights', binary=True)
+        path_pos = self.paths2url(input_data, 'ordered_centres', binary=True)
+        path_tracts = self.paths2url(input_data, 'ordered_tracts', binary=True)
         path_labels = self.paths2url(input_data, 'ordered_labels')
-        path_hemisphere_order_indices = self.paths2url(input_data, 'hemisphere_order_indices')
+        path_hemisphere_order_indices = self.paths2url(input_data, 'hemisphere_order_indices', binary=True)
 
         if surface_data:
-            url_vertices, url_normals, _, url_triangles = surface_data.get_urls_for_rendering()
+            url_vertices, url_normals, _, url_triangles = \
+                [self.to_binary_urls(urls) for urls in surface_data.get_urls_for_rendering()]
         else:
             url_vertices, url_normals, url_triangles = [], [], []
 
@@ -334,29 +337,29 @@ class Connectivity2DViewer(object):
     def _get_json(self, labels, positions, weights, rotate_angle, coord_idx1,
                   coord_idx2, dimensions_list, colors_list, x_canvas, y_canvas):
         """
-        Method used for creating a valid JSON for an entire chart.
+        Method used for creating a valid JSON for an entire chart: the polar layout of the nodes, as arrays,
+        and the non-zero edges as a COO list (`nodeFrom` and `nodeTo` indices, with their `weight`).
+        The nodes of the RGraph are built from it, in the browser.
         """
-        max_y = max(positions[:, coord_idx2])
-        min_y = min(positions[:, coord_idx2])
-        max_x = max(positions[:, coord_idx1])
-        min_x = min(positions[:, coord_idx1])
+        positions = numpy.asarray(positions)
+        max_y, min_y = positions[:, coord_idx2].max(), positions[:, coord_idx2].min()
+        max_x, min_x = positions[:, coord_idx1].max(), positions[:, coord_idx1].min()
         y_scale = 2 * y_canvas / (max_y - min_y)
         x_scale = 2 * x_canvas / (max_x - min_x)
-        mid_x_value = (max_x + min_x) / 2
-        mid_y_value = (max_y + min_y) / 2
-
-        result_json = []
-
-        for i in range(len(positions)):
-            x_coord = (positions[i][coord_idx1] - mid_x_value) * x_scale
-            y_coord = (positions[i][coord_idx2] - mid_y_value) * y_scale
-            adjacencies = Connectivity2DViewer._get_adjacencies_json(weights[i], labels)
-
-            r = self.point2json(labels[i], x_coord, y_coord, adjacencies,
-                                rotate_angle, dimensions_list[i], colors_list[i])
-            result_json.append(r)
-
-        return json.dumps(result_json)
+        x_coords = (positions[:, coord_idx1] - (max_x + min_x) / 2) * x_scale
+        y_coords = (positions[:, coord_idx2] - (max_y + min_y) / 2) * y_scale
+
+        weights = numpy.asarray(weights)
+        node_from, node_to = numpy.nonzero(weights)
+        return json.dumps({"labels": numpy.asarray(labels).tolist(),
+                           "angle": (rotate_angle + numpy.arctan2(y_coords, x_coords)).tolist(),
+                           "radius": numpy.hypot(x_coords, y_coords).tolist(),
+                           "color": self.DEFAULT_COLOR,
+                           "customShapeDimension": list(dimensions_list),
+                           "customShapeColor": list(colors_list),
+                           "nodeFrom": node_from.tolist(),
+                           "nodeTo": node_to.tolist(),
+                           "weight": weights[node_from, node_to].tolist()})
 
 
     @staticmethod
@@ -367,47 +370,7 @@ class Connectivity2DViewer(object):
         a weights matrix which contains data related to both hemispheres.
         """
         half = len(weights) / 2
-        l_aux, r_aux = weights[:half], weights[half:]
-        r_weights = []
-        l_weights = []
-        for i in range(half):
-            l_weights.append(l_aux[i][:half])
-        for i in range(half, len(weights)):
-            r_weights.append(r_aux[i - half][half:])
-        return l_weights, r_weights
-
-
-    def point2json(self, node_lbl, x_coord, y_coord, adjacencies, angle, shape_dimension, shape_color):
-        """
-        Method used for creating a valid JSON for a certain point.
-        """
-        form = "circle"
-        default_dimension = 6
-        angle += math.atan2(y_coord, x_coord)
-        radius = math.sqrt(math.pow(x_coord, 2) + math.pow(y_coord, 2))
-
-        return {
-            "id": node_lbl, "name": node_lbl,
-            "data": {
-                "$dim": default_dimension, "$type": form,
-                "$color": self.DEFAULT_COLOR, "customShapeDimension": shape_dimension,
-                "customShapeColor": shape_color, "angle": angle,
-                "radius": radius
-            },
-            "adjacencies": adjacencies
-        }
-
-
-    @staticmethod
-    def _get_adjacencies_json(point_weights, points_labels):
-        """
-        Method used for obtaining a valid JSON which will contain all the edges of a certain node.
-        """
-        adjacencies = []
-        for weight, label in zip(point_weights, points_labels):
-            if weight:
-                adjacencies.append({"nodeTo": label, "data": {"weight": weight}})
-        return adjacencies
+        return weights[:half, :half], weights[half:, half:]
 
 
     def _prepare_colors(self, colors, expected_size, step=None):
@@ -458,15 +421,13 @@ class Connectivity2DViewer(object):
         Normalize the weights matrix. The values should be between 
         MIN_WEIGHT_VALUE and MAX_WEIGHT_VALUE
         """
-        weights = copy(weights)
+        weights = numpy.array(weights, dtype=numpy.float64)
         min_value = numpy.min(weights)
         max_value = numpy.max(weights)
         if min_value < self.MIN_WEIGHT_VALUE or max_value > self.MAX_WEIGHT_VALUE:
-            for i, row in enumerate(weights):
-                for j in range(len(row)):
-                    if min_value == max_value:
-                        weights[i][j] = self.MAX_WEIGHT_VALUE
-                    else:
-                        weights[i][j] = (self.MIN_WEIGHT_VALUE + ((weights[i][j] - min_value) / (max_value - min_value))
-                                         * (self.MAX_WEIGHT_VALUE - self.MIN_WEIGHT_VALUE))
+            if min_value == max_value:
+                weights[:] = self.MAX_WEIGHT_VALUE
+            else:
+                weights = (self.MIN_WEIGHT_VALUE + ((weights - min_value) / (max_value - min_value))
+                           * (self.MAX_WEIGHT_VALUE - self.MIN_WEIGHT_VALUE))
         return weights
@@ -249,16 +249,18 @@ class EegMonitor(ABCDisplayer):
     @staticmethod
     def _replace_nan_values(input_data):
         """ Replace NAN values with a given values"""
-        is_any_value_nan = False
-        if not numpy.isfinite(input_data).all():
-            for idx in range(len(input_data)):
-                input_data[idx] = numpy.nan_to_num(input_data[idx])
-            is_any_value_nan = True
-        return is_any_value_nan
+        if numpy.isfinite(input_data).all():
+            return False
+        input_data[...] = numpy.nan_to_num(input_data)
+        return True
 
 
     def compute_required_info(self, list_of_timeseries):
-        """Compute average difference between Max and Min."""
+        """
+        Compute average difference between Max and Min.
+        The per-channel statistics written with the time series are used when present,
+        otherwise the values are computed on the current page.
+        """
         # The values computed by this function will be serialized to json and passed to the client.
         # The time series might be of numpy.float32 a data type that is not serializable.
         # To overcome this we convert numpy scalars to python floats
@@ -268,23 +270,25 @@ class EegMonitor(ABCDisplayer):
         channels_per_set = []
         for timeseries in list_of_timeseries:
             data_shape = timeseries.read_data_shape()
-            resulting_shape = []
-            for idx, shape in enumerate(data_shape):
-                if idx in self.selected_dimensions:
-                    resulting_shape.append(shape)
-
-            page_chunk_data = timeseries.read_data_page(self.current_page * self.page_size,
-                                                        (self.current_page + 1) * self.page_size)
-            channels_per_set.append(int(resulting_shape[1]))
-
-            for idx in range(resulting_shape[1]):
-                self.has_nan = self.has_nan or self._replace_nan_values(page_chunk_data[:, idx])
-                array_max = numpy.max(page_chunk_data[:, idx])
-                array_min = numpy.min(page_chunk_data[:, idx])
-                translations.append( float( (array_max + array_min) / 2 ) )
-                if array_max == array_min:
-                    array_max += 1
-                step.append(abs(array_max - array_min))
+            channels_per_set.append(int(data_shape[self.selected_dimensions[1]]))
+
+            statistics = timeseries.get_channel_statistics('data')
+            if statistics is not None:
+                # Same selection as read_data_page: all channels, first index on the other dimensions
+                selection = tuple(slice(None) if idx == self.selected_dimensions[1] else 0
+                                  for idx in range(len(data_shape)))
+                self.has_nan = self.has_nan or bool(statistics['nan_count'][selection].any())
+                array_max = numpy.nan_to_num(statistics['max'][selection])
+                array_min = numpy.nan_to_num(statistics['min'][selection])
+            else:
+                page_chunk_data = timeseries.read_data_page(self.current_page * self.page_size,
+                                                            (self.current_page + 1) * self.page_size)
+                self.has_nan = self._replace_nan_values(page_chunk_data) or self.has_nan
+                array_max = numpy.max(page_chunk_data, axis=0)
+                array_min = numpy.min(page_chunk_data, axis=0)
+
+            translations.extend(float(value) for value in (array_max + array_min) / 2)
+            step.extend(float(value) for value in numpy.where(array_max == array_min, 1, abs(array_max - array_min)))
 
         return float(max(step)), translations, channels_per_set
 
@@ -321,17 +325,18 @@ class EegMonitor(ABCDisplayer):
                     current_max_size = min((i + 1) * self.page_size, overall_shape[0]) - i * self.page_size
                     params = "current_page=" + str(i) + ";page_size=" + str(self.page_size) + \
                              ";max_size=" + str(current_max_size)
-                    timeline_urls.append(self.paths2url(timeseries, 'read_time_page', parameter=params))
-                base_urls.append(ABCDisplayer.VISUALIZERS_URL_PREFIX + timeseries.gid)
+                    timeline_urls.append(self.paths2url(timeseries, 'read_time_page', parameter=params, binary=True))
+                base_urls.append(ABCDisplayer.get_url_prefix(binary=True) + timeseries.gid)
                 time_set_urls.append(timeline_urls)
                 total_pages_set.append(total_pages)
         else:
-            base_urls.append(ABCDisplayer.VISUALIZERS_URL_PREFIX + list_of_timeseries[0].gid)
+            base_urls.append(ABCDisplayer.get_url_prefix(binary=True) + list_of_timeseries[0].gid)
             total_pages_set.append(1)
             page_size = self.preview_page_size
             params = "current_page=0;page_size=" + str(self.preview_page_size) + ";max_size=" + \
                      str(min(self.preview_page_size, list_of_timeseries[0].read_data_shape()[0]))
-            time_set_urls.append([self.paths2url(list_of_timeseries[0], 'read_time_page', parameter=params)])
+            time_set_urls.append([self.paths2url(list_of_timeseries[0], 'read_time_page', parameter=params,
+                                                  binary=True)])
         return base_urls, page_size, total_pages_set, time_set_urls
 
     
\ No newline at end of file
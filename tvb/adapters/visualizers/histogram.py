@@ -36,8 +36,8 @@
 
 import json
 import numpy
+from tvb.adapters.visualizers.stacked_measure import MeasureRow, measure_conditions, row_input_tree
 from tvb.core.adapters.abcdisplayer import ABCDisplayer
-from tvb.basic.filters.chain import FilterChain
 from tvb.datatypes.graph import ConnectivityMeasure
 
 
@@ -52,40 +52,43 @@ class HistogramViewer(ABCDisplayer):
     def get_input_tree(self):
         return [{'name': 'input_data', 'type': ConnectivityMeasure,
                  'label': 'Connectivity Measure', 'required': True,
-                 'conditions': FilterChain(fields=[FilterChain.datatype + '._nr_dimensions'],
-                                           operations=["=="], values=[1]),
-                 'description': 'A BCT computed measure for a Connectivity'}]
+                 'conditions': measure_conditions(),
+                 'description': 'A BCT computed measure for a Connectivity'},
+                row_input_tree()]
 
 
-    def launch(self, input_data):
+    def launch(self, input_data, measure_row=0):
         """
         Prepare input data for display.
 
         :param input_data: A BCT computed measure for a Connectivity
         :type input_data: `ConnectivityMeasure`
+        :param measure_row: the row to display, when input_data stacks several measures
         """
-        params = self.prepare_parameters(input_data)
+        params = self.prepare_parameters(MeasureRow(input_data, measure_row))
         return self.build_display_result("histogram/view", params, pages=dict(controlPage="histogram/controls"))
 
 
-    def get_required_memory_size(self, input_data, figure_size):
+    def get_required_memory_size(self, input_data, figure_size, measure_row=0):
         """
         Return the required memory to run this algorithm.
         """
         return numpy.prod(input_data.shape) * 2
 
 
-    def generate_preview(self, input_data, figure_size):
+    def generate_preview(self, input_data, figure_size, measure_row=0):
         """
         The preview for the burst page.
         """
-        params = self.prepare_parameters(input_data)
+        params = self.prepare_parameters(MeasureRow(input_data, measure_row))
         return self.build_display_result("histogram/view", params)
 
 
     def prepare_parameters(self, input_data):
         """
         Prepare all required parameters for a launch.
+
+        :param input_data: a 1D measure, or a `MeasureRow` of a stacked one
         """
         labels_list = input_data.connectivity.region_labels.tolist()
         values_list = input_data.array_data.tolist()
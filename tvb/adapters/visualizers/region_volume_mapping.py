@@ -35,6 +35,7 @@ Backend-side for Visualizers that display measures on regions in the brain volum
 """
 
 import json
+from tvb.adapters.visualizers.stacked_measure import measure_conditions, row_input_tree
 from tvb.basic.filters.chain import FilterChain
 from tvb.basic.arguments_serialisation import slice_str
 from tvb.core.adapters.abcdisplayer import ABCDisplayer
@@ -71,6 +72,16 @@ class _MappedArrayVolumeBase(ABCDisplayer):
                               "(expected values for %d connectivity regions)." %(measure_shape, nregions))
 
 
+    @staticmethod
+    def get_row_slice(measure, row):
+        """
+        :returns: the slice of one row of a stacked measure, or '' for the default slice of other measures
+        """
+        if measure is None or measure.nr_dimensions != 2:
+            return ''
+        return slice_str((int(row or 0), slice(None)))
+
+
     def _ensure_region_mapping(self, region_mapping_volume):
         if region_mapping_volume is None:
             region_mapping_volume = dao.try_load_last_entity_of_type(self.current_project_id, RegionVolumeMapping)
@@ -180,15 +191,16 @@ class ConnectivityMeasureVolumeVisualizer(_MappedArrayVolumeBase):
         return [{'name': 'connectivity_measure', 'label': 'Connectivity measure',
                  'type': ConnectivityMeasure, 'required': True,
                  'description': 'A connectivity measure',
-                 'conditions': FilterChain(fields=[FilterChain.datatype + '._nr_dimensions'],
-                                           operations=["=="], values=[1])},
+                 'conditions': measure_conditions()},
                 {'name': 'region_mapping_volume', 'label': 'Region mapping',
                  'type': RegionVolumeMapping, 'required': False, },
-                _MappedArrayVolumeBase.get_background_input_tree()]
+                _MappedArrayVolumeBase.get_background_input_tree(),
+                row_input_tree()]
 
 
-    def launch(self, connectivity_measure, region_mapping_volume=None, background=None):
-        params = self.compute_params(region_mapping_volume, connectivity_measure, background=background)
+    def launch(self, connectivity_measure, region_mapping_volume=None, background=None, measure_row=0):
+        params = self.compute_params(region_mapping_volume, connectivity_measure,
+                                     self.get_row_slice(connectivity_measure, measure_row), background)
         params['title'] = "Connectivity Measure in Volume Visualizer"
         # the view will display slicing information if this key is present.
         # compute_params works with generic mapped arrays and it will return slicing info
@@ -207,13 +219,14 @@ class RegionVolumeMappingVisualiser(_MappedArrayVolumeBase):
                 {'name': 'connectivity_measure', 'label': 'Connectivity measure',
                  'type': ConnectivityMeasure, 'required': False,
                  'description': 'A connectivity measure',
-                 'conditions': FilterChain(fields=[FilterChain.datatype + '._nr_dimensions'],
-                                           operations=["=="], values=[1])},
-                _MappedArrayVolumeBase.get_background_input_tree()]
+                 'conditions': measure_conditions()},
+                _MappedArrayVolumeBase.get_background_input_tree(),
+                row_input_tree()]
 
 
-    def launch(self, region_mapping_volume, connectivity_measure=None, background=None):
-        params = self.compute_params(region_mapping_volume, connectivity_measure, background=background)
+    def launch(self, region_mapping_volume, connectivity_measure=None, background=None, measure_row=0):
+        params = self.compute_params(region_mapping_volume, connectivity_measure,
+                                     self.get_row_slice(connectivity_measure, measure_row), background)
         params['title'] = "Volume to Regions Visualizer"
         return self.build_display_result("time_series_volume/staticView", params,
                                          pages=dict(controlPage="time_series_volume/controls"))
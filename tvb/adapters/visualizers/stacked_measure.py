@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Stacked connectivity measures: a ConnectivityMeasure of shape (rows, regions) holds one 1D measure per row,
+e.g. all the FCD epoch eigenvectors of a run in a single file. The 1D measure viewers accept such measures
+together with a row index, and display that row through a MeasureRow.
+"""
+
+from tvb.basic.filters.chain import FilterChain
+from tvb.core.adapters.abcdisplayer import ABCDisplayer
+from tvb.core.adapters.exceptions import LaunchException
+
+# Optional data set of a stacked measure, with the title of each row
+ROW_TITLES = "row_titles"
+
+ROW_INPUT_NAME = "measure_row"
+
+
+
+def measure_conditions():
+    """
+    :returns: the filter of the viewers' measure inputs: 1D measures, or measures stacking 1D ones
+    """
+    return FilterChain(fields=[FilterChain.datatype + '._nr_dimensions'], operations=["in"], values=[[1, 2]])
+
+
+
+def row_input_tree():
+    """
+    :returns: the input tree entry selecting which row of stacked measures a viewer displays
+    """
+    return {'name': ROW_INPUT_NAME, 'label': 'Row of stacked measures', 'type': 'int', 'default': 0,
+            'required': False,
+            'description': 'For measures stacking several 1D measures (e.g. the FCD eigenvectors), the row to '
+                           'display. 1D measures are displayed as they are.'}
+
+
+
+class MeasureRow(object):
+    """
+    The attributes of a 1D ConnectivityMeasure read by the viewers, for one row of a stacked measure.
+    A 1D measure is its own single row.
+    """
+
+    def __init__(self, measure, row=0):
+        self.measure = measure
+        self.gid = measure.gid
+        self.connectivity = measure.connectivity
+        self.is_stacked = measure.nr_dimensions == 2
+        self.row = int(row or 0) if self.is_stacked else 0
+
+        if not self.is_stacked:
+            self.array_data = measure.array_data
+            self.title = measure.title
+            return
+
+        number_of_rows = measure.get_data_shape('array_data')[0]
+        if not 0 <= self.row < number_of_rows:
+            raise LaunchException("Row %d is out of the %d rows of measure %s" % (self.row, number_of_rows,
+                                                                                  measure.title))
+        self.array_data = measure.get_data_row('array_data', self.row)
+        titles = measure.get_data(ROW_TITLES, ignore_errors=True)
+        if titles.size > 0:
+            self.title = str(titles[self.row])
+        else:
+            self.title = "%s - row %d" % (measure.title, self.row)
+
+
+    def data_url(self, binary=False):
+        """
+        :returns: the URL the client reads this row from
+        """
+        if not self.is_stacked:
+            return ABCDisplayer.paths2url(self.measure, "array_data", binary=binary)
+        return ABCDisplayer.paths2url(self.measure, "get_data_row", binary=binary,
+                                      parameter="data_name=array_data;row=%d" % self.row)
+
+
+
+def measure_row_of(measure, row=0):
+    """
+    :returns: the MeasureRow of an optional viewer input, or None
+    """
+    if measure is None:
+        return None
+    return MeasureRow(measure, row)
@@ -34,10 +34,12 @@
 
 import json
 import numpy
+from tvb.adapters.visualizers.stacked_measure import measure_conditions, measure_row_of, row_input_tree
 from tvb.basic.filters.chain import UIFilter, FilterChain
 from tvb.basic.traits.core import KWARG_FILTERS_UI
 from tvb.core.adapters.abcdisplayer import ABCDisplayer
 from tvb.core.entities.storage import dao
+from tvb.core.region_boundaries import BOUNDARY_ARRAYS, boundaries_dataset_name, store_region_boundaries
 from tvb.datatypes.graph import ConnectivityMeasure
 from tvb.datatypes.surfaces import FaceSurface
 from tvb.datatypes.region_mapping import RegionMapping
@@ -53,7 +55,23 @@ def prepare_shell_surface_urls(project_id, shell_surface=None, preferred_type=Fa
             raise Exception('No Face object found in current project.')
 
     face_vertices, face_normals, _, face_triangles = shell_surface.get_urls_for_rendering()
-    return json.dumps([face_vertices, face_normals, face_triangles])
+    return json.dumps([ABCDisplayer.to_binary_urls(urls) for urls in (face_vertices, face_normals, face_triangles)])
+
+
+
+def prepare_region_boundaries_urls(surface, region_map):
+    """
+    Region boundaries are computed at the first call for this surface and region mapping, then read from H5.
+    :returns: JSON with the lists of URLs (one per surface slice) for boundary vertices, lines and normals
+    """
+    if surface is None or region_map is None:
+        return ''
+    number_of_slices = store_region_boundaries(surface, region_map)
+    urls = dict((name, [ABCDisplayer.paths2url(region_map, 'get_data', binary=True, parameter="data_name=" +
+                                               boundaries_dataset_name(surface, region_map, name, slice_idx))
+                        for slice_idx in range(number_of_slices)])
+                for name in BOUNDARY_ARRAYS)
+    return json.dumps(urls)
 
 
 
@@ -85,11 +103,11 @@ class SurfaceViewer(ABCDisplayer):
                 {'name': 'connectivity_measure', 'label': 'Connectivity measure',
                  'type': ConnectivityMeasure, 'required': False,
                  'description': 'A connectivity measure',
-                 'conditions': FilterChain(fields=[FilterChain.datatype + '._nr_dimensions'],
-                                           operations=["=="], values=[1])},
+                 'conditions': measure_conditions()},
                 {'name': 'shell_surface', 'label': 'Shell Surface',
                  'type': Surface, 'required': False,
-                 'description': "Face surface to be displayed semi-transparently, for orientation only."}]
+                 'description': "Face surface to be displayed semi-transparently, for orientation only."},
+                row_input_tree()]
 
 
     @staticmethod
@@ -100,7 +118,7 @@ class SurfaceViewer(ABCDisplayer):
         # This means that js will interpret escapes like \" so the json parser gets "
         # Double escape is needed \\"
         for url in surface.get_urls_for_rendering(True, region_map):
-            escaped_url = json.dumps(url).replace('\\', '\\\\')
+            escaped_url = json.dumps(ABCDisplayer.to_binary_urls(url)).replace('\\', '\\\\')
             rendering_urls.append(escaped_url)
         url_vertices, url_normals, url_lines, url_triangles, url_region_map = rendering_urls
 
@@ -118,9 +136,9 @@ class SurfaceViewer(ABCDisplayer):
             boundary_url = ''
         else:
             measure_points_no = region_map.connectivity.number_of_regions
-            url_measure_points = self.paths2url(region_map.connectivity, 'centres')
+            url_measure_points = self.paths2url(region_map.connectivity, 'centres', binary=True)
             url_measure_points_labels = self.paths2url(region_map.connectivity, 'region_labels')
-            boundary_url = surface.get_url_for_region_boundaries(region_map)
+            boundary_url = prepare_region_boundaries_urls(surface, region_map)
         return dict(noOfMeasurePoints=measure_points_no, urlMeasurePoints=url_measure_points,
                     urlMeasurePointsLabels=url_measure_points_labels, boundaryURL=boundary_url)
 
@@ -133,28 +151,28 @@ class SurfaceViewer(ABCDisplayer):
             max_measure = measure_points_no
             client_measure_url = ''
         else:
-            if connectivity_measure.nr_dimensions != 1:
-                raise ValueError("connectivity measure must be 1 dimensional")
-            if connectivity_measure.length_1d != measure_points_no:
+            # connectivity_measure is a MeasureRow, thus 1 dimensional
+            if len(connectivity_measure.array_data) != measure_points_no:
                 raise ValueError("connectivity measure has %d values but the connectivity has %d "
-                                 "regions" % (connectivity_measure.length_1d, measure_points_no))
+                                 "regions" % (len(connectivity_measure.array_data), measure_points_no))
             min_measure = numpy.min(connectivity_measure.array_data)
             max_measure = numpy.max(connectivity_measure.array_data)
             # We assume here that the index 0 in the measure corresponds to
             # the region 0 of the region map.
-            client_measure_url = self.paths2url(connectivity_measure, "array_data")
+            client_measure_url = connectivity_measure.data_url(binary=True)
 
 
         return dict(minMeasure=min_measure, maxMeasure=max_measure, clientMeasureUrl=client_measure_url)
 
 
     def launch(self, surface, region_map=None, connectivity_measure=None,
-               shell_surface=None, title="Surface Visualizer"):
+               shell_surface=None, title="Surface Visualizer", measure_row=0):
         params = dict(title=title, extended_view=False, isOneToOneMapping=False,
                       hasRegionMap=region_map is not None)
         params.update(self._compute_surface_params(surface, region_map))
         params.update(self._compute_measure_points_param(surface, region_map))
-        params.update(self._compute_measure_param(connectivity_measure, params['noOfMeasurePoints']))
+        params.update(self._compute_measure_param(measure_row_of(connectivity_measure, measure_row),
+                                                  params['noOfMeasurePoints']))
 
         try:
             params['shelfObject'] = prepare_shell_surface_urls(self.current_project_id, shell_surface)
@@ -184,10 +202,10 @@ class RegionMappingViewer(SurfaceViewer):
         base_tree.pop(0)
         return base_tree
 
-    def launch(self, region_map, connectivity_measure=None, shell_surface=None):
+    def launch(self, region_map, connectivity_measure=None, shell_surface=None, measure_row=0):
 
         return SurfaceViewer.launch(self, region_map.surface, region_map, connectivity_measure, shell_surface,
-                                    title=RegionMappingViewer._ui_name)
+                                    title=RegionMappingViewer._ui_name, measure_row=measure_row)
 
 
 class ConnectivityMeasureOnSurfaceViewer(SurfaceViewer):
@@ -201,10 +219,10 @@ class ConnectivityMeasureOnSurfaceViewer(SurfaceViewer):
     def get_input_tree(self):
         base_tree = SurfaceViewer.get_input_tree(self)
         base_tree[2]['required'] = True
-        tree = [base_tree[2], base_tree[1], base_tree[3]]
+        tree = [base_tree[2], base_tree[1], base_tree[3], base_tree[4]]
         return tree
 
-    def launch(self, connectivity_measure, region_map=None, shell_surface=None):
+    def launch(self, connectivity_measure, region_map=None, shell_surface=None, measure_row=0):
         if (region_map is None or region_map.connectivity.number_of_regions !=
                 connectivity_measure.connectivity.number_of_regions):
             # We have no regionmap or the onw we have is not compatible with the measure.
@@ -213,5 +231,8 @@ class ConnectivityMeasureOnSurfaceViewer(SurfaceViewer):
             if region_maps:
                 region_map = region_maps[0]
                 # else: todo fallback on any region map with the right number of nodes
+        title = connectivity_measure.display_name
+        if connectivity_measure.nr_dimensions == 2:
+            title = measure_row_of(connectivity_measure, measure_row).title
         return SurfaceViewer.launch(self, region_map.surface, region_map, connectivity_measure, shell_surface,
-                                    title=connectivity_measure.display_name)
+                                    title=title, measure_row=measure_row)
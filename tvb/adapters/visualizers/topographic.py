@@ -36,29 +36,37 @@
 
 import numpy
 import json
+import threading
+from collections import OrderedDict
+from scipy.ndimage import convolve
 from scipy.optimize import leastsq
-from scipy.interpolate import griddata
+from scipy.interpolate import LinearNDInterpolator
+from scipy.spatial import Delaunay
 from tvb.core.adapters.abcdisplayer import ABCDisplayer
 from tvb.core.adapters.exceptions import LaunchException
 from tvb.datatypes.graph import ConnectivityMeasure
-from tvb.basic.filters.chain import FilterChain
+from tvb.adapters.visualizers.stacked_measure import measure_conditions, measure_row_of, row_input_tree
 
 
 class TopographyCalculations(object):
+
+    # Sensors preparations (sphere fit, projection, grid and triangulation), by the GID of the sensors
+    # shared by the web server threads, hence only touched while holding the lock
+    _sensors_cache = OrderedDict()
+    _sensors_cache_lock = threading.Lock()
+    SENSORS_CACHE_SIZE = 16
+
     @staticmethod
-    def compute_topography_data(topography, sensor_locations):
+    def compute_topography_data(topography, sensor_locations, sensors_gid=None):
         """
         Trim data, to make sure everything is inside the head contour.
+
+        :param sensors_gid: when given, the preparation of these sensors is cached and reused for other measures
         """
-        topography_data = TopographyCalculations._prepare_sensors(sensor_locations)
-        x_arr = topography_data["x_arr"]
-        y_arr = topography_data["y_arr"]
-
-        points = numpy.vstack((topography_data["sproj"][:, 0], topography_data["sproj"][:, 1])).T
-        topo = griddata(points, numpy.ravel(numpy.array(topography)), (x_arr, y_arr), method='linear')
-        topo = TopographyCalculations._extend_with_nans(topo)
-        topo = TopographyCalculations._spiral(topo)
-        topo = TopographyCalculations._remove_outer_nans(topo)
+        topography_data = TopographyCalculations._prepare_sensors_cached(sensor_locations, sensors_gid)
+        interpolator = LinearNDInterpolator(topography_data["triangulation"], numpy.ravel(numpy.array(topography)))
+        topo = interpolator((topography_data["x_arr"], topography_data["y_arr"]))
+        topo = TopographyCalculations._fill_nans(topo)
         return TopographyCalculations._fit_circle(topo)
 
     @staticmethod
@@ -72,57 +80,41 @@ class TopographyCalculations(object):
         return data_matrix
 
     @staticmethod
-    def _spiral(array):
-        x_length = array.shape[0] - 2
-        y_length = array.shape[1] - 2
-        r = x_length / 2
-        x = y = 0
-        dx = 0
-        dy = -1
-        nx = [-1, -1, -1, 0, 0, 1, 1, 1]
-        ny = [-1, 0, 1, -1, 1, -1, 0, 1]
-        for i in range(max(x_length, y_length) ** 2):
-            if (-x_length / 2 < x <= x_length / 2) and (-y_length / 2 < y <= y_length / 2):
-                if numpy.isnan(array[x + r][y + r]):
-                    neighbors = []
-                    for j in range(0, 8):
-                        neighbors.append(array[x + r + nx[j]][y + r + ny[j]])
-                    array[x + r][y + r] = TopographyCalculations._compute_avg(neighbors)
-            if x == y or (x < 0 and x == -y) or (x > 0 and x == 1 - y):
-                dx, dy = -dy, dx
-            x, y = x + dx, y + dy
-        return array
-
-    @staticmethod
-    def _compute_avg(array):
-        local_sum = 0
-        dimension = 0
-        for x in array:
-            if not numpy.isnan(x):
-                local_sum += x
-                dimension += 1
-
-        return local_sum / float(dimension)
-
-    @staticmethod
-    def _extend_with_nans(data_matrix):
-        n = data_matrix.shape[0]
-        extended = numpy.empty((n + 2, n + 2,))
-        extended[:] = numpy.nan
-        for i in range(1, n + 1):
-            for j in range(1, n + 1):
-                extended[i][j] = data_matrix[i - 1][j - 1]
-        return extended
+    def _fill_nans(data_matrix):
+        """
+        Fill the NaN cells (outside the sensors hull), layer after layer from the valid ones:
+        a NaN cell next to valid cells takes the average of its valid neighbours.
+        """
+        kernel = numpy.ones((3, 3))
+        kernel[1, 1] = 0
+        missing = numpy.isnan(data_matrix)
+        while missing.any():
+            valid = ~missing
+            sums = convolve(numpy.where(valid, data_matrix, 0), kernel, mode='constant')
+            counts = convolve(valid.astype(float), kernel, mode='constant')
+            filled = missing & (counts > 0)
+            if not filled.any():
+                break
+            data_matrix[filled] = sums[filled] / counts[filled]
+            missing &= ~filled
+        return data_matrix
 
     @staticmethod
-    def _remove_outer_nans(data_matrix):
-        n = data_matrix.shape[0]
-        reduced = numpy.empty((n - 2, n - 2,))
-        reduced[:] = numpy.nan
-        for i in range(0, n - 2):
-            for j in range(0, n - 2):
-                reduced[i][j] = data_matrix[i + 1][j + 1]
-        return reduced
+    def _prepare_sensors_cached(sensor_locations, sensors_gid):
+        if sensors_gid is None:
+            return TopographyCalculations._prepare_sensors(sensor_locations)
+        cache = TopographyCalculations._sensors_cache
+        with TopographyCalculations._sensors_cache_lock:
+            topography_data = cache.pop(sensors_gid, None)
+        if topography_data is None:
+            # Prepared outside the lock; concurrent misses for the same sensors just compute it twice
+            topography_data = TopographyCalculations._prepare_sensors(sensor_locations)
+        with TopographyCalculations._sensors_cache_lock:
+            cache.pop(sensors_gid, None)
+            while len(cache) >= TopographyCalculations.SENSORS_CACHE_SIZE:
+                cache.popitem(last=False)
+            cache[sensors_gid] = topography_data
+        return topography_data
 
     @staticmethod
     def _prepare_sensors(sensor_locations, resolution=100):
@@ -147,19 +139,16 @@ class TopographyCalculations(object):
         sproj = sensor_locations - numpy.array((circle_x, circle_y, circle_z))
         sproj = radius * sproj / numpy.c_[numpy.sqrt(numpy.sum(sproj ** 2, axis=1))]
         sproj += numpy.array((circle_x, circle_y, circle_z))
-        return dict(sproj=sproj, x_arr=x_arr, y_arr=y_arr,
+        # the triangulation of the projected sensors, as griddata(method='linear') would build it
+        triangulation = Delaunay(sproj[:, :2])
+        return dict(sproj=sproj, x_arr=x_arr, y_arr=y_arr, triangulation=triangulation,
                     circle_x=circle_x, circle_y=circle_y, rad=radius)
 
     @staticmethod
     def normalize_sensors(points_positions):
         """Centers the brain."""
-        steps = []
-        for column_idx in range(3):
-            column = [row[column_idx] for row in points_positions]
-            step = (max(column) + min(column)) / 2.0
-            steps.append(step)
-        step = numpy.array(steps)
-        return points_positions - step
+        points_positions = numpy.asarray(points_positions)
+        return points_positions - (points_positions.max(axis=0) + points_positions.min(axis=0)) / 2.0
 
 
 class TopographicViewer(ABCDisplayer):
@@ -173,18 +162,16 @@ class TopographicViewer(ABCDisplayer):
     def get_input_tree(self):
         return [{'name': 'data_0', 'label': 'Connectivity Measures 1',
                  'type': ConnectivityMeasure, 'required': True,
-                 'conditions': FilterChain(fields=[FilterChain.datatype + '._nr_dimensions'],
-                                           operations=["=="], values=[1]),
+                 'conditions': measure_conditions(),
                  'description': 'Punctual values for each node in the connectivity matrix. '
                                 'This will give the colors of the resulting topographic image.'},
                 {'name': 'data_1', 'label': 'Connectivity Measures 2', 'type': ConnectivityMeasure,
-                 'conditions': FilterChain(fields=[FilterChain.datatype + '._nr_dimensions'],
-                                           operations=["=="], values=[1]),
+                 'conditions': measure_conditions(),
                  'description': 'Comparative values'},
                 {'name': 'data_2', 'label': 'Connectivity Measures 3', 'type': ConnectivityMeasure,
-                 'conditions': FilterChain(fields=[FilterChain.datatype + '._nr_dimensions'],
-                                           operations=["=="], values=[1]),
-                 'description': 'Comparative values'}]
+                 'conditions': measure_conditions(),
+                 'description': 'Comparative values'},
+                row_input_tree()]
 
 
     def get_required_memory_size(self, **kwargs):
@@ -194,12 +181,13 @@ class TopographicViewer(ABCDisplayer):
         return -1
 
 
-    def generate_preview(self, data_0, data_1=None, data_2=None, figure_size=None):
-        return self.launch(data_0, data_1, data_2)
+    def generate_preview(self, data_0, data_1=None, data_2=None, figure_size=None, measure_row=0):
+        return self.launch(data_0, data_1, data_2, measure_row)
 
 
-    def launch(self, data_0, data_1=None, data_2=None):
+    def launch(self, data_0, data_1=None, data_2=None, measure_row=0):
 
+        data_0, data_1, data_2 = [measure_row_of(measure, measure_row) for measure in [data_0, data_1, data_2]]
         connectivity = data_0.connectivity
         sensor_locations = TopographyCalculations.normalize_sensors(connectivity.centres)
         sensor_number = len(sensor_locations)
@@ -224,7 +212,8 @@ class TopographicViewer(ABCDisplayer):
 
         for i, array_data in enumerate(arrays):
             try:
-                data_array = TopographyCalculations.compute_topography_data(array_data, sensor_locations)
+                data_array = TopographyCalculations.compute_topography_data(array_data, sensor_locations,
+                                                                            connectivity.gid)
                 if numpy.any(numpy.isnan(array_data)):
                     titles[i] = titles[i] + " - Topography contains nan"
                 if not numpy.any(array_data):
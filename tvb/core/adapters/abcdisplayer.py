@@ -53,6 +53,7 @@ class ABCDisplayer(ABCSynchronous):
     PARAM_FIGURE_SIZE = 'figure_size'
     VISUALIZERS_ROOT = ''
     VISUALIZERS_URL_PREFIX = ''
+    VISUALIZERS_BINARY_URL_PREFIX = ''
 
 
     def get_output(self):
@@ -142,17 +143,41 @@ class ABCDisplayer(ABCSynchronous):
 
 
     @staticmethod
-    def paths2url(datatype_entity, attribute_name, flatten=False, parameter=None):
+    def paths2url(datatype_entity, attribute_name, flatten=False, parameter=None, binary=False):
         """
         Prepare a File System Path for passing into an URL.
+        When binary is True, the URL will point towards the typed-array transport, instead of JSON.
         """
-        url = ABCDisplayer.VISUALIZERS_URL_PREFIX + datatype_entity.gid + '/' + attribute_name + '/' + str(flatten)
+        url = ABCDisplayer.get_url_prefix(binary) + datatype_entity.gid + '/' + attribute_name + '/' + str(flatten)
 
         if parameter is not None:
             url += "?" + str(parameter)
         return url
 
 
+    @staticmethod
+    def get_url_prefix(binary=False):
+        """
+        :returns: URL prefix for reading DataType attributes, as JSON or as binary typed-array frames
+        """
+        if binary and ABCDisplayer.VISUALIZERS_BINARY_URL_PREFIX:
+            return ABCDisplayer.VISUALIZERS_BINARY_URL_PREFIX
+        return ABCDisplayer.VISUALIZERS_URL_PREFIX
+
+
+    @staticmethod
+    def to_binary_urls(urls):
+        """
+        Point JSON attribute URLs, such as those built by the library datatypes for surface slices,
+        towards the typed-array transport. Both endpoints share the same URL layout.
+        """
+        json_prefix = ABCDisplayer.VISUALIZERS_URL_PREFIX
+        binary_prefix = ABCDisplayer.get_url_prefix(binary=True)
+        if not json_prefix or binary_prefix == json_prefix:
+            return urls
+        return [binary_prefix + url[len(json_prefix):] if url.startswith(json_prefix) else url for url in urls]
+
+
     @staticmethod
     def build_template_params_for_subselectable_datatype(sub_selectable):
         """
@@ -33,7 +33,7 @@ Preparation validation and manipulation of adapter input trees
 .. moduleauthor:: Mihai Andrei <mihai.andrei@codemart.ro>
 """
 
-from copy import copy
+from copy import copy, deepcopy
 import json
 import numpy
 from tvb.basic.filters.chain import FilterChain
@@ -277,7 +277,7 @@ class InputTreeManager(object):
                 new_p[KEY_ATTRIBUTES] = InputTreeManager.fill_defaults(param[KEY_ATTRIBUTES], data,
                                                                        fill_unselected_branches)
             if param.get(KEY_OPTIONS) is not None:
-                new_options = param[KEY_OPTIONS]
+                new_options = list(param[KEY_OPTIONS])
                 if param[KEY_NAME] in data or fill_unselected_branches:
                     selected_values = []
                     if param[KEY_NAME] in data:
@@ -596,7 +596,18 @@ class InputTreeManager(object):
 
 
     @staticmethod
-    def _populate_values(data_list, type_, category_key):
+    def _load_category(category_key):
+        """
+        :param category_key: an algorithm category, or its id
+        :returns: the algorithm category, loaded from DB only when an id is given
+        """
+        if category_key is None or isinstance(category_key, model.AlgorithmCategory):
+            return category_key
+        return dao.get_category_by_id(category_key)
+
+
+    @staticmethod
+    def _populate_values(data_list, category):
         """
         Populate meta-data fields for data_list (list of DataTypes).
 
@@ -610,11 +621,7 @@ class InputTreeManager(object):
             # Here we only populate with DB data, actual
             # XML check will be done after select and submit.
             entity_gid = value[2]
-            actual_entity = dao.get_generic_entity(type_, entity_gid, "gid")
-            display_name = ''
-            if actual_entity is not None and len(actual_entity) > 0 and isinstance(actual_entity[0], model.DataType):
-                display_name = actual_entity[0].display_name
-            display_name += ' - ' + (value[3] or "None ")
+            display_name = value[8] + ' - ' + (value[3] or "None ")
             if value[5]:
                 display_name += ' - From: ' + str(value[5])
             else:
@@ -624,8 +631,7 @@ class InputTreeManager(object):
             display_name += ' - ID:' + str(value[0])
             all_field_values += str(entity_gid) + ','
             values.append({KEY_NAME: display_name, KEY_VALUE: entity_gid})
-        if category_key is not None:
-            category = dao.get_category_by_id(category_key)
+        if category is not None:
             if not category.display and not category.rawinput and len(data_list) > 1:
                 values.insert(0, {KEY_NAME: "All", KEY_VALUE: all_field_values[:-1]})
         return values
@@ -636,24 +642,28 @@ class InputTreeManager(object):
         """
         Converts all datatypes that match the project_id, type_name and filter_condition
         to a {name: , value:} dict used to populate options in the input tree ui
+
+        :param category_key: the algorithm category, or its id
         """
         # todo: normalize all itree[KEY_TYPE] to be a python type, not a str, not a None etc
         if isinstance(type_name, basestring):
             data_type_cls = get_class_by_name(type_name)
         else:
             data_type_cls = type_name
-        # todo: send category instead of category_key to avoid redundant queries
         # NOTE these functions are coupled via data_list, _populate_values makes no sense without _get_available_datatypes
         data_list, total_count = get_filtered_datatypes(project_id, data_type_cls,
                                                         filter_condition)
-        values = self._populate_values(data_list, data_type_cls, category_key)
+        values = self._populate_values(data_list, self._load_category(category_key))
         return values, total_count
 
 
     def fill_input_tree_with_options(self, attributes_list, project_id, category_key):
         """
         For a datatype node in the input tree, load all instances from the db that fit the filters.
+
+        :param category_key: the algorithm category, or its id. It is loaded once, for the entire tree.
         """
+        category_key = self._load_category(category_key)
         result = []
         for param in attributes_list:
             if param.get(KEY_UI_HIDE):
@@ -663,7 +673,9 @@ class InputTreeManager(object):
             if KEY_TYPE in param and param[KEY_TYPE] not in STATIC_ACCEPTED_TYPES:
 
                 if KEY_CONDITION in param:
-                    filter_condition = param[KEY_CONDITION]
+                    # Do not add the condition below on the original filter: the tree can be a shared one
+                    filter_condition = deepcopy(param[KEY_CONDITION])
+                    transformed_param[KEY_CONDITION] = filter_condition
                 else:
                     filter_condition = FilterChain('')
                 filter_condition.add_condition(FilterChain.datatype + ".visible", "==", True)
@@ -595,7 +595,18 @@ class InputTreeManager(object):
 
 
     @staticmethod
-    def _populate_values(data_list, type_, category_key, complex_dt_attributes=None):
+    def _load_category(category_key):
+        """
+        :param category_key: an algorithm category, or its id
+        :returns: the algorithm category, loaded from DB only when an id is given
+        """
+        if category_key is None or isinstance(category_key, model.AlgorithmCategory):
+            return category_key
+        return dao.get_category_by_id(category_key)
+
+
+    @staticmethod
+    def _populate_values(data_list, category, complex_dt_attributes=None):
         """
         Populate meta-data fields for data_list (list of DataTypes).
 
@@ -605,13 +616,9 @@ class InputTreeManager(object):
         """
         values = []
         all_field_values = []
-        for id_, _, entity_gid, subject, completion_date, group, gr_name, tag1 in data_list:
+        for id_, _, entity_gid, subject, completion_date, group, gr_name, tag1, display_name in data_list:
             # Here we only populate with DB data, actual
             # XML check will be done after select and submit.
-            actual_entity = dao.get_generic_entity(type_, entity_gid, "gid")
-            display_name = ''
-            if actual_entity is not None and len(actual_entity) > 0 and isinstance(actual_entity[0], model.DataType):
-                display_name = actual_entity[0].display_name
             display_name += ' - ' + (subject or "None ")
             if group:
                 display_name += ' - From: ' + str(group)
@@ -625,8 +632,7 @@ class InputTreeManager(object):
             if complex_dt_attributes is not None:
                 ### TODO apply filter on sub-attributes
                 values[-1][KEY_ATTRIBUTES] = complex_dt_attributes  # this is the copy of complex dtype attributes on all db options
-        if category_key is not None:
-            category = dao.get_category_by_id(category_key)
+        if category is not None:
             if not category.display and not category.rawinput and len(data_list) > 1:
                 values.insert(0, {KEY_NAME: "All", KEY_VALUE: ','.join(all_field_values)})
         return values
@@ -639,12 +645,10 @@ class InputTreeManager(object):
         to a {name: , value:} dict used to populate options in the input tree ui
         '''
         data_type_cls = get_class_by_name(type_name)
-        #todo: send category instead of category_key to avoid redundant queries
         #NOTE these functions are coupled via data_list, _populate_values makes no sense without _get_available_datatypes
         data_list, total_count = get_filtered_datatypes(project_id, data_type_cls,
                                                         filter_condition)
-        values = self._populate_values(data_list, data_type_cls,
-                                       category_key, complex_dt_attributes)
+        values = self._populate_values(data_list, self._load_category(category_key), complex_dt_attributes)
         return values, total_count
 
 
@@ -652,6 +656,7 @@ class InputTreeManager(object):
         """
         For a datatype node in the input tree, load all instances from the db that fit the filters.
         """
+        category_key = self._load_category(category_key)
         result = []
         for param in attributes_list:
             if getattr(param, KEY_UI_HIDE, False):
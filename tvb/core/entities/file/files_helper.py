@@ -35,6 +35,8 @@
 import os
 import shutil
 import json
+import tempfile
+import threading
 from zipfile import ZipFile, ZIP_DEFLATED, BadZipfile
 from tvb.basic.profile import TvbProfile
 from tvb.basic.logger.builder import get_logger
@@ -44,8 +46,7 @@ from tvb.core.entities.file.xml_metadata_handlers import XMLReader, XMLWriter
 from tvb.core.entities.file.exceptions import FileStructureException
 
 
-from threading import Lock
-LOCK_CREATE_FOLDER = Lock()
+LOCK_CREATE_FOLDER = threading.Lock()
 
 
 class FilesHelper():
@@ -132,8 +133,27 @@ class FilesHelper():
         except OSError:
             self.logger.exception("A problem occurred while removing folder.")
             raise FileStructureException("Permission denied. Make sure you have write access on TVB folder!")
-     
-     
+
+
+    def remove_project_structure_async(self, project_name):
+        """
+        Move the project folder aside into TEMP (so that its name can be reused immediately),
+        and remove it from disk on a background thread. THROW FileStructureException.
+        """
+        try:
+            complete_path = self.get_project_folder(project_name)
+            self.check_created(TvbProfile.current.TVB_TEMP_FOLDER)
+            trash_path = tempfile.mkdtemp(prefix='removed_project_', dir=TvbProfile.current.TVB_TEMP_FOLDER)
+            os.rename(complete_path, os.path.join(trash_path, os.path.basename(complete_path)))
+        except OSError:
+            self.logger.exception("A problem occurred while moving folder.")
+            raise FileStructureException("Permission denied. Make sure you have write access on TVB folder!")
+        thread = threading.Thread(target=shutil.rmtree, args=(trash_path, True))
+        thread.start()
+        self.logger.debug("Project folders are being removed for " + project_name)
+        return thread
+
+
     def get_project_meta_file_path(self, project_name):
         """
         Retrieve project meta info file path.
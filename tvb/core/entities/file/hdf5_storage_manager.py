@@ -38,6 +38,7 @@ Persistence of data in HDF5 format.
 import os
 import copy
 import threading
+from contextlib import contextmanager
 import h5py as hdf5
 import numpy as numpy
 import tvb.core.utils as utils
@@ -69,6 +70,9 @@ class HDF5StorageManager(object):
     DATETIME_VALUE_PREFIX = "datetime:"
     DATE_TIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
     LOCKS = {}
+    ## Process-wide count of array bytes passed through read / write calls (used for operation profiling).
+    BYTES_READ = 0
+    BYTES_WRITTEN = 0
 
 
     def __init__(self, storage_folder, file_name, buffer_size=600000):
@@ -84,6 +88,7 @@ class HDF5StorageManager(object):
         self.__buffer_size = buffer_size
         self.__buffer_array = None
         self.data_buffers = {}
+        self._metadata_batch = None
 
 
     def is_valid_hdf5_file(self):
@@ -127,6 +132,7 @@ class HDF5StorageManager(object):
             else:
                 raise IncompatibleFileManagerException("Cannot update existing H5 DataSet %s with a different shape. "
                                                        "Try defining it as chunked!" % full_dataset_name)
+            HDF5StorageManager.BYTES_WRITTEN += getattr(data_to_store, 'nbytes', 0)
 
         finally:
             # Now close file
@@ -174,6 +180,7 @@ class HDF5StorageManager(object):
         else:
             if not data_buffer.buffer_data(data_to_store):
                 data_buffer.flush_buffered_data()
+        HDF5StorageManager.BYTES_WRITTEN += getattr(data_to_store, 'nbytes', 0)
         if close_file:
             self.close_file()
 
@@ -230,9 +237,10 @@ class HDF5StorageManager(object):
                     result = data_array[()]
                     if isinstance(result, hdf5.Empty):
                         return numpy.empty([])
-                    return result
                 else:
-                    return data_array[data_slice]
+                    result = data_array[data_slice]
+                HDF5StorageManager.BYTES_READ += getattr(result, 'nbytes', 0)
+                return result
             else:
                 if not ignore_errors:
                     LOG.error("Trying to read data from a missing data set: %s" % dataset_name)
@@ -274,6 +282,32 @@ class HDF5StorageManager(object):
             self.close_file()
 
 
+    def get_data_chunks(self, dataset_name, where=ROOT_NODE_PATH, ignore_errors=False):
+        """
+        This method reads the shape of the chunks in which the given data set is laid out on disk
+
+        :param dataset_name: Name of the data set
+        :param where: represents the path where dataset is stored (e.g. /data/info)
+        :returns: a tuple containing the chunk shape, or None when the data set is stored contiguously
+
+        """
+        if dataset_name is None:
+            dataset_name = ''
+        if where is None:
+            where = self.ROOT_NODE_PATH
+
+        try:
+            hdf5File = self._open_h5_file('r')
+            return hdf5File[where + dataset_name].chunks
+        except KeyError:
+            if not ignore_errors:
+                LOG.debug("Trying to read chunks from a missing data set: %s" % dataset_name)
+                raise MissingDataSetException("Could not locate dataset: %s" % dataset_name)
+            return None
+        finally:
+            self.close_file()
+
+
     def set_metadata(self, meta_dictionary, dataset_name='', tvb_specific_metadata=True, where=ROOT_NODE_PATH):
         """
         Set meta-data information for root node or for a given data set.
@@ -290,23 +324,62 @@ class HDF5StorageManager(object):
         if where is None:
             where = self.ROOT_NODE_PATH
 
-        # Open file to read data
-        hdf5File = self._open_h5_file()
+        attributes = {}
+        for meta_key in meta_dictionary:
+            key_to_store = meta_key
+            if tvb_specific_metadata:
+                key_to_store = self.TVB_ATTRIBUTE_PREFIX + meta_key
+            attributes[key_to_store] = self._serialize_value(meta_dictionary[meta_key])
+
+        if self._metadata_batch is not None:
+            self._metadata_batch.setdefault(where + dataset_name, {}).update(attributes)
+        else:
+            self.__write_metadata({where + dataset_name: attributes})
+
+
+    @contextmanager
+    def metadata_batch(self):
+        """
+        Within this context, `set_metadata` calls are only collected. At exit, all the collected
+        attributes are written with a single open / lock cycle on the file.
+        Nested batches are merged into the outer one.
+        """
+        if self._metadata_batch is not None:
+            yield
+            return
+        self._metadata_batch = {}
         try:
-            node = hdf5File[where + dataset_name]
-        except KeyError:
-            LOG.debug("Trying to set metadata on a missing data set: %s" % dataset_name)
-            node = hdf5File.create_dataset(where + dataset_name, (1,))
+            yield
+            self.flush_metadata_batch()
+        finally:
+            self._metadata_batch = None
 
+
+    def flush_metadata_batch(self):
+        """
+        Write the attributes collected so far in the current metadata batch.
+        """
+        if self._metadata_batch:
+            pending, self._metadata_batch = self._metadata_batch, {}
+            self.__write_metadata(pending)
+
+
+    def __write_metadata(self, nodes_attributes):
+        """
+        Write attributes on file nodes, opening the file once.
+
+        :param nodes_attributes: dictionary {node path: {attribute name: serialized value}}
+        """
+        hdf5File = self._open_h5_file()
         try:
-            # Now set meta-data
-            for meta_key in meta_dictionary:
-                key_to_store = meta_key
-                if tvb_specific_metadata:
-                    key_to_store = self.TVB_ATTRIBUTE_PREFIX + meta_key
-
-                processed_value = self._serialize_value(meta_dictionary[meta_key])
-                node.attrs[key_to_store] = processed_value
+            for node_path, attributes in nodes_attributes.items():
+                try:
+                    node = hdf5File[node_path]
+                except KeyError:
+                    LOG.debug("Trying to set metadata on a missing data set: %s" % node_path)
+                    node = hdf5File.create_dataset(node_path, (1,))
+                for key_to_store, processed_value in attributes.items():
+                    node.attrs[key_to_store] = processed_value
         finally:
             self.close_file()
 
@@ -347,6 +420,7 @@ class HDF5StorageManager(object):
              
         """
         LOG.debug("Deleting metadata: %s for dataset: %s" % (meta_key, dataset_name))
+        self.flush_metadata_batch()
         if dataset_name is None:
             dataset_name = ''
         if where is None:
@@ -381,6 +455,7 @@ class HDF5StorageManager(object):
         
         """
         LOG.debug("Retrieving metadata for dataset: %s" % dataset_name)
+        self.flush_metadata_batch()
         if dataset_name is None:
             dataset_name = ''
         if where is None:
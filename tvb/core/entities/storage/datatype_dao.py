@@ -275,6 +275,22 @@ class DatatypeDAO(RootDAO):
         return query.all()
 
 
+    def get_datatypes_to_detach(self, project_id, types_with_side_effects):
+        """
+        Get the DataTypes from a given project which can not be simply dropped together with the project:
+        those linked into other projects (DataTypeGroups excepted) and those of `types_with_side_effects`.
+        """
+        linked_ids = self.session.query(model.Links.fk_from_datatype).filter(model.Links.fk_to_project != project_id)
+        group_ids = self.session.query(model.DataTypeGroup.id)
+        query = self.session.query(model.DataType
+                    ).join((model.Operation, model.Operation.id == model.DataType.fk_from_operation)
+                    ).filter(model.Operation.fk_launched_in == project_id
+                    ).filter(or_(and_(model.DataType.id.in_(linked_ids), not_(model.DataType.id.in_(group_ids))),
+                                 model.DataType.type.in_(types_with_side_effects))
+                    ).order_by(model.DataType.id)
+        return query.all()
+
+
     def get_data_in_project(self, project_id, visibility_filter=None, filter_value=None):
         """
         Get all the DataTypes for a given project, including Linked Entities and DataType Groups.
@@ -484,7 +500,9 @@ class DatatypeDAO(RootDAO):
     def get_values_of_datatype(self, project_id, datatype_class, filters=None, page_size=50):
         """
         Retrieve a list of dataTypes matching a filter inside a project.
-        :returns: (results, total_count) maximum page_end rows are returned, to avoid endless time when loading a page
+        :returns: (results, total_count) maximum page_end rows are returned, to avoid endless time when loading a page.
+            Each result row is (id, type, gid, subject, completion_date, user_group, operation group name, user_tag_1,
+            display_name), where the display names of all the rows are loaded at once.
         """
         result = []
         count = 0
@@ -520,6 +538,11 @@ class DatatypeDAO(RootDAO):
 
             result = query.limit(max(page_size, 0)).all()
             count = query.count()
+
+            if result:
+                entities = self.session.query(datatype_class).filter(datatype_class.id.in_([row[0] for row in result]))
+                display_names = dict((entity.id, entity.display_name) for entity in entities.all())
+                result = [tuple(row) + (display_names.get(row[0], ''),) for row in result]
         except Exception as excep:
             self.logger.exception(excep)
 
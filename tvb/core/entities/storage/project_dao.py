@@ -38,11 +38,14 @@ DAO operation related to Users and Projects are defined here.
 from sqlalchemy import or_, and_, func
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.sql.expression import desc
+from sqlalchemy.orm import class_mapper
 from sqlalchemy.orm.exc import NoResultFound
 from tvb.basic.profile import TvbProfile
 from tvb.core.entities import model
 from tvb.core.entities.storage.root_dao import RootDAO
 
+### Maximum number of identifiers in one DELETE ... WHERE id IN (...) statement (SQLite allows 999 variables).
+BULK_DELETE_CHUNK = 500
 
 
 class CaseDAO(RootDAO):
@@ -198,6 +201,87 @@ class CaseDAO(RootDAO):
         self.session.commit()
 
 
+    def delete_project_bulk(self, project_id):
+        """
+        Remove PROJECT entity by ID, together with its Bursts, Workflows, Operations, DataTypes and Links.
+        The entities to remove are found with a few set-based queries, and dropped with batched
+        DELETE ... WHERE id IN (...) statements, children tables first.
+        DataTypes needing a specific remover, or linked in other projects, should be detached before.
+        """
+        operation_ids = self.session.query(model.Operation.id).filter(model.Operation.fk_launched_in == project_id)
+        operation_ids = [row[0] for row in operation_ids]
+        datatypes = self.session.query(model.DataType.id, model.DataType.module, model.DataType.type
+                        ).join((model.Operation, model.Operation.id == model.DataType.fk_from_operation)
+                        ).filter(model.Operation.fk_launched_in == project_id).all()
+        burst_ids = [row[0] for row in self.session.query(model.BurstConfiguration.id
+                                                          ).filter(model.BurstConfiguration.fk_project == project_id)]
+        workflow_ids = self.session.query(model.Workflow.id).filter(or_(model.Workflow.fk_project == project_id,
+                                                                        model.Workflow.fk_burst.in_(burst_ids or [-1])))
+        workflow_ids = [row[0] for row in workflow_ids]
+
+        ## Specific DataType tables first, grouped by their mapped class, then DATA_TYPES with the groups last.
+        datatype_ids, group_ids = [], []
+        tables_ids = {}
+        for dt_id, module, class_name in datatypes:
+            if class_name == self.EXCEPTION_DATATYPE_GROUP:
+                group_ids.append(dt_id)
+            else:
+                datatype_ids.append(dt_id)
+            tables_ids.setdefault((module, class_name), []).append(dt_id)
+        for (module, class_name), ids in tables_ids.iteritems():
+            for table in self._get_datatype_tables(module, class_name):
+                self._delete_in_chunks(table, ids)
+
+        self._delete_in_chunks(model.Links.__table__, datatype_ids + group_ids, model.Links.fk_from_datatype)
+        self.session.query(model.Links).filter(model.Links.fk_to_project == project_id
+                                               ).delete(synchronize_session=False)
+        self._delete_in_chunks(model.DataType.__table__, datatype_ids)
+        self._delete_in_chunks(model.DataType.__table__, group_ids)
+
+        self._delete_in_chunks(model.ResultFigure.__table__, operation_ids, model.ResultFigure.fk_from_operation)
+        self.session.query(model.ResultFigure).filter(model.ResultFigure.fk_in_project == project_id
+                                                      ).delete(synchronize_session=False)
+        self._delete_in_chunks(model.OperationProcessIdentifier.__table__, operation_ids,
+                               model.OperationProcessIdentifier.fk_from_operation)
+        self._delete_in_chunks(model.WorkflowStep.__table__, workflow_ids, model.WorkflowStep.fk_workflow)
+        self._delete_in_chunks(model.WorkflowStepView.__table__, workflow_ids, model.WorkflowStepView.fk_workflow)
+        self._delete_in_chunks(model.Workflow.__table__, workflow_ids)
+        self._delete_in_chunks(model.Operation.__table__, operation_ids)
+        self.session.query(model.OperationGroup).filter(model.OperationGroup.fk_launched_in == project_id
+                                                        ).delete(synchronize_session=False)
+        self._delete_in_chunks(model.BurstConfiguration.__table__, burst_ids)
+        self.session.commit()
+        self.session.expire_all()
+
+        self.delete_project(project_id)
+        return len(datatypes), len(operation_ids)
+
+
+    def _delete_in_chunks(self, table, ids, column=None):
+        """
+        Issue DELETE statements on `table`, for rows with `column` (default table's id) in `ids`,
+        in batches of at most BULK_DELETE_CHUNK values.
+        """
+        column = column if column is not None else table.c.id
+        for start in xrange(0, len(ids), BULK_DELETE_CHUNK):
+            self.session.execute(table.delete().where(column.in_(ids[start:start + BULK_DELETE_CHUNK])))
+
+
+    def _get_datatype_tables(self, module, class_name):
+        """
+        :returns: the tables specific to a mapped DataType class, from the most specific one up,
+                  without the common DATA_TYPES table.
+        """
+        try:
+            entity_class = getattr(__import__(module, globals(), locals(), [class_name]), class_name)
+        except (ImportError, AttributeError):
+            self.logger.warning("Could not find class %s.%s, only its DATA_TYPES rows are removed." % (module,
+                                                                                                      class_name))
+            return []
+        tables = [mapper.local_table for mapper in class_mapper(entity_class).iterate_to_root()]
+        return [table for table in tables if table is not model.DataType.__table__]
+
+
     def get_project_disk_size(self, project_id):
         """
         Do a SUM on DATA_TYPES table column DISK_SIZE, for the current project.
@@ -52,6 +52,7 @@ from tvb.basic.logger.builder import get_logger
 from tvb.core.adapters.abcadapter import ABCAdapter
 from tvb.core.entities.storage import dao
 from tvb.core.utils import parse_json_parameters
+from tvb.core.operation_profiler import OperationProfiler, get_profiling_mode
 from tvb.core.services.operation_service import OperationService
 from tvb.core.services.workflow_service import WorkflowService
 
@@ -72,12 +73,14 @@ def do_operation_launch(operation_id):
         PARAMS = parse_json_parameters(curent_operation.parameters)
         adapter_instance = ABCAdapter.build_adapter(stored_adapter)
 
-        ## Un-comment bellow for profiling an operation:
-        ## import cherrypy.lib.profiler as profiler
-        ## p = profiler.Profiler("/Users/lia.domide/TVB/profiler/")
-        ## p.run(OperationService().initiate_prelaunch, curent_operation, adapter_instance, {}, **PARAMS)
-
-        OperationService().initiate_prelaunch(curent_operation, adapter_instance, {}, **PARAMS)
+        ## Opt-in resource accounting, see tvb.core.operation_profiler
+        profiling_mode = get_profiling_mode()
+        if profiling_mode is not None:
+            OperationProfiler(curent_operation.id, profiling_mode).run(OperationService().initiate_prelaunch,
+                                                                        curent_operation, adapter_instance, {},
+                                                                        **PARAMS)
+        else:
+            OperationService().initiate_prelaunch(curent_operation, adapter_instance, {}, **PARAMS)
         LOGGER.debug("Successfully finished operation " + str(operation_id))
 
     except Exception as excep:
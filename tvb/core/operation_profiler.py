@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Opt-in resource accounting for operations launched through operation_async_launcher.
+
+Set the environment variable TVB_PROFILE_OPERATIONS before starting TVB:
+
+- "stats" records for every operation the wall time, CPU time, peak RSS, the array bytes read and
+  written through HDF5StorageManager and the number of SQL statements. The record is written as JSON
+  into the operation folder (PROFILE_FILE_NAME), away from the operation messages shown to users.
+- "cprofile" records the same, and also dumps a cProfile file <operation_id>.profile
+  into the operation folder.
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+from sqlalchemy import event
+from sqlalchemy.engine.base import Engine
+from tvb.basic.logger.builder import get_logger
+from tvb.core.entities.file.files_helper import FilesHelper
+from tvb.core.entities.file.hdf5_storage_manager import HDF5StorageManager
+from tvb.core.entities.storage import dao
+
+try:
+    import resource
+except ImportError:
+    ## Not available on Windows, peak RSS is not recorded there.
+    resource = None
+
+PROFILING_ENV_VARIABLE = "TVB_PROFILE_OPERATIONS"
+PROFILING_STATS = "stats"
+PROFILING_CPROFILE = "cprofile"
+PROFILE_FILE_NAME = "Profile.json"
+
+LOGGER = get_logger(__name__)
+
+### Statements executed on any DB engine in this process. The listener is attached once, on first use.
+_SQL_STATEMENTS = [0]
+_SQL_LISTENER_ATTACHED = [False]
+
+
+
+def get_profiling_mode():
+    """
+    :returns: PROFILING_STATS, PROFILING_CPROFILE or None, as requested through PROFILING_ENV_VARIABLE
+    """
+    mode = os.environ.get(PROFILING_ENV_VARIABLE, "").strip().lower()
+    if mode in (PROFILING_STATS, PROFILING_CPROFILE):
+        return mode
+    return None
+
+
+
+def read_operation_profile(operation):
+    """
+    :returns: the dictionary recorded by OperationProfiler for an operation, or None when it was not profiled.
+    """
+    operation_folder = FilesHelper().get_operation_folder(operation.project.name, operation.id)
+    profile_path = os.path.join(operation_folder, PROFILE_FILE_NAME)
+    if not os.path.exists(profile_path):
+        return None
+    with open(profile_path) as profile_file:
+        return json.load(profile_file)
+
+
+
+def _count_statement(*_):
+    _SQL_STATEMENTS[0] += 1
+
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    ## Linux reports kB, while Mac OS reports bytes.
+    if sys.platform == 'darwin':
+        peak_rss //= 1024
+    return peak_rss
+
+
+
+class OperationProfiler(object):
+    """
+    Measure the resources used by one operation, and store them in the operation folder.
+    """
+
+    def __init__(self, operation_id, mode=PROFILING_STATS):
+        self.operation_id = operation_id
+        self.mode = mode
+        self.stats = None
+        if not _SQL_LISTENER_ATTACHED[0]:
+            event.listen(Engine, "after_cursor_execute", _count_statement)
+            _SQL_LISTENER_ATTACHED[0] = True
+
+
+    def run(self, func, *args, **kwargs):
+        """
+        Call func(*args, **kwargs) while measuring it, then store the measurements (even when func fails).
+        """
+        statements = _SQL_STATEMENTS[0]
+        bytes_read = HDF5StorageManager.BYTES_READ
+        bytes_written = HDF5StorageManager.BYTES_WRITTEN
+        cpu_start = sum(os.times()[:2])
+        wall_start = time.time()
+        profile = cProfile.Profile() if self.mode == PROFILING_CPROFILE else None
+        try:
+            if profile is not None:
+                return profile.runcall(func, *args, **kwargs)
+            return func(*args, **kwargs)
+        finally:
+            self.stats = {'wall_time': round(time.time() - wall_start, 3),
+                          'cpu_time': round(sum(os.times()[:2]) - cpu_start, 3),
+                          'peak_rss_kb': _peak_rss_kb(),
+                          'h5_bytes_read': HDF5StorageManager.BYTES_READ - bytes_read,
+                          'h5_bytes_written': HDF5StorageManager.BYTES_WRITTEN - bytes_written,
+                          'sql_statements': _SQL_STATEMENTS[0] - statements}
+            try:
+                self._store(profile)
+            except Exception as excep:
+                LOGGER.exception("Could not store the profile of operation %s: %s" % (self.operation_id, excep))
+
+
+    def _store(self, profile):
+        """
+        Write the measurements into the operation folder, and dump the cProfile file there if any.
+        """
+        operation = dao.get_operation_by_id(self.operation_id)
+        operation_folder = FilesHelper().get_operation_folder(operation.project.name, self.operation_id)
+        stats_json = json.dumps(self.stats, sort_keys=True)
+        with open(os.path.join(operation_folder, PROFILE_FILE_NAME), 'w') as profile_file:
+            profile_file.write(stats_json)
+        LOGGER.info("Operation %s profile: %s" % (self.operation_id, stats_json))
+
+        if profile is not None:
+            profile.dump_stats(os.path.join(operation_folder, "%s.profile" % self.operation_id))
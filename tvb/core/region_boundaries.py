@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Region boundaries of a surface, as drawn by the 3D viewers.
+
+A triangle with vertices in more than one region contributes a line through the middle of its
+two edges crossing regions, or a 3 way star from its center when all its vertices are in distinct regions.
+The lines are computed for all triangles at once, and cached in the region mapping's H5 file,
+in one data set per split slice of the surface.
+"""
+
+import numpy
+from tvb.datatypes.surfaces import KEY_VERTICES, KEY_START
+
+
+BOUNDARY_ARRAYS = ("vertices", "lines", "normals")
+
+_STAR_LINES = numpy.array([0, 1, 0, 2, 0, 3])
+_SLICE_LINES = numpy.array([0, 1, 0, 0, 0, 0])
+
+
+
+def boundaries_dataset_name(surface, region_mapping, array_name, slice_idx=None):
+    """
+    :param array_name: one of BOUNDARY_ARRAYS; when slice_idx is None, the name of the cache marker
+    """
+    name = "boundaries_%s_%s_%s" % (surface.gid.replace('-', ''), region_mapping.gid.replace('-', ''), array_name)
+    if slice_idx is None:
+        return name
+    return "%s_%d" % (name, slice_idx)
+
+
+
+def compute_region_boundaries(vertices, normals, triangles, labels):
+    """
+    :param vertices: vertices of one surface slice
+    :param normals: vertex normals of the same slice
+    :param triangles: triangles indexing in the slice vertices
+    :param labels: region index of each slice vertex
+    :returns: flat boundary vertices, line indices and flat boundary normals,
+              in the order of the triangles they come from
+    """
+    triangles = numpy.asarray(triangles)
+    regions = numpy.asarray(labels)[triangles]
+    r0, r1, r2 = regions[:, 0], regions[:, 1], regions[:, 2]
+    on_boundary = (r0 != r1) | (r1 != r2) | (r2 != r0)
+    triangles, regions = triangles[on_boundary], regions[on_boundary]
+    r0, r1, r2 = regions[:, 0], regions[:, 1], regions[:, 2]
+
+    # The first edge crossing regions gives the 2 'conflicting' vertices, the 3rd one is dangling
+    first = numpy.where(r0 != r1, 0, numpy.where(r1 != r2, 1, 2))
+    second = (first + 1) % 3
+    dangling = (first + 2) % 3
+    rows = numpy.arange(len(triangles))
+    idx1, idx2, idx_dangling = triangles[rows, first], triangles[rows, second], triangles[rows, dangling]
+    reg1, reg2, reg_dangling = regions[rows, first], regions[rows, second], regions[rows, dangling]
+
+    is_star = (reg_dangling != reg1) & (reg_dangling != reg2)
+    # A line through the middle of the triangle cuts the 2 edges of the vertex alone in its region
+    pivot = numpy.where(reg_dangling == reg1, idx2, idx1)
+    keep_points = numpy.arange(4) < numpy.where(is_star, 4, 2)[:, numpy.newaxis]
+    keep_lines = numpy.arange(6) < numpy.where(is_star, 6, 2)[:, numpy.newaxis]
+
+    def _points(values):
+        values = numpy.asarray(values)
+        p1, p2, p_dangling = values[idx1], values[idx2], values[idx_dangling]
+        star = is_star[:, numpy.newaxis]
+        middle_12 = (p1 + p2) / 2
+        points = numpy.stack([numpy.where(star, (p1 + p2 + p_dangling) / 3, middle_12),
+                              numpy.where(star, middle_12, (values[pivot] + p_dangling) / 2),
+                              (p2 + p_dangling) / 2,
+                              (p_dangling + p1) / 2], axis=1)
+        return points[keep_points].ravel()
+
+    first_point = numpy.cumsum(keep_points.sum(axis=1)) - keep_points.sum(axis=1)
+    lines = numpy.where(is_star[:, numpy.newaxis], _STAR_LINES, _SLICE_LINES) + first_point[:, numpy.newaxis]
+    return _points(vertices), lines[keep_lines], _points(normals)
+
+
+
+def generate_region_boundaries(surface, region_mapping):
+    """
+    :returns: for each of BOUNDARY_ARRAYS, the list of its values in every split slice of the surface
+    """
+    labels = region_mapping.array_data
+    result = dict((name, []) for name in BOUNDARY_ARRAYS)
+    for slice_idx in range(surface.number_of_split_slices):
+        start = surface.split_slices[str(slice_idx)][KEY_VERTICES][KEY_START]
+        vertices = surface.get_vertices_slice(slice_idx)
+        slice_labels = labels[start:start + len(vertices)]
+        slice_values = compute_region_boundaries(vertices, surface.get_vertex_normals_slice(slice_idx),
+                                                 surface.get_triangles_slice(slice_idx), slice_labels)
+        for name, values in zip(BOUNDARY_ARRAYS, slice_values):
+            result[name].append(values)
+    return result
+
+
+
+def store_region_boundaries(surface, region_mapping):
+    """
+    Compute the boundaries once for this (surface, region mapping) pair, and keep them in the region mapping's file.
+    :returns: the number of split slices
+    """
+    marker = boundaries_dataset_name(surface, region_mapping, "slices")
+    stored = region_mapping.get_data(marker, ignore_errors=True)
+    if stored.size:
+        return int(stored[0])
+
+    boundaries = generate_region_boundaries(surface, region_mapping)
+    for name in BOUNDARY_ARRAYS:
+        for slice_idx, values in enumerate(boundaries[name]):
+            region_mapping.store_data(boundaries_dataset_name(surface, region_mapping, name, slice_idx), values)
+    region_mapping.store_data(marker, numpy.array([surface.number_of_split_slices]))
+    return surface.number_of_split_slices
@@ -40,6 +40,7 @@ from inspect import getmro
 from tvb.basic.filters.chain import FilterChain
 from tvb.basic.traits.exceptions import TVBException
 from tvb.basic.logger.builder import get_logger
+from tvb.basic.profile import TvbProfile
 from tvb.basic.traits.types_mapped import MappedType
 from tvb.core.adapters.input_tree import InputTreeManager
 from tvb.core.entities import model
@@ -58,6 +59,10 @@ class FlowService:
     Service Layer for all TVB generic Work-Flow operations.
     """
 
+    ## Introspected adapter input trees, before any project datatype is filled in.
+    ## Kept once per process: {(algorithm id, code version): input tree}
+    _STATIC_INPUT_TREES = {}
+
     def __init__(self):
         self.logger = get_logger(self.__class__.__module__)
         self.file_helper = FilesHelper()
@@ -103,23 +108,39 @@ class FlowService:
         return dao.get_operation_numbers(proj_id)
               
 
-    def prepare_adapter(self, project_id, stored_adapter):
+    def prepare_adapter(self, project_id, stored_adapter, cache_static_tree=False):
         """
         Having a  StoredAdapter, return the Tree Adapter Interface object, populated with datatypes from 'project_id'.
+
+        :param cache_static_tree: when True, the introspected tree (independent of the project) is built only once per
+            process, and reused. Filling the datatype options copies every node on the way, so the returned tree
+            can still be changed without affecting the cached one.
         """
         adapter_module = stored_adapter.module
         adapter_name = stored_adapter.classname
         try:
             # Prepare Adapter Interface, by populating with existent data,
             # in case of a parameter of type DataType.
-            adapter_instance = ABCAdapter.build_adapter(stored_adapter)
-            interface = adapter_instance.get_input_tree()
+            if cache_static_tree:
+                interface = self._get_static_input_tree(stored_adapter)
+            else:
+                interface = ABCAdapter.build_adapter(stored_adapter).get_input_tree()
             interface = self.input_tree_manager.fill_input_tree_with_options(interface, project_id, stored_adapter.fk_category)
             interface = self.input_tree_manager.prepare_param_names(interface)
             return interface
         except Exception:
             self.logger.exception('Not found:' + adapter_name + ' in:' + adapter_module)
             raise OperationException("Could not prepare " + adapter_name)
+
+
+    def _get_static_input_tree(self, stored_adapter):
+        """
+        :returns: the input tree of the adapter, as introspected; it is shared, so it should never be changed
+        """
+        key = (stored_adapter.id, TvbProfile.current.version.SVN_VERSION)
+        if key not in self._STATIC_INPUT_TREES:
+            self._STATIC_INPUT_TREES[key] = ABCAdapter.build_adapter(stored_adapter).get_input_tree()
+        return self._STATIC_INPUT_TREES[key]
     
     
     @staticmethod
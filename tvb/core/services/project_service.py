@@ -77,6 +77,8 @@ def initialize_storage():
 OPERATIONS_PAGE_SIZE = 20
 PROJECTS_PAGE_SIZE = 20
 KEY_VALUE = "value"
+## DataTypes whose removers also update other entities, thus can not be dropped in bulk.
+TYPES_WITH_REMOVE_SIDE_EFFECTS = ["Connectivity"]
 
 MONTH_YEAR_FORMAT = "%B %Y"
 DAY_MONTH_YEAR_FORMAT = "%d %B %Y"
@@ -289,28 +291,21 @@ class ProjectService:
 
 
     @transactional
-    def remove_project(self, project_id):
+    def remove_project(self, project_id, bulk=True):
         """
         Remove Project from DB and File Storage.
+
+        :param bulk: when True, drop the project content with batched DELETE statements and remove its folder
+                     on a background thread; otherwise go through the removers of every DataType in the project.
         """
         try:
             project2delete = dao.get_project_by_id(project_id)
 
             self.logger.debug("Deleting project: id=" + str(project_id) + ' name=' + project2delete.name)
-            project_bursts = dao.get_bursts_for_project(project_id)
-            for burst in project_bursts:
-                dao.remove_entity(burst.__class__, burst.id)
-
-            project_datatypes = dao.get_datatypes_in_project(project_id)
-            for one_data in project_datatypes:
-                self.remove_datatype(project_id, one_data.gid, True)
-
-            links = dao.get_links_for_project(project_id)
-            for one_link in links:
-                dao.remove_entity(model.Links, one_link.id)
-
-            self.structure_helper.remove_project_structure(project2delete.name)
-            dao.delete_project(project_id)
+            if bulk:
+                self._remove_project_bulk(project2delete)
+            else:
+                self._remove_project_per_entity(project2delete)
             self.logger.debug("Deleted project: id=" + str(project_id) + ' name=' + project2delete.name)
 
         except RemoveDataTypeException as excep:
@@ -324,6 +319,40 @@ class ProjectService:
             raise ProjectServiceException(str(excep))
 
 
+    def _remove_project_per_entity(self, project):
+        """
+        Remove the project content one entity at a time, then the project itself.
+        """
+        project_bursts = dao.get_bursts_for_project(project.id)
+        for burst in project_bursts:
+            dao.remove_entity(burst.__class__, burst.id)
+
+        project_datatypes = dao.get_datatypes_in_project(project.id)
+        for one_data in project_datatypes:
+            self.remove_datatype(project.id, one_data.gid, True)
+
+        links = dao.get_links_for_project(project.id)
+        for one_link in links:
+            dao.remove_entity(model.Links, one_link.id)
+
+        self.structure_helper.remove_project_structure(project.name)
+        dao.delete_project(project.id)
+
+
+    def _remove_project_bulk(self, project):
+        """
+        Detach the DataTypes still needed outside of this project, then drop everything else with set-based
+        queries. The project folder is moved aside and deleted asynchronously.
+        """
+        for datatype in dao.get_datatypes_to_detach(project.id, TYPES_WITH_REMOVE_SIDE_EFFECTS):
+            self._remove_project_node_files(project.id, datatype.gid, True)
+
+        no_datatypes, no_operations = dao.delete_project_bulk(project.id)
+        self.logger.debug("Removed %d DataTypes and %d Operations from project %s" % (no_datatypes, no_operations,
+                                                                                      project.name))
+        self.structure_helper.remove_project_structure_async(project.name)
+
+
     # ----------------- Methods for populating Data-Structure Page ---------------
 
     @staticmethod
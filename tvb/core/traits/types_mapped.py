@@ -64,6 +64,8 @@ class MappedType(model.DataType, mapped.MappedTypeLight):
     #### Transient fields below
     storage_path = None
     _current_metadata = {}
+    _current_channel_statistics = {}
+    _current_pyramids = {}
     framework_metadata = None
     logger = get_logger(__name__)
     _ui_complex_datatype = False
@@ -78,6 +80,8 @@ class MappedType(model.DataType, mapped.MappedTypeLight):
             self.storage_path = kwargs.pop(KWARG_STORAGE_PATH)
 
         self._current_metadata = dict()
+        self._current_channel_statistics = dict()
+        self._current_pyramids = dict()
         super(MappedType, self).__init__(**kwargs)
 
 
@@ -226,6 +230,35 @@ class MappedType(model.DataType, mapped.MappedTypeLight):
             previous_meta = self._current_metadata[data_name]
         self.__merge_metadata(new_metadata, previous_meta, data)
         self._current_metadata[data_name] = new_metadata
+        self.__update_channel_statistics(data_name, data, grow_dimension)
+        if data_name in self._current_pyramids and grow_dimension % data.ndim == 0:
+            self.__append_pyramid_rows(data_name, self._current_pyramids[data_name].update(data))
+
+
+    def configure_min_max_pyramid(self, data_name, factor=None):
+        """
+        Keep a MinMaxPyramid of an array, while it is written with store_data_chunk along its first dimension.
+        To be called before the first chunk is stored. The pyramid is completed by close_file.
+            :param data_name: name of the data-set
+            :param factor: number of rows reduced into one, from a pyramid level to the next
+        """
+        self._current_pyramids[data_name] = MinMaxPyramid(factor or MinMaxPyramid.DEFAULT_FACTOR)
+
+
+    def configure_channel_statistics(self, data_name):
+        """
+        Keep ChannelStatistics of an array, while it is written with store_data_chunk.
+        To be called before the first chunk is stored. The statistics are written by close_file.
+            :param data_name: name of the data-set
+        """
+        self._current_channel_statistics[data_name] = None
+
+
+    def __append_pyramid_rows(self, data_name, rows):
+        store_manager = self._get_file_storage_mng()
+        for level, minimum, maximum in rows:
+            store_manager.append_data(MinMaxPyramid.dataset_name(data_name, "min", level), minimum, 0, False)
+            store_manager.append_data(MinMaxPyramid.dataset_name(data_name, "max", level), maximum, 0, False)
 
 
     def get_data(self, data_name, data_slice=None, where=ROOT_NODE_PATH, ignore_errors=False, close_file=True):
@@ -240,6 +273,14 @@ class MappedType(model.DataType, mapped.MappedTypeLight):
         return store_manager.get_data(data_name, data_slice, where, ignore_errors, close_file)
 
 
+    def get_data_row(self, data_name, row, where=ROOT_NODE_PATH):
+        """
+        Read one row (index on the first dimension) of the given data set, e.g. one of the measures
+        stacked in a 2D array. The row may come as a string, when requested through an URL.
+        """
+        return self.get_data(data_name, (int(row),), where=where)
+
+
     def get_data_shape(self, data_name, where=ROOT_NODE_PATH):
         """
         This method reads data-shape from the given data set
@@ -439,14 +480,97 @@ class MappedType(model.DataType, mapped.MappedTypeLight):
     def close_file(self):
         """
         Close file used to store data.
+        The array meta-data collected while storing chunks is written at once, in a single file open.
         """
-        for data_name, new_metadata in six.iteritems(self._current_metadata):
-            ## Remove transient metadata, used just for performance issues
-            if self._METADATA_ARRAY_SIZE in new_metadata:
-                del new_metadata[self._METADATA_ARRAY_SIZE]
-            self.set_metadata(new_metadata, data_name)
         store_manager = self._get_file_storage_mng()
-        store_manager.close_file()
+        with store_manager.metadata_batch():
+            for data_name, new_metadata in six.iteritems(self._current_metadata):
+                ## Remove transient metadata, used just for performance issues
+                if self._METADATA_ARRAY_SIZE in new_metadata:
+                    del new_metadata[self._METADATA_ARRAY_SIZE]
+                self.set_metadata(new_metadata, data_name)
+            for data_name, pyramid in six.iteritems(self._current_pyramids):
+                rows, levels = pyramid.flush()
+                self.__append_pyramid_rows(data_name, rows)
+                self.set_metadata({MinMaxPyramid.FACTOR_META: pyramid.factor, MinMaxPyramid.LEVELS_META: levels},
+                                  data_name)
+            for data_name, statistics in six.iteritems(self._current_channel_statistics):
+                if statistics is None:
+                    continue
+                for statistic_name, value in six.iteritems(statistics.result()):
+                    store_manager.store_data(ChannelStatistics.dataset_name(data_name, statistic_name), value)
+            store_manager.close_file()
+
+
+    def get_channel_statistics(self, data_name, where=ROOT_NODE_PATH):
+        """
+        Read the per-channel statistics, written when data_name was stored in chunks after
+        configure_channel_statistics.
+        Each statistic has the shape of the array, with the grown dimension reduced to 1.
+            :returns: a dictionary {statistic name: numpy.ndarray}, or None for arrays without statistics
+        """
+        result = dict()
+        for statistic_name in ChannelStatistics.NAMES:
+            value = self.get_data(ChannelStatistics.dataset_name(data_name, statistic_name), where=where,
+                                  ignore_errors=True)
+            if value.size == 0:
+                return None
+            result[statistic_name] = value
+        return result
+
+
+    def read_min_max_page(self, from_idx, to_idx, pixel_width, specific_slices=None, data_name="data"):
+        """
+        Read the rows from_idx:to_idx of an array, reduced to at most pixel_width (minimum, maximum) pairs.
+        The coarsest MinMaxPyramid level still holding pixel_width rows in the range is read,
+        so the amount read is bounded by the display width, not by the array length.
+        Level rows overlapping the range only in part are replaced by the matching raw rows, reduced,
+        so no value from outside from_idx:to_idx is returned.
+            :param specific_slices: JSON list with an index (or null for all) for each dimension of the array;
+                                    the entry of the first dimension is ignored, from_idx:to_idx is used instead
+            :returns: a numpy.ndarray of shape (2, rows, ...), with the minimum and maximum of each row
+        """
+        from_idx, to_idx, pixel_width = int(from_idx), int(to_idx), max(int(pixel_width), 1)
+        if isinstance(specific_slices, six.string_types):
+            specific_slices = json.loads(specific_slices)
+        overall_shape = self.get_data_shape(data_name)
+        from_idx, to_idx = max(0, from_idx), min(to_idx, overall_shape[0])
+
+        other_slices = []
+        for dim in range(1, len(overall_shape)):
+            if specific_slices is None or specific_slices[dim] is None:
+                other_slices.append(slice(None))
+            else:
+                other_slices.append(slice(int(specific_slices[dim]), int(specific_slices[dim]) + 1))
+
+        metadata = self.get_metadata(data_name)
+        factor = metadata.get(MinMaxPyramid.FACTOR_META, MinMaxPyramid.DEFAULT_FACTOR)
+        level = 0
+        while (level < metadata.get(MinMaxPyramid.LEVELS_META, 0)
+               and (to_idx - from_idx) // factor ** (level + 1) >= pixel_width):
+            level += 1
+
+        if level == 0:
+            minimum = maximum = self.get_data(data_name, tuple([slice(from_idx, to_idx)] + other_slices))
+        else:
+            scale = factor ** level
+            first_row, last_row = -(-from_idx // scale), to_idx // scale
+            level_slice = tuple([slice(first_row, last_row)] + other_slices)
+            minimum = [self.get_data(MinMaxPyramid.dataset_name(data_name, "min", level), level_slice)]
+            maximum = [self.get_data(MinMaxPyramid.dataset_name(data_name, "max", level), level_slice)]
+            for raw_from, raw_to, at_start in ((from_idx, first_row * scale, True), (last_row * scale, to_idx, False)):
+                if raw_from < raw_to:
+                    raw = self.get_data(data_name, tuple([slice(raw_from, raw_to)] + other_slices))
+                    position = 0 if at_start else len(minimum)
+                    minimum.insert(position, numpy.fmin.reduce(raw, axis=0)[numpy.newaxis])
+                    maximum.insert(position, numpy.fmax.reduce(raw, axis=0)[numpy.newaxis])
+            minimum, maximum = numpy.concatenate(minimum), numpy.concatenate(maximum)
+
+        if len(minimum) > pixel_width:
+            starts = numpy.arange(pixel_width) * len(minimum) // pixel_width
+            minimum = numpy.fmin.reduceat(minimum, starts, axis=0)
+            maximum = numpy.fmax.reduceat(maximum, starts, axis=0)
+        return numpy.array([minimum, maximum])
 
 
     def _get_file_storage_mng(self):
@@ -544,6 +668,18 @@ class MappedType(model.DataType, mapped.MappedTypeLight):
                                                               ) / (prev_no + curr_no)
             result_meta[self._METADATA_ARRAY_SIZE] = prev_no + curr_no
 
+
+    def __update_channel_statistics(self, data_name, data, grow_dimension):
+        """
+        Add a new chunk to the statistics of each channel (position in the non-grown dimensions),
+        for the arrays configured with configure_channel_statistics.
+        """
+        if data_name not in self._current_channel_statistics or not ChannelStatistics.is_supported(data):
+            return
+        if self._current_channel_statistics[data_name] is None:
+            self._current_channel_statistics[data_name] = ChannelStatistics(grow_dimension % data.ndim)
+        self._current_channel_statistics[data_name].update(data)
+
     # ---------------------------- END ARRAY ATTR METADATA ------------------------
 
 
@@ -731,3 +867,153 @@ class SparseMatrix(mapped.SparseMatrix, Array):
             raise Exception("Unsupported format: %s" % mtx_format)
 
         return mtx
+
+
+
+class ChannelStatistics(object):
+    """
+    Running min, max, mean, variance and NaN count of each channel of an array written in chunks.
+    Chunks are merged with the pairwise formulas of Chan et al., so the full array is never read back.
+    NaN and infinite values are counted, and left out of the other statistics.
+    """
+
+    NAMES = ("min", "max", "mean", "variance", "nan_count")
+
+
+    def __init__(self, grow_dimension):
+        self.grow_dimension = grow_dimension
+        self.count = None
+        self.nan_count = None
+        self.minimum = None
+        self.maximum = None
+        self.mean = None
+        self.m2 = None
+
+
+    @staticmethod
+    def dataset_name(data_name, statistic_name):
+        return "%s_channel_%s" % (data_name, statistic_name)
+
+
+    @staticmethod
+    def is_supported(data):
+        return data.ndim > 1 and (numpy.issubdtype(data.dtype, numpy.floating)
+                                  or numpy.issubdtype(data.dtype, numpy.integer))
+
+
+    def update(self, data):
+        data = numpy.asarray(data, dtype=numpy.float64)
+        finite = numpy.isfinite(data)
+        count = finite.sum(axis=self.grow_dimension, keepdims=True)
+        nan_count = data.shape[self.grow_dimension] - count
+        minimum = numpy.where(finite, data, numpy.inf).min(axis=self.grow_dimension, keepdims=True)
+        maximum = numpy.where(finite, data, -numpy.inf).max(axis=self.grow_dimension, keepdims=True)
+        mean = numpy.where(finite, data, 0).sum(axis=self.grow_dimension, keepdims=True) / numpy.maximum(count, 1)
+        m2 = (numpy.where(finite, data - mean, 0) ** 2).sum(axis=self.grow_dimension, keepdims=True)
+
+        if self.count is None:
+            self.count, self.nan_count, self.minimum, self.maximum, self.mean, self.m2 = (count, nan_count, minimum,
+                                                                                          maximum, mean, m2)
+            return
+
+        total = self.count + count
+        delta = mean - self.mean
+        weight = count / numpy.maximum(total, 1.0)
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * weight
+        self.minimum = numpy.minimum(self.minimum, minimum)
+        self.maximum = numpy.maximum(self.maximum, maximum)
+        self.nan_count = self.nan_count + nan_count
+        self.count = total
+
+
+    def result(self):
+        """
+        :returns: a dictionary {statistic name: array}; channels without finite values have NaN statistics
+        """
+        empty = self.count == 0
+        return {"min": numpy.where(empty, numpy.nan, self.minimum),
+                "max": numpy.where(empty, numpy.nan, self.maximum),
+                "mean": numpy.where(empty, numpy.nan, self.mean),
+                "variance": numpy.where(empty, numpy.nan, self.m2 / numpy.maximum(self.count, 1)),
+                "nan_count": self.nan_count}
+
+
+
+class MinMaxPyramid(object):
+    """
+    Decimated copies of an array along its first dimension: level 1 keeps the minimum and maximum
+    of each block of `factor` rows, level 2 those of each `factor` blocks of level 1, and so on.
+    Chunks are reduced as they arrive, keeping in memory less than `factor` pending rows per level.
+    NaN values are ignored, unless a whole block is NaN.
+    """
+
+    DEFAULT_FACTOR = 8
+    MAX_LEVELS = 8
+    FACTOR_META = "MinMaxPyramidFactor"
+    LEVELS_META = "MinMaxPyramidLevels"
+
+
+    def __init__(self, factor=DEFAULT_FACTOR):
+        self.factor = factor
+        self.pending = []
+        self.emitted = []
+
+
+    @staticmethod
+    def dataset_name(data_name, statistic_name, level):
+        return "%s_pyramid_%s_%d" % (data_name, statistic_name, level)
+
+
+    def update(self, data):
+        """
+        :returns: a list of (level, minimum rows, maximum rows) completed by this chunk, to be appended
+        """
+        return self._feed(1, data, data)
+
+
+    def flush(self):
+        """
+        Reduce the rows still pending into a last, partial block on each level.
+        Levels which never completed a block are dropped.
+        :returns: the rows to append (as for update) and the number of levels kept
+        """
+        rows, levels = [], 0
+        for idx in range(len(self.pending)):
+            if self.emitted[idx] == 0:
+                break
+            levels = idx + 1
+            if self.pending[idx] is None:
+                continue
+            minimum, maximum = self.pending[idx]
+            self.pending[idx] = None
+            rows.extend(self._emit(idx + 1, numpy.fmin.reduce(minimum, axis=0)[numpy.newaxis],
+                                   numpy.fmax.reduce(maximum, axis=0)[numpy.newaxis]))
+        return rows, levels
+
+
+    def _feed(self, level, minimum, maximum):
+        if len(self.pending) < level:
+            self.pending.append(None)
+            self.emitted.append(0)
+        if self.pending[level - 1] is not None:
+            minimum = numpy.concatenate((self.pending[level - 1][0], minimum))
+            maximum = numpy.concatenate((self.pending[level - 1][1], maximum))
+
+        full = len(minimum) // self.factor * self.factor
+        self.pending[level - 1] = (minimum[full:].copy(), maximum[full:].copy()) if full < len(minimum) else None
+        if full == 0:
+            return []
+
+        blocks_shape = (full // self.factor, self.factor) + minimum.shape[1:]
+        block_min = numpy.fmin.reduce(minimum[:full].reshape(blocks_shape), axis=1)
+        block_max = numpy.fmax.reduce(maximum[:full].reshape(blocks_shape), axis=1)
+        self.emitted[level - 1] += len(block_min)
+        return self._emit(level, block_min, block_max)
+
+
+    def _emit(self, level, minimum, maximum):
+        rows = [(level, minimum, maximum)]
+        if level < self.MAX_LEVELS:
+            rows.extend(self._feed(level + 1, minimum, maximum))
+        return rows
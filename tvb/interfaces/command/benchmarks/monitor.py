@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Helpers for measuring wall time and peak memory (RSS) of a call.
+"""
+
+import time
+import threading
+import psutil
+
+
+class ResourceMonitor(object):
+    """
+    Samples the RSS of the current process in a background thread, while a call executes.
+    """
+
+    def __init__(self, sampling_interval=0.005):
+        self.sampling_interval = sampling_interval
+        self.process = psutil.Process()
+        self._running = False
+        self.peak_rss = 0
+
+
+    def _sample(self):
+        while self._running:
+            self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+            time.sleep(self.sampling_interval)
+
+
+    def measure(self, func, *args, **kwargs):
+        """
+        :returns: (func result, wall time in seconds, peak RSS increase over the RSS before the call, in bytes)
+        """
+        baseline = self.process.memory_info().rss
+        self.peak_rss = baseline
+        self._running = True
+        sampler = threading.Thread(target=self._sample)
+        sampler.daemon = True
+        sampler.start()
+        start = time.time()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            duration = time.time() - start
+            self._running = False
+            sampler.join()
+        self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+        return result, duration, self.peak_rss - baseline
+
+
+def format_size(size_bytes):
+    return "%.1f MB" % (size_bytes / (1024.0 * 1024.0))
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Compare the streaming NIFTI import (time blocks through nibabel's array proxy) with the former
+full-load import (one strided time slice per append), on a synthetic 4D volume.
+Reports wall time, throughput and peak RSS for each of them.
+
+Usage: python -m tvb.interfaces.command.benchmarks.nifti_import [X Y Z T]
+"""
+
+if __name__ == "__main__":
+    from tvb.basic.profile import TvbProfile
+    TvbProfile.set_profile(TvbProfile.COMMAND_PROFILE)
+
+import os
+import sys
+import shutil
+import tempfile
+import numpy
+import nibabel
+from tvb.adapters.uploaders.nifti.parser import NIFTIParser
+from tvb.datatypes.time_series import TimeSeriesVolume
+from tvb.interfaces.command.benchmarks.monitor import ResourceMonitor, format_size
+
+
+def _create_nifti_file(folder, shape):
+    """
+    Write a synthetic float32 4D NIFTI file, one time point at a time.
+    """
+    file_path = os.path.join(folder, "benchmark_%s.nii" % "x".join(str(dim) for dim in shape))
+    header = nibabel.Nifti1Header()
+    header.set_data_shape(shape)
+    header.set_data_dtype(numpy.float32)
+    header.set_zooms((2.0, 2.0, 2.0, 0.5))
+    data = numpy.memmap(file_path + ".raw", dtype=numpy.float32, mode="w+", shape=shape, order="F")
+    for i in range(shape[3]):
+        data[:, :, :, i] = numpy.random.rand(*shape[:3])
+    data.flush()
+    nibabel.Nifti1Image(data, numpy.eye(4), header).to_filename(file_path)
+    del data
+    os.remove(file_path + ".raw")
+    return file_path
+
+
+def _full_load_import(parser, time_series):
+    """
+    The import before streaming: load the whole volume, then append one strided slice per time point.
+    """
+    nifti_data = parser.nifti_image.get_data()
+    for i in range(parser.time_dim_size):
+        time_series.write_data_slice([nifti_data[:, :, :, i, ...]])
+    time_series.close_file()
+
+
+def _streaming_import(parser, time_series):
+    parser.parse(time_series, True)
+
+
+def main(shape):
+    folder = tempfile.mkdtemp(prefix="tvb_nifti_benchmark")
+    try:
+        nifti_file = _create_nifti_file(folder, shape)
+        size = os.path.getsize(nifti_file)
+        print("NIFTI file %s with shape %s, %s" % (nifti_file, shape, format_size(size)))
+        print("%-12s | %10s | %12s | %14s" % ("Import", "Time (s)", "MB/s", "Peak RSS delta"))
+
+        for name, import_function in [("streaming", _streaming_import), ("full load", _full_load_import)]:
+            parser = NIFTIParser(nifti_file)
+            storage_path = tempfile.mkdtemp(dir=folder)
+            time_series = TimeSeriesVolume(storage_path=storage_path)
+            _, duration, peak_rss = ResourceMonitor().measure(import_function, parser, time_series)
+            throughput = size / (1024.0 * 1024.0) / duration
+            print("%-12s | %10.2f | %12.1f | %14s" % (name, duration, throughput, format_size(peak_rss)))
+            shutil.rmtree(storage_path)
+    finally:
+        shutil.rmtree(folder, True)
+
+
+if __name__ == "__main__":
+    main(tuple(int(dim) for dim in sys.argv[1:5]) if len(sys.argv) > 4 else (96, 96, 60, 300))
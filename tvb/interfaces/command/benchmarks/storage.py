@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Micro-benchmarks for the storage layer (HDF5StorageManager, mapped Array and SparseMatrix attributes) and for
+the DAO queries behind the project pages. All inputs are synthetic, generated from a fixed seed, with sizes
+given on the command line, so that runs on different commits can be compared.
+
+Results are emitted as JSON lines (one object per benchmark and size); with --baseline, a previous results file
+is read and the ratio against it is printed for every benchmark.
+
+The SQLite database and storage folder of the test profile are used, and the database is reset at start.
+
+Usage: python -m tvb.interfaces.command.benchmarks.storage [--rows N] [--operations N] [--datatypes N]
+                                                           [--repeat N] [--output FILE] [--baseline FILE]
+"""
+
+if __name__ == "__main__":
+    from tvb.basic.profile import TvbProfile
+    TvbProfile.set_profile(TvbProfile.TEST_SQLITE_PROFILE)
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+import numpy
+from scipy import sparse
+from tvb.basic.profile import TvbProfile
+from tvb.config import SIMULATOR_MODULE, SIMULATOR_CLASS
+from tvb.core.entities import model
+from tvb.core.entities.file.hdf5_storage_manager import HDF5StorageManager
+from tvb.core.entities.storage import dao
+from tvb.core.services.project_service import ProjectService, OPERATIONS_PAGE_SIZE
+from tvb.basic.filters.chain import FilterChain
+from tvb.datatypes.connectivity import Connectivity
+from tvb.datatypes.local_connectivity import LocalConnectivity
+from tvb.interfaces.command.benchmarks.monitor import ResourceMonitor
+
+SEED = 42
+COLUMNS = 100
+APPEND_CHUNK = 1000
+STORE_CHUNK = 500
+
+
+class BenchmarkRunner(object):
+    """
+    Runs each benchmark `repeat` times and collects one result record for it.
+    """
+
+    def __init__(self, repeat, commit):
+        self.repeat = repeat
+        self.commit = commit
+        self.results = []
+
+
+    def run(self, name, size, func, setup=None):
+        """
+        :param setup: optional callable, executed (untimed) before every repetition; its result is passed to `func`
+        """
+        durations = []
+        peak_rss = 0
+        for _ in xrange(self.repeat):
+            args = setup() if setup is not None else ()
+            _, duration, rss = ResourceMonitor().measure(func, *args)
+            durations.append(duration)
+            peak_rss = max(peak_rss, rss)
+        record = {"benchmark": name, "size": size, "repeat": self.repeat, "commit": self.commit,
+                  "min_s": min(durations), "median_s": float(numpy.median(durations)), "peak_rss_bytes": peak_rss}
+        self.results.append(record)
+        print(json.dumps(record, sort_keys=True))
+        sys.stdout.flush()
+        return record
+
+
+def _current_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+##########################################################################
+########################### HDF5 storage #################################
+##########################################################################
+
+def _new_storage_manager(folder, file_name="benchmark.h5"):
+    file_path = os.path.join(folder, file_name)
+    if os.path.exists(file_path):
+        os.remove(file_path)
+    return HDF5StorageManager(folder, file_name)
+
+
+def _append_rows(storage_manager, data):
+    for start in xrange(0, len(data), APPEND_CHUNK):
+        storage_manager.append_data("data", data[start:start + APPEND_CHUNK], grow_dimension=0, close_file=False)
+    storage_manager.close_file()
+
+
+def _read_slices(storage_manager, rows):
+    step = max(rows // 20, 1)
+    for start in xrange(0, rows, step):
+        storage_manager.get_data("data", (slice(start, start + step), slice(None)), close_file=False)
+    storage_manager.close_file()
+
+
+def _write_metadata(storage_manager, keys):
+    for key in keys:
+        storage_manager.set_metadata({key: 1.5, key + "_label": "value"})
+
+
+def _write_metadata_batch(storage_manager, keys):
+    with storage_manager.metadata_batch():
+        _write_metadata(storage_manager, keys)
+
+
+def benchmark_hdf5(runner, folder, rows):
+    data = numpy.random.rand(rows, COLUMNS)
+    keys = ["key_%d" % i for i in xrange(max(rows // 1000, 10))]
+
+    runner.run("h5_append", rows, _append_rows,
+               lambda: (_new_storage_manager(folder), data))
+    runner.run("h5_slice_read", rows, _read_slices,
+               lambda: (HDF5StorageManager(folder, "benchmark.h5"), rows))
+    runner.run("h5_metadata_write", len(keys), _write_metadata,
+               lambda: (_new_storage_manager(folder, "metadata.h5"), keys))
+    runner.run("h5_metadata_write_batch", len(keys), _write_metadata_batch,
+               lambda: (_new_storage_manager(folder, "metadata.h5"), keys))
+
+
+##########################################################################
+###################### Mapped Array and SparseMatrix #####################
+##########################################################################
+
+def _write_array(folder, weights):
+    connectivity = Connectivity(storage_path=folder)
+    connectivity.weights = weights
+    connectivity.close_file()
+    return connectivity.gid
+
+
+def _read_array(folder, gid):
+    connectivity = Connectivity(storage_path=folder)
+    connectivity.gid = gid
+    return connectivity.weights
+
+
+def _write_sparse(folder, matrix):
+    local_connectivity = LocalConnectivity(storage_path=folder)
+    local_connectivity.matrix = matrix
+    local_connectivity.close_file()
+    return local_connectivity.gid
+
+
+def _read_sparse(folder, gid):
+    local_connectivity = LocalConnectivity(storage_path=folder)
+    local_connectivity.gid = gid
+    return local_connectivity.matrix
+
+
+def benchmark_mapped(runner, folder, rows):
+    nodes = int(numpy.sqrt(rows * COLUMNS))
+    weights = numpy.random.rand(nodes, nodes)
+    matrix = sparse.rand(rows, rows, density=min(1.0, 10.0 / rows), format="csc")
+    array_gid = _write_array(folder, weights)
+    sparse_gid = _write_sparse(folder, matrix)
+
+    runner.run("array_write", weights.size, _write_array, lambda: (folder, weights))
+    runner.run("array_read", weights.size, _read_array, lambda: (folder, array_gid))
+    runner.run("sparse_write", matrix.nnz, _write_sparse, lambda: (folder, matrix))
+    runner.run("sparse_read", matrix.nnz, _read_sparse, lambda: (folder, sparse_gid))
+
+
+##########################################################################
+############################# DAO queries ################################
+##########################################################################
+
+def _reset_database():
+    from tvb.core.entities.model_manager import reset_database
+    from tvb.core.services.initializer import initialize
+
+    db_file = TvbProfile.current.db.DB_URL.replace('sqlite:///', '')
+    if os.path.exists(db_file):
+        os.remove(db_file)
+    reset_database()
+    initialize(["tvb.config"], skip_import=True)
+
+
+def _store_in_chunks(entities):
+    stored = []
+    for start in xrange(0, len(entities), STORE_CHUNK):
+        stored.extend(dao.store_entities(entities[start:start + STORE_CHUNK]))
+    return stored
+
+
+def _create_project(nr_operations, nr_datatypes):
+    """
+    One project with `nr_operations` finished operations, among which `nr_datatypes` DataType rows are spread.
+    """
+    user = dao.store_entity(model.User("benchmark_user", "benchmark_pass", "benchmark@tvb.org", True, "user"))
+    project = ProjectService().store_project(user, True, None, name="StorageBenchmark", description="", users=[])
+    category = dao.store_entity(model.AlgorithmCategory("benchmark", True))
+    algorithm = dao.store_entity(model.Algorithm(SIMULATOR_MODULE, SIMULATOR_CLASS, category.id))
+
+    operations = _store_in_chunks([model.Operation(user.id, project.id, algorithm.id, "{}", status=model.STATUS_FINISHED,
+                                                   user_group="group_%d" % (i % 10))
+                                   for i in xrange(nr_operations)])
+    _store_in_chunks([model.DataType(subject="subject_%d" % (i % 7), state="RAW_DATA",
+                                     operation_id=operations[i % nr_operations].id, user_tag_1="tag_%d" % (i % 3))
+                      for i in xrange(nr_datatypes)])
+    return project
+
+
+def benchmark_dao(runner, nr_operations, nr_datatypes):
+    _reset_database()
+    project = _create_project(nr_operations, nr_datatypes)
+    omit_views = FilterChain("Omit Views", [FilterChain.algorithm_category + '.display'], [False], operations=["=="])
+
+    runner.run("dao_get_values_of_datatype", nr_datatypes, dao.get_values_of_datatype,
+               lambda: (project.id, model.DataType))
+    runner.run("dao_get_filtered_operations", nr_operations, dao.get_filtered_operations,
+               lambda: (project.id, omit_views, 0, OPERATIONS_PAGE_SIZE))
+    runner.run("dao_count_filtered_operations", nr_operations, dao.get_filtered_operations,
+               lambda: (project.id, omit_views, 0, OPERATIONS_PAGE_SIZE, True))
+    runner.run("retrieve_project_full", nr_operations, ProjectService().retrieve_project_full, lambda: (project.id,))
+
+
+def compare_with_baseline(results, baseline_path):
+    """
+    Print the median time of every benchmark relative to the one recorded for the same benchmark and size.
+    """
+    baseline = {}
+    with open(baseline_path) as baseline_file:
+        for line in baseline_file:
+            if line.strip():
+                record = json.loads(line)
+                baseline[(record["benchmark"], record["size"])] = record
+
+    print("%-32s | %10s | %10s | %10s | %7s" % ("Benchmark", "Size", "Baseline", "Current", "Ratio"))
+    for record in results:
+        previous = baseline.get((record["benchmark"], record["size"]))
+        if previous is None or not previous["median_s"]:
+            continue
+        print("%-32s | %10d | %10.4f | %10.4f | %7.2f" % (record["benchmark"], record["size"], previous["median_s"],
+                                                          record["median_s"],
+                                                          record["median_s"] / previous["median_s"]))
+
+
+def main(args):
+    numpy.random.seed(SEED)
+    runner = BenchmarkRunner(args.repeat, _current_commit())
+    folder = tempfile.mkdtemp(prefix="tvb_storage_benchmark")
+    try:
+        benchmark_hdf5(runner, folder, args.rows)
+        benchmark_mapped(runner, folder, args.rows)
+        if not args.skip_db:
+            benchmark_dao(runner, args.operations, args.datatypes)
+    finally:
+        shutil.rmtree(folder, True)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            for record in runner.results:
+                output_file.write(json.dumps(record, sort_keys=True) + "\n")
+    if args.baseline:
+        compare_with_baseline(runner.results, args.baseline)
+
+
+if __name__ == "__main__":
+    PARSER = argparse.ArgumentParser(description="Storage and DAO micro-benchmarks.")
+    PARSER.add_argument("--rows", type=int, default=100000, help="rows of the synthetic H5 data set")
+    PARSER.add_argument("--operations", type=int, default=2000, help="operations in the synthetic project")
+    PARSER.add_argument("--datatypes", type=int, default=10000, help="datatypes in the synthetic project")
+    PARSER.add_argument("--repeat", type=int, default=5, help="repetitions of every benchmark")
+    PARSER.add_argument("--skip-db", action="store_true", help="only run the storage benchmarks")
+    PARSER.add_argument("--output", help="file to write the JSON lines results into")
+    PARSER.add_argument("--baseline", help="JSON lines results of a previous run, to compare against")
+    main(PARSER.parse_args())
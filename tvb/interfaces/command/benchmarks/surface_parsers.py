@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+"""
+Compare the vectorized surface readers and writer with the former line by line implementations,
+on synthetic surfaces of growing size. Reports wall time and peak RSS for each of them.
+
+Usage: python -m tvb.interfaces.command.benchmarks.surface_parsers [VERTICES ...]
+"""
+
+if __name__ == "__main__":
+    from tvb.basic.profile import TvbProfile
+    TvbProfile.set_profile(TvbProfile.COMMAND_PROFILE)
+
+import os
+import sys
+import shutil
+import zipfile
+import tempfile
+import numpy
+from StringIO import StringIO
+from tvb.adapters.uploaders.obj.parser import ObjParser, ObjWriter
+from tvb.adapters.uploaders.obj.surface import ObjSurface
+from tvb.adapters.uploaders.zip_surface.parser import ZipSurfaceParser
+from tvb.interfaces.command.benchmarks.monitor import ResourceMonitor, format_size
+
+
+def _create_surface(nr_vertices):
+    """
+    Random geometry with the vertex / triangle ratio of a closed mesh.
+    """
+    vertices = numpy.random.rand(nr_vertices, 3) * 100
+    normals = numpy.random.rand(nr_vertices, 3)
+    triangles = numpy.random.randint(0, nr_vertices, (2 * nr_vertices, 3))
+    return vertices, normals, triangles
+
+
+def _create_zip(folder, vertices, normals, triangles):
+    file_path = os.path.join(folder, "surface_%d.zip" % len(vertices))
+    with zipfile.ZipFile(file_path, "w") as zip_file:
+        for name, data, fmt in [("vertices.txt", vertices, "%f"), ("normals.txt", normals, "%f"),
+                                ("triangles.txt", triangles, "%d")]:
+            text = StringIO()
+            numpy.savetxt(text, data, fmt=fmt)
+            zip_file.writestr(name, text.getvalue())
+    return file_path
+
+
+def _line_write(obj_path, vertices, normals, triangles):
+    """
+    The writer before vectorization: one formatted line per vector or face.
+    """
+    with open(obj_path, "w") as obj_file:
+        writer = ObjWriter(obj_file)
+        obj_file.write("# line writer\n")
+        for vector in vertices:
+            writer._write_vector("v", vector)
+        obj_file.write("\n")
+        for vector in normals:
+            writer._write_vector("vn", vector)
+        obj_file.write("\n")
+        for face in triangles:
+            writer._write_face(face, True)
+
+
+def _bulk_write(obj_path, vertices, normals, triangles):
+    with open(obj_path, "w") as obj_file:
+        ObjWriter(obj_file).write(vertices, triangles, normals, comment="bulk writer")
+
+
+def _line_read(obj_path):
+    with open(obj_path) as obj_file:
+        ObjParser().read(obj_file)
+
+
+def _bulk_read(obj_path):
+    with open(obj_path) as obj_file:
+        ObjSurface(obj_file)
+
+
+def _loadtxt_zip_read(zip_path):
+    """
+    The zip surface read before vectorization.
+    """
+    with zipfile.ZipFile(zip_path) as zip_file:
+        for name in zip_file.namelist():
+            numpy.loadtxt(zip_file.open(name), dtype=numpy.int32 if "triangles" in name else numpy.float32)
+
+
+def main(sizes):
+    folder = tempfile.mkdtemp(prefix="tvb_surface_benchmark")
+    try:
+        print("%-10s | %-16s | %10s | %14s" % ("Vertices", "Operation", "Time (s)", "Peak RSS delta"))
+        for nr_vertices in sizes:
+            vertices, normals, triangles = _create_surface(nr_vertices)
+            obj_path = os.path.join(folder, "surface_%d.obj" % nr_vertices)
+            zip_path = _create_zip(folder, vertices, normals, triangles)
+
+            benchmarks = [("obj write line", _line_write, (obj_path, vertices, normals, triangles)),
+                          ("obj write bulk", _bulk_write, (obj_path, vertices, normals, triangles)),
+                          ("obj read line", _line_read, (obj_path,)),
+                          ("obj read bulk", _bulk_read, (obj_path,)),
+                          ("zip read loadtxt", _loadtxt_zip_read, (zip_path,)),
+                          ("zip read bulk", ZipSurfaceParser, (zip_path,))]
+            for name, function, args in benchmarks:
+                _, duration, peak_rss = ResourceMonitor().measure(function, *args)
+                print("%-10d | %-16s | %10.2f | %14s" % (nr_vertices, name, duration, format_size(peak_rss)))
+    finally:
+        shutil.rmtree(folder, True)
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [10000, 100000, 300000])
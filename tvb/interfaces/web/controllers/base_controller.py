@@ -129,7 +129,6 @@ class BaseController(object):
         ### Update project stored in selection, with latest Project entity from DB.
         members = self.user_service.get_users_for_project("", project.id)[1]
         project.members = members
-        common.remove_from_session(common.KEY_CACHED_SIMULATOR_TREE)
         common.add2session(common.KEY_PROJECT, project)
 
         if previous_project is None or previous_project.id != project.id:
@@ -87,16 +87,13 @@ class BurstController(BurstBaseController):
     @context_selected
     def cached_simulator_input_tree(self):
         """
-        Cache Simulator's input tree, for performance issues.
-        Anyway, without restart, the introspected tree will not be different on multiple executions.
-        :returns: Simulator's Input Tree (copy from cache or just loaded)
+        Simulator's input tree, with the datatype options of the current project.
+        The introspected part of the tree is cached once per process by the FlowService, and shared between calls;
+        the nodes returned here are copies, so they can be changed freely.
+        :returns: Simulator's Input Tree
         """
-        cached_simulator_tree = common.get_from_session(common.KEY_CACHED_SIMULATOR_TREE)
-        if cached_simulator_tree is None:
-            cached_simulator_tree = self.flow_service.prepare_adapter(common.get_current_project().id,
-                                                                      self.cached_simulator_algorithm)
-            common.add2session(common.KEY_CACHED_SIMULATOR_TREE, cached_simulator_tree)
-        return copy.deepcopy(cached_simulator_tree)
+        return self.flow_service.prepare_adapter(common.get_current_project().id, self.cached_simulator_algorithm,
+                                                 cache_static_tree=True)
 
 
     @expose_page
@@ -504,7 +501,6 @@ class BurstController(BurstBaseController):
         Called when click on "New Burst" entry happens from UI.
         This will generate an empty new Burst Configuration.
         """
-        common.remove_from_session(common.KEY_CACHED_SIMULATOR_TREE)
         new_burst = self.burst_service.new_burst_configuration(common.get_current_project().id)
         common.add2session(common.KEY_BURST_CONFIG, new_burst)
 
@@ -515,7 +511,6 @@ class BurstController(BurstBaseController):
         """
         When currently selected entry is a valid Burst, create a clone of that Burst.
         """
-        common.remove_from_session(common.KEY_CACHED_SIMULATOR_TREE)
         base_burst = self.burst_service.load_burst(burst_id)[0]
         if (base_burst is None) or (base_burst.id is None):
             return self.reset_burst()
@@ -36,8 +36,12 @@ Decorators for Cherrypy exposed methods are defined here.
 import numpy
 import os
 import json
+import inspect
+import collections
 import cherrypy
+import cherrypy.lib.httputil
 import cProfile
+import six
 from datetime import datetime
 from functools import wraps
 from genshi.template import TemplateLoader
@@ -45,6 +49,9 @@ from tvb.basic.profile import TvbProfile
 from tvb.basic.logger.builder import get_logger
 from tvb.core.utils import TVBJSONEncoder
 from tvb.interfaces.web.controllers import common
+from tvb.interfaces.web import response_cache
+from tvb.interfaces.web.response_cache import CACHED_HEADERS, compute_request_key, compute_etag
+from tvb.interfaces.web.response_cache import etag_matches, format_http_date
 
 # some of these decorators could be cherrypy tools
 
@@ -100,7 +107,7 @@ def ndarray_to_http_binary(func):
 
         # map some unsupported dtypes to supported ones
         if x.dtype == numpy.int64:
-            x = numpy.asarray(x, dtype=numpy.int32)
+            x = numpy.asarray(x, dtype=_fitting_dtype_name(x, 'int32'))
 
         if x.dtype not in [numpy.float32, numpy.float64, numpy.int32]:
             raise ValueError('Datatype not supported by binary transport %s' % x.dtype)
@@ -116,6 +123,203 @@ def ndarray_to_http_binary(func):
     return deco
 
 
+BINARY_FRAME_CONTENT_TYPE = "application/x.tvb-ndarrays"
+BINARY_FRAME_ALIGNMENT = 8
+
+# dtypes which have a JS TypedArray counterpart (float16 is decoded client-side from uint16)
+_FRAME_DTYPES = ['float64', 'float32', 'float16', 'int32', 'uint32', 'int16', 'uint16', 'int8', 'uint8']
+# map some unsupported dtypes to supported ones (or to float64, when the values do not fit)
+_FRAME_DTYPES_MAPPING = {'int64': 'int32', 'uint64': 'uint32', 'bool': 'uint8'}
+_FRAME_QUANTIZATIONS = ['float32', 'float16']
+
+
+def _frame_padding(size):
+    return (-size) % BINARY_FRAME_ALIGNMENT
+
+
+def _fitting_dtype_name(x, dtype_name):
+    """
+    :returns: dtype_name when all the values of the integer array x fit in it, float64 otherwise
+    """
+    if x.size and x.dtype.kind in 'iu' and numpy.dtype(dtype_name).kind in 'iu':
+        limits = numpy.iinfo(dtype_name)
+        if x.min() < limits.min or x.max() > limits.max:
+            return 'float64'
+    return dtype_name
+
+
+def pack_ndarrays(arrays, quantize=None):
+    """
+    Serialize one or more numpy arrays into a single binary frame:
+        - 4 bytes: little endian uint32, length of the JSON header
+        - JSON header: {"kind": "array"|"list"|"dict", "arrays": [{name, dtype, shape, offset, nbytes}]}
+        - the raw little endian array buffers, at offsets relative to the frame start
+
+    Header and buffers are padded to BINARY_FRAME_ALIGNMENT, so that the client can build TypedArray views
+    directly over the received buffer, and a single array can be retrieved with an HTTP byte range.
+
+    :param arrays: a numpy array, a list of arrays or an ordered dictionary {name: array}
+    :param quantize: when 'float32' or 'float16', floating point arrays are down-cast before transport
+    """
+    if isinstance(arrays, numpy.ndarray):
+        kind, named_arrays = "array", [("0", arrays)]
+    elif isinstance(arrays, dict):
+        kind, named_arrays = "dict", list(arrays.items())
+    elif isinstance(arrays, (list, tuple)):
+        kind, named_arrays = "list", [(str(i), x) for i, x in enumerate(arrays)]
+    else:
+        raise ValueError('Datatype attribute must be an ndarray for binary transport not %s' % type(arrays))
+
+    if quantize and quantize not in _FRAME_QUANTIZATIONS:
+        raise ValueError('Unsupported quantization for binary transport %s' % quantize)
+
+    header = []
+    buffers = []
+    for name, x in named_arrays:
+        x = numpy.asarray(x)
+        dtype_name = _fitting_dtype_name(x, _FRAME_DTYPES_MAPPING.get(x.dtype.name, x.dtype.name))
+        if quantize and x.dtype.kind == 'f':
+            dtype_name = quantize
+        if dtype_name not in _FRAME_DTYPES:
+            raise ValueError('Datatype not supported by binary transport %s' % x.dtype)
+        x = numpy.ascontiguousarray(x, dtype=numpy.dtype(dtype_name).newbyteorder('<'))
+        header.append({'name': name, 'dtype': dtype_name, 'shape': list(x.shape), 'nbytes': x.nbytes})
+        buffers.append(x.tostring())
+
+    # offsets depend on the header length, which depends on the offsets' digits, thus iterate until stable
+    header_bytes = b''
+    while True:
+        offset = 4 + len(header_bytes) + _frame_padding(4 + len(header_bytes))
+        for entry in header:
+            entry['offset'] = offset
+            offset += entry['nbytes'] + _frame_padding(entry['nbytes'])
+        new_header_bytes = json.dumps({'kind': kind, 'arrays': header}).encode('utf-8')
+        if len(new_header_bytes) == len(header_bytes):
+            break
+        header_bytes = new_header_bytes
+
+    header_bytes += b' ' * _frame_padding(4 + len(header_bytes))
+    chunks = [numpy.array([len(header_bytes)], dtype='<u4').tostring(), header_bytes]
+    for buff in buffers:
+        chunks.append(buff)
+        chunks.append(b'\0' * _frame_padding(len(buff)))
+    return b''.join(chunks)
+
+
+def unpack_ndarrays(payload):
+    """
+    Inverse of `pack_ndarrays`. Float16 arrays are returned as they were transported.
+    """
+    header_length = int(numpy.frombuffer(payload[:4], dtype='<u4')[0])
+    header = json.loads(payload[4:4 + header_length].decode('utf-8'))
+    arrays = []
+    for entry in header['arrays']:
+        x = numpy.frombuffer(payload, dtype=numpy.dtype(entry['dtype']).newbyteorder('<'),
+                             count=int(numpy.prod(entry['shape'])), offset=entry['offset'])
+        arrays.append((entry['name'], x.reshape(entry['shape'])))
+
+    if header['kind'] == 'array':
+        return arrays[0][1]
+    if header['kind'] == 'list':
+        return [x for _, x in arrays]
+    return collections.OrderedDict(arrays)
+
+
+def ndarrays_to_http_binary(func):
+    """
+    Decorator to wrap calls that return one or more numpy arrays.
+    It serializes them with `pack_ndarrays` as a binary http response.
+    The optional `quantize` keyword is consumed here, and not passed to the decorated function.
+    """
+    @wraps(func)
+    def deco(*a, **b):
+        quantize = b.pop('quantize', None)
+        payload = pack_ndarrays(func(*a, **b), quantize)
+        cherrypy.response.headers["Content-Type"] = BINARY_FRAME_CONTENT_TYPE
+        return payload
+
+    return deco
+
+
+def serve_byte_ranges(func):
+    """
+    Decorator honoring a single-range HTTP Range header on the bytes returned by func.
+    Multiple ranges are answered with the full body.
+    """
+    @wraps(func)
+    def deco(*a, **b):
+        payload = func(*a, **b)
+        cherrypy.response.headers["Accept-Ranges"] = "bytes"
+        if cherrypy.response.status == 304:
+            return payload
+
+        ranges = cherrypy.lib.httputil.get_ranges(cherrypy.request.headers.get('Range'), len(payload))
+        if ranges == []:
+            cherrypy.response.headers["Content-Range"] = "bytes */%s" % len(payload)
+            raise cherrypy.HTTPError(416, "Requested range not satisfiable")
+
+        if ranges is not None and len(ranges) == 1:
+            start, stop = ranges[0]
+            cherrypy.response.status = 206
+            cherrypy.response.headers["Content-Range"] = "bytes %s-%s/%s" % (start, stop - 1, len(payload))
+            payload = payload[start:stop]
+
+        cherrypy.response.headers["Content-Length"] = len(payload)
+        return payload
+
+    return deco
+
+
+def cache_datatype_response(func, undecorated=None):
+    """
+    Decorator for controller methods with signature (self, entity_gid, dataset_name, *args, **kwargs),
+    which return already serialized payloads, computed from (immutable) DataTypes only.
+    It sets ETag, Last-Modified and Cache-Control headers, answers conditional GETs with 304,
+    and keeps the payloads in the on-disk response cache, when that is enabled.
+    The DataTypes in a `datatype_kwargs` argument, passed by name or by position, are part of the ETag.
+
+    :param undecorated: the original method, when `func` is already decorated, to find `datatype_kwargs` position
+    """
+    arg_names = inspect.getargspec(undecorated or func).args[3:]
+    kwargs_position = arg_names.index('datatype_kwargs') if 'datatype_kwargs' in arg_names else None
+
+    @wraps(func)
+    def deco(self, entity_gid, dataset_name, *a, **b):
+        if kwargs_position is not None and len(a) > kwargs_position:
+            datatype_kwargs = a[kwargs_position]
+        else:
+            datatype_kwargs = b.get('datatype_kwargs', 'null')
+        request_key = compute_request_key(entity_gid, func.__name__ + '/' + dataset_name, a, b)
+        etag, last_modified = compute_etag(entity_gid, request_key, datatype_kwargs)
+        if etag is None:
+            return func(self, entity_gid, dataset_name, *a, **b)
+
+        cherrypy.response.headers["ETag"] = etag
+        cherrypy.response.headers["Last-Modified"] = format_http_date(last_modified)
+        cherrypy.response.headers["Cache-Control"] = "private, no-cache"
+
+        if etag_matches(etag, cherrypy.request.headers.get('If-None-Match')):
+            cherrypy.response.status = 304
+            return b''
+
+        cache = response_cache.RESPONSE_CACHE
+        cached = cache.get(etag)
+        if cached is not None:
+            headers, payload = cached
+            cherrypy.response.headers.update(headers)
+            return payload
+
+        payload = func(self, entity_gid, dataset_name, *a, **b)
+        if isinstance(payload, six.text_type):
+            payload = payload.encode('utf-8')
+        headers = dict((key, cherrypy.response.headers[key])
+                       for key in CACHED_HEADERS if key in cherrypy.response.headers)
+        cache.put(etag, headers, payload)
+        return payload
+
+    return deco
+
+
 def handle_error(redirect):
     """
     If `redirect` is true(default) all errors will generate redirects.
@@ -286,6 +490,45 @@ def expose_numpy_array(func):
     return func
 
 
+def expose_numpy_arrays(func):
+    """
+    Equivalent to
+    @cherrypy.expose
+    @handle_error(redirect=False)
+    @check_user
+    @serve_byte_ranges
+    @cache_datatype_response
+    @ndarrays_to_http_binary
+    """
+    undecorated = func
+    func = ndarrays_to_http_binary(func)
+    func = cache_datatype_response(func, undecorated)
+    func = serve_byte_ranges(func)
+    func = check_user(func)
+    func = handle_error(redirect=False)(func)
+    func = cherrypy.expose(func)
+    return func
+
+
+def expose_datatype_json(func):
+    """
+    Same as expose_json, for methods returning immutable DataType attributes, which can be HTTP cached.
+    Equivalent to
+    @cherrypy.expose
+    @handle_error(redirect=False)
+    @check_user
+    @cache_datatype_response
+    @jsonify
+    """
+    undecorated = func
+    func = jsonify(func)
+    func = cache_datatype_response(func, undecorated)
+    func = check_user(func)
+    func = handle_error(redirect=False)(func)
+    func = cherrypy.expose(func)
+    return func
+
+
 def profile_func(func):
     def wrapper(*args, **kwargs):
         log = get_logger(_LOGGER_NAME)
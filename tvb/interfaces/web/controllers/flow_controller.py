@@ -37,6 +37,7 @@ given action are described here.
 
 import copy
 import json
+from collections import OrderedDict
 import cherrypy
 import formencode
 import numpy
@@ -56,6 +57,7 @@ from tvb.core.services.burst_service import BurstService
 from tvb.interfaces.web.controllers import common
 from tvb.interfaces.web.controllers.base_controller import BaseController
 from tvb.interfaces.web.controllers.decorators import expose_page, settings, context_selected, expose_numpy_array
+from tvb.interfaces.web.controllers.decorators import expose_numpy_arrays, expose_datatype_json
 from tvb.interfaces.web.controllers.decorators import expose_fragment, handle_error, check_user, expose_json
 from tvb.interfaces.web.entities.context_selected_adapter import SelectedAdapterContext
 
@@ -564,7 +566,7 @@ class FlowController(BaseController):
         return result
 
 
-    @expose_json
+    @expose_datatype_json
     def read_datatype_attribute(self, entity_gid, dataset_name, flatten=False, datatype_kwargs='null', **kwargs):
         """
         Retrieve from a given DataType a property or a method result.
@@ -595,6 +597,34 @@ class FlowController(BaseController):
         return self._read_datatype_attribute(entity_gid, dataset_name, datatype_kwargs, **kwargs)
 
 
+    @expose_numpy_arrays
+    def read_binary_datatype_attributes(self, entity_gid, dataset_names, flatten=False, datatype_kwargs='null',
+                                        **kwargs):
+        """
+        Binary counterpart of `read_datatype_attribute`, with the same URL layout.
+
+        :returns: a binary frame (see `decorators.pack_ndarrays`) with one or more arrays.
+            An optional `quantize` parameter ('float32' or 'float16') down-casts floating point arrays.
+        :param dataset_names: name of the dataType property / method. When multiple comma separated names
+            are given, the frame will hold a dictionary of arrays, keyed by these names.
+        :param flatten: the arrays should be flatten before return
+        """
+        flatten = flatten is True or flatten == "True"
+        result = OrderedDict()
+        for dataset_name in dataset_names.split(','):
+            value = self._read_datatype_attribute(entity_gid, dataset_name, datatype_kwargs, **kwargs)
+            if isinstance(value, (list, tuple)):
+                value = [numpy.asarray(x) for x in value]
+                result[dataset_name] = [x.flatten() for x in value] if flatten else value
+            else:
+                value = numpy.asarray(value)
+                result[dataset_name] = value.flatten() if flatten else value
+
+        if len(result) == 1:
+            return list(result.values())[0]
+        return result
+
+
     @expose_fragment("flow/genericAdapterFormFields")
     def get_simple_adapter_interface(self, algorithm_id, parent_div='', is_uploader=False):
         """
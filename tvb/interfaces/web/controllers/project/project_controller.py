@@ -192,7 +192,6 @@ class ProjectController(BaseController):
         try:
             if cherrypy.request.method == 'POST' and save:
                 common.remove_from_session(common.KEY_PROJECT)
-                common.remove_from_session(common.KEY_CACHED_SIMULATOR_TREE)
                 self._persist_project(data, project_id, is_create, current_user)
                 raise cherrypy.HTTPRedirect('/project/viewall')
         except formencode.Invalid as excep:
@@ -168,7 +168,6 @@ class UserController(BaseController):
             self.logger.debug("User " + user.username + " is just logging out!")
         common.remove_from_session(common.KEY_PROJECT)
         common.remove_from_session(common.KEY_BURST_CONFIG)
-        common.remove_from_session(common.KEY_CACHED_SIMULATOR_TREE)
         common.set_info_message("Thank you for using The Virtual Brain!")
 
         common.expire_session()
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and 
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+HTTP caching for payloads computed from DataTypes.
+
+DataType arrays are immutable once the operation which produced them finished, thus a response computed from
+them can be identified by a strong ETag built from the DataType GID, the H5 file modification time and the
+request parameters. Such responses can be revalidated by the browser (304 Not Modified) and, optionally,
+kept in a size-bounded on-disk LRU cache.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from email.utils import formatdate
+from tvb.basic.logger.builder import get_logger
+from tvb.core.entities.load import load_entity_by_gid
+from tvb.core.traits.types_mapped import MappedType
+
+
+LOGGER = get_logger(__name__)
+
+CACHED_HEADERS = ["Content-Type", "X-Array-Shape", "X-Array-Type"]
+
+MAX_KNOWN_STORAGE_FILES = 10000
+
+# DataType GID -> H5 file path, from the least to the most recently used, to avoid a DB query per request
+_STORAGE_FILES = OrderedDict()
+_STORAGE_FILES_LOCK = threading.Lock()
+
+
+def compute_request_key(entity_gid, attribute_name, args, kwargs):
+    """
+    :returns: a string identifying a request (endpoint, gid, attribute and parameters)
+    """
+    return json.dumps([entity_gid, attribute_name, [str(arg) for arg in args],
+                       sorted((str(key), str(value)) for key, value in kwargs.items())])
+
+
+def compute_etag(entity_gid, request_key, datatype_kwargs='null'):
+    """
+    Build a strong ETag from the GID and storage file modification time of all DataTypes involved.
+
+    :param datatype_kwargs: JSON dictionary {'name': 'gid'} of other DataTypes used in computing the response
+    :returns: (etag, last modified timestamp) or (None, None) when the DataType is not cacheable
+    """
+    gids = [entity_gid]
+    if datatype_kwargs and datatype_kwargs != 'null':
+        gids.extend(sorted(json.loads(datatype_kwargs).values()))
+
+    signature = hashlib.sha1(request_key.encode('utf-8'))
+    last_modified = 0
+    for gid in gids:
+        storage_file = get_storage_file(gid)
+        if storage_file is None:
+            return None, None
+        mtime = os.path.getmtime(storage_file) if os.path.exists(storage_file) else 0
+        last_modified = max(last_modified, mtime)
+        signature.update(("%s:%r" % (gid, mtime)).encode('utf-8'))
+
+    return '"%s"' % signature.hexdigest(), last_modified
+
+
+def get_storage_file(gid):
+    """
+    :returns: the H5 file path of a DataType, or None when it is not a MappedType.
+        Paths are remembered, so only the first request for a DataType queries the DB. A remembered path whose
+        file is missing (e.g. the DataType was removed, or its project renamed) is looked up again.
+    """
+    with _STORAGE_FILES_LOCK:
+        storage_file = _STORAGE_FILES.get(gid)
+    if storage_file is not None and os.path.exists(storage_file):
+        return storage_file
+
+    entity = load_entity_by_gid(gid)
+    if entity is None or not isinstance(entity, MappedType):
+        return None
+    storage_file = entity.get_storage_file_path()
+    with _STORAGE_FILES_LOCK:
+        _STORAGE_FILES.pop(gid, None)
+        _STORAGE_FILES[gid] = storage_file
+        while len(_STORAGE_FILES) > MAX_KNOWN_STORAGE_FILES:
+            _STORAGE_FILES.popitem(last=False)
+    return storage_file
+
+
+def format_http_date(timestamp):
+    return formatdate(timestamp, usegmt=True)
+
+
+def etag_matches(etag, if_none_match):
+    """
+    Evaluate an If-None-Match request header against the current ETag.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return etag in [tag.strip() for tag in if_none_match.split(',')]
+
+
+
+class DatatypeResponseCache(object):
+    """
+    On-disk cache of serialized responses, keyed by ETag, with size-bounded LRU eviction.
+    A cache with max_size 0 (the default) keeps nothing.
+    """
+
+    _FILE_EXTENSION = ".response"
+
+
+    def __init__(self, cache_folder=None, max_size=0):
+        self.cache_folder = cache_folder
+        self.max_size = max_size if cache_folder else 0
+        self._lock = threading.Lock()
+        # file name -> size, ordered from the least to the most recently used
+        self._entries = OrderedDict()
+        self._current_size = 0
+
+        if self.max_size > 0:
+            if not os.path.exists(cache_folder):
+                os.makedirs(cache_folder)
+            existing = []
+            for file_name in os.listdir(cache_folder):
+                if file_name.endswith(self._FILE_EXTENSION):
+                    file_path = os.path.join(cache_folder, file_name)
+                    existing.append((os.path.getmtime(file_path), file_name, os.path.getsize(file_path)))
+            for _, file_name, size in sorted(existing):
+                self._entries[file_name] = size
+                self._current_size += size
+            self._evict()
+
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+
+    @property
+    def current_size(self):
+        return self._current_size
+
+
+    def _file_name(self, etag):
+        return etag.strip('"') + self._FILE_EXTENSION
+
+
+    def get(self, etag):
+        """
+        :returns: (headers dictionary, payload) or None when the response is not in cache
+        """
+        if not self.enabled:
+            return None
+        file_name = self._file_name(etag)
+        with self._lock:
+            if file_name not in self._entries:
+                return None
+            self._entries[file_name] = self._entries.pop(file_name)
+        file_path = os.path.join(self.cache_folder, file_name)
+        try:
+            with open(file_path, 'rb') as cache_file:
+                headers = json.loads(cache_file.readline().decode('utf-8'))
+                payload = cache_file.read()
+            os.utime(file_path, None)
+            return headers, payload
+        except (IOError, OSError, ValueError):
+            LOGGER.warning("Could not read cached response %s" % file_path)
+            self._forget(file_name)
+            return None
+
+
+    def put(self, etag, headers, payload):
+        """
+        Store a response, then evict the least recently used ones, until the cache fits max_size.
+        """
+        if not self.enabled or len(payload) > self.max_size:
+            return
+        file_name = self._file_name(etag)
+        file_path = os.path.join(self.cache_folder, file_name)
+        if os.path.exists(file_path):
+            # same ETag means same content, thus only refresh its LRU position
+            with self._lock:
+                if file_name in self._entries:
+                    self._entries[file_name] = self._entries.pop(file_name)
+                    return
+        temp_path = file_path + ".%d.tmp" % threading.current_thread().ident
+        try:
+            with open(temp_path, 'wb') as cache_file:
+                cache_file.write(json.dumps(headers).encode('utf-8') + b'\n')
+                cache_file.write(payload)
+            os.rename(temp_path, file_path)
+        except (IOError, OSError):
+            LOGGER.exception("Could not store cached response %s" % file_path)
+            return
+
+        with self._lock:
+            self._current_size -= self._entries.pop(file_name, 0)
+            self._entries[file_name] = os.path.getsize(file_path)
+            self._current_size += self._entries[file_name]
+        self._evict()
+
+
+    def _forget(self, file_name):
+        with self._lock:
+            self._current_size -= self._entries.pop(file_name, 0)
+
+
+    def _evict(self):
+        while True:
+            with self._lock:
+                if self._current_size <= self.max_size or not self._entries:
+                    return
+                file_name, size = self._entries.popitem(last=False)
+                self._current_size -= size
+            try:
+                os.remove(os.path.join(self.cache_folder, file_name))
+            except OSError:
+                LOGGER.warning("Could not evict cached response %s" % file_name)
+
+
+
+RESPONSE_CACHE = DatatypeResponseCache()
+
+
+def configure_response_cache(cache_folder, max_size):
+    """
+    Enable (max_size > 0) or disable the on-disk cache of DataType responses.
+    """
+    global RESPONSE_CACHE
+    RESPONSE_CACHE = DatatypeResponseCache(cache_folder, max_size)
+    return RESPONSE_CACHE
@@ -40,6 +40,7 @@ STARTUP_TIC = time.time()
 
 import os
 import sys
+import posixpath
 import cherrypy
 import webbrowser
 from cherrypy import Tool
@@ -54,6 +55,7 @@ from tvb.core.decorators import user_environment_execution
 from tvb.core.services.initializer import initialize, reset
 from tvb.core.services.exceptions import InvalidSettingsException
 from tvb.interfaces.web.request_handler import RequestHandler
+from tvb.interfaces.web.response_cache import configure_response_cache
 from tvb.interfaces.web.controllers.base_controller import BaseController
 from tvb.interfaces.web.controllers.users_controller import UserController
 from tvb.interfaces.web.controllers.help.help_controller import HelpController
@@ -76,6 +78,8 @@ from tvb.interfaces.web.controllers.burst.noise_configuration_controller import
 LOGGER = get_logger('tvb.interfaces.web.run')
 CONFIG_EXISTS = not TvbProfile.is_first_run()
 PARAM_RESET_DB = "reset"
+# Upper bound (in bytes) for the on-disk cache of DataType responses. Set it to 0 to disable this cache.
+RESPONSE_CACHE_MAX_SIZE = 512 * 1024 * 1024
 LOGGER.info("TVB application will be running using encoding: " + sys.getdefaultencoding())
 
 
@@ -147,6 +151,12 @@ def start_tvb(arguments, browser=True):
     #### Mark that the interface is Web
     ABCDisplayer.VISUALIZERS_ROOT = TvbProfile.current.web.VISUALIZERS_ROOT
     ABCDisplayer.VISUALIZERS_URL_PREFIX = TvbProfile.current.web.VISUALIZERS_URL_PREFIX
+    # The binary transport is served next to the JSON one, by the same controller
+    ABCDisplayer.VISUALIZERS_BINARY_URL_PREFIX = "%s/%s/" % (
+        posixpath.dirname(ABCDisplayer.VISUALIZERS_URL_PREFIX.rstrip('/')),
+        FlowController.read_binary_datatype_attributes.__name__)
+    configure_response_cache(os.path.join(TvbProfile.current.TVB_TEMP_FOLDER, "response_cache"),
+                             RESPONSE_CACHE_MAX_SIZE)
 
     init_cherrypy(arguments)
 
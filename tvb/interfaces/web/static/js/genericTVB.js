@@ -1014,9 +1014,13 @@ function doAjaxCall(params) {
 /**
  * Initiate a HTTP GET request for a given file name and return its content, parsed as a JSON object.
  * When staticFiles = True, return without evaluating JSON from response.
+ * Binary frame URLs are decoded as such (see HLPR_readBinaryFrameFromFile), whatever staticFiles says.
  * @return {null} when nothing comes from the server
  */
 function HLPR_readJSONfromFile(fileName, staticFiles) {
+    if (HLPR_isBinaryFrameURL(fileName)) {
+        return HLPR_readBinaryFrameFromFile(fileName);
+    }
     let fileData = null;
 
     doAjaxCall({
@@ -1138,6 +1142,175 @@ function HLPR_fetchNdArray(binary_url, onload, kwargs) {
     oReq.send(null);
 }
 
+const BINARY_FRAME_URL_MARKER = "/read_binary_datatype_attributes/";
+const BINARY_FRAME_TYPED_ARRAYS = {
+    "float64": Float64Array, "float32": Float32Array, "float16": Uint16Array,
+    "int32": Int32Array, "uint32": Uint32Array, "int16": Int16Array, "uint16": Uint16Array,
+    "int8": Int8Array, "uint8": Uint8Array
+};
+
+function HLPR_isBinaryFrameURL(url) {
+    return typeof url === "string" && url.indexOf(BINARY_FRAME_URL_MARKER) >= 0;
+}
+
+/**
+ * Decode IEEE half precision values (transported as uint16) into a Float32Array
+ */
+function _float16ToFloat32(halfs) {
+    const result = new Float32Array(halfs.length);
+    for (let i = 0; i < halfs.length; i++) {
+        const h = halfs[i];
+        const sign = (h & 0x8000) ? -1 : 1;
+        const exponent = (h & 0x7C00) >> 10;
+        const fraction = h & 0x03FF;
+        if (exponent === 0) {
+            result[i] = sign * Math.pow(2, -14) * (fraction / 1024);
+        } else if (exponent === 0x1F) {
+            result[i] = fraction ? NaN : sign * Infinity;
+        } else {
+            result[i] = sign * Math.pow(2, exponent - 15) * (1 + fraction / 1024);
+        }
+    }
+    return result;
+}
+
+/**
+ * Parse a binary frame, as produced by the server side `pack_ndarrays`.
+ * @returns {{kind: string, arrays: Array}} with arrays being a list of named NdArr instances
+ */
+function HLPR_parseBinaryFrame(arrayBuffer) {
+    const headerLength = new DataView(arrayBuffer).getUint32(0, true);
+    const headerBytes = new Uint8Array(arrayBuffer, 4, headerLength);
+    let headerText = "";
+    for (let i = 0; i < headerBytes.length; i++) {
+        headerText += String.fromCharCode(headerBytes[i]);
+    }
+    const header = JSON.parse(headerText);
+    const arrays = [];
+
+    for (let entry of header.arrays) {
+        const TypedArray = BINARY_FRAME_TYPED_ARRAYS[entry.dtype];
+        if (!TypedArray) {
+            throw "datatype not supported " + entry.dtype;
+        }
+        let buffer = new TypedArray(arrayBuffer, entry.offset, entry.nbytes / TypedArray.BYTES_PER_ELEMENT);
+        if (entry.dtype === "float16") {
+            buffer = _float16ToFloat32(buffer);
+        }
+        const ndarr = new NdArr(buffer, entry.shape);
+        ndarr.name = entry.name;
+        arrays.push(ndarr);
+    }
+    return {kind: header.kind, arrays: arrays};
+}
+
+/**
+ * From an NdArr to views on its buffer, without copying any value: a 1D array is returned as the typed array
+ * itself, higher dimensions as plain lists (one level per dimension) of typed row views.
+ * Indexing works as on the nested lists of the JSON transport; use HLPR_toPlainLists where Array methods are needed.
+ */
+function _ndArrToTypedRows(ndarr) {
+    const shape = ndarr.shape;
+    if (shape.length === 0) {
+        return ndarr.buffer[0];
+    }
+
+    function build(dim, offset, stride) {
+        const size = shape[dim];
+        if (dim === shape.length - 1) {
+            return ndarr.buffer.subarray(offset, offset + size);
+        }
+        const innerStride = stride / size;
+        const result = new Array(size);
+        for (let i = 0; i < size; i++) {
+            result[i] = build(dim + 1, offset + i * innerStride, innerStride);
+        }
+        return result;
+    }
+
+    return build(0, 0, ndarr.buffer.length);
+}
+
+/**
+ * From a parsed binary frame to typed rows (see _ndArrToTypedRows), a list of them, or a dictionary of them.
+ */
+function HLPR_binaryFrameToArrays(frame) {
+    if (frame.kind === "array") {
+        return _ndArrToTypedRows(frame.arrays[0]);
+    }
+    if (frame.kind === "list") {
+        return frame.arrays.map(_ndArrToTypedRows);
+    }
+    const result = {};
+    for (let ndarr of frame.arrays) {
+        result[ndarr.name] = _ndArrToTypedRows(ndarr);
+    }
+    return result;
+}
+
+/**
+ * Copy typed arrays (at any nesting level) into plain JS lists, e.g. before JSON serialization or concat.
+ * Plain lists of numbers are returned as they are.
+ */
+function HLPR_toPlainLists(data) {
+    if (ArrayBuffer.isView(data)) {
+        return Array.prototype.slice.call(data);
+    }
+    if (Array.isArray(data) && data.length && (Array.isArray(data[0]) || ArrayBuffer.isView(data[0]))) {
+        return data.map(HLPR_toPlainLists);
+    }
+    return data;
+}
+
+/**
+ * Synchronous retrieval of a binary frame. Synchronous requests can not declare an arraybuffer response,
+ * so the bytes are read as a user-defined charset string.
+ * @return {null} when nothing comes from the server
+ */
+function HLPR_readBinaryFrameFromFile(url) {
+    const oReq = new XMLHttpRequest();
+    oReq.open("GET", url, false);
+    oReq.overrideMimeType("text/plain; charset=x-user-defined");
+    oReq.send(null);
+
+    if (oReq.status !== 200 || !oReq.responseText) {
+        displayMessage("Could not retrieve data from the server!", "warningMessage");
+        return null;
+    }
+    const startTime = performance.now();
+    const text = oReq.responseText;
+    const bytes = new Uint8Array(text.length);
+    for (let i = 0; i < text.length; i++) {
+        bytes[i] = text.charCodeAt(i) & 0xFF;
+    }
+    const result = HLPR_binaryFrameToArrays(HLPR_parseBinaryFrame(bytes.buffer));
+    console.debug("Binary frame " + url + ": " + bytes.length + " bytes decoded in " +
+                  (performance.now() - startTime).toFixed(1) + " ms");
+    return result;
+}
+
+/**
+ * Asynchronous retrieval of a binary frame.
+ * @param url server URL, as generated with `ABCDisplayer.paths2url(..., binary=True)`
+ * @param onload callback receiving the decoded typed arrays (see HLPR_binaryFrameToArrays) and the kwargs
+ * @param kwargs passed through to onload
+ */
+function HLPR_fetchBinaryFrame(url, onload, kwargs) {
+    const oReq = new XMLHttpRequest();
+    oReq.open("GET", url, true);
+    oReq.responseType = "arraybuffer";
+
+    oReq.onload = function () {
+        if (oReq.status !== 200) {
+            displayMessage("Could not retrieve data from the server!", "warningMessage");
+            return;
+        }
+        onload(HLPR_binaryFrameToArrays(HLPR_parseBinaryFrame(oReq.response)), kwargs);
+    };
+
+    oReq.send(null);
+}
+
 // -------------End Binary transport parsing ----------------------------------
 
 function checkArg(arg, def) {
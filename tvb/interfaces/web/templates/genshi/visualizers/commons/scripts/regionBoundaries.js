@@ -32,31 +32,48 @@ function RB_RegionBoundariesController(boundariesURL) {
     this.boundaryNormalsBuffers = [];
     this.boundaryEdgesBuffers = [];
 
-    this._init = function (boundariesURL)  {
-
-        if (boundariesURL) {
-            var SELF = this;
-            doAjaxCall({
-                url: boundariesURL,
-                async: true,
-                success: function (data) {
-                    data = $.parseJSON(data);
-                    var boundaryVertices = data[0];
-                    var boundaryEdges = data[1];
-                    var boundaryNormals = data[2];
-                    for (var i = 0; i < boundaryVertices.length; i++) {
-                        SELF.boundaryVertexBuffers.push(HLPR_createWebGlBuffer(gl, boundaryVertices[i], false, false));
-                        SELF.boundaryNormalsBuffers.push(HLPR_createWebGlBuffer(gl, boundaryNormals[i], false, false));
-                        SELF.boundaryEdgesBuffers.push(HLPR_createWebGlBuffer(gl, boundaryEdges[i], true, false));
+    this.loadedArrays = 0;
+    this.expectedArrays = 0;
+
+    /**
+     * @param boundariesURLs JSON with the lists of URLs for "vertices", "lines" and "normals", one URL per surface slice
+     */
+    this._init = function (boundariesURLs)  {
+
+        if (boundariesURLs) {
+            const SELF = this;
+            const urls = $.parseJSON(boundariesURLs);
+            const targets = {vertices: this.boundaryVertexBuffers, lines: this.boundaryEdgesBuffers,
+                             normals: this.boundaryNormalsBuffers};
+            this.expectedArrays = 3 * urls.vertices.length;
+
+            const onload = function (data, kwargs) {
+                targets[kwargs.name][kwargs.slice] = HLPR_createWebGlBuffer(gl, data, kwargs.name === "lines", false);
+                SELF.loadedArrays += 1;
+            };
+
+            for (let name in targets) {
+                for (let i = 0; i < urls[name].length; i++) {
+                    const kwargs = {name: name, slice: i};
+                    if (HLPR_isBinaryFrameURL(urls[name][i])) {
+                        HLPR_fetchBinaryFrame(urls[name][i], onload, kwargs);
+                    } else {
+                        doAjaxCall({
+                            url: urls[name][i],
+                            async: true,
+                            success: function (data) {
+                                onload($.parseJSON(data), kwargs);
+                            }
+                        });
                     }
                 }
-            });
+            }
         }
     };
 
     this.drawRegionBoundaries = function (drawingMode, brainBuffers, isPicking) {
 
-        if (!(this.boundariesVisible && this.boundaryVertexBuffers && this.boundaryNormalsBuffers && this.boundaryEdgesBuffers)) {
+        if (!(this.boundariesVisible && this.expectedArrays && this.loadedArrays === this.expectedArrays)) {
             return;
         }
 
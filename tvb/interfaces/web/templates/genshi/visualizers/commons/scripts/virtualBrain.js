@@ -24,6 +24,7 @@
  */
 
 /* globals gl, SHADING_Context, GL_shaderProgram, displayMessage, HLPR_readJSONfromFile, readDataPageURL,
+ HLPR_isBinaryFrameURL, HLPR_fetchBinaryFrame, HLPR_readBinaryFrameFromFile, HLPR_toPlainLists,
  GL_handleKeyDown, GL_handleKeyUp, GL_handleMouseMove, GL_handleMouseWeel,
  initGL, updateGLCanvasSize, LEG_updateLegendVerticesBuffers,
  basicInitShaders, basicInitSurfaceLighting, GL_initColorPickFrameBuffer,
@@ -500,7 +501,7 @@ function _initMeasurePoints(noOfMeasurePoints, urlMeasurePoints, urlMeasurePoint
 function _initTimeData(urlTimeList) {
     const timeUrls = $.parseJSON(urlTimeList);
     for (let i = 0; i < timeUrls.length; i++) {
-        timeData = timeData.concat(HLPR_readJSONfromFile(timeUrls[i]));
+        timeData = timeData.concat(HLPR_toPlainLists(HLPR_readJSONfromFile(timeUrls[i])));
     }
     MAX_TIME = timeData.length - 1;
 }
@@ -1297,6 +1298,21 @@ function readFileData(fileUrl, async, callIdentifier) {
     // async calls are started before the first one finishes.
     const self = this;
     self.callIdentifier = callIdentifier;
+
+    if (HLPR_isBinaryFrameURL(fileUrl)) {
+        const onload = function (data) {
+            if ((self.callIdentifier === currentAsyncCall) || !async) {
+                nextActivitiesFileData = data;
+            }
+        };
+        if (async) {
+            HLPR_fetchBinaryFrame(fileUrl, onload);
+        } else {
+            onload(HLPR_readBinaryFrameFromFile(fileUrl));
+        }
+        return;
+    }
+
     doAjaxCall({
         url: fileUrl,
         async: async,
@@ -42,6 +42,19 @@ function readDataChannelURL(baseDatatypeMethodURL, fromIdx, toIdx, stateVariable
     return baseURL.replace('read_data_page', 'read_channels_page') + ';channels_list=' + channels;
 }
 
+/**
+ * URL of the (min, max) envelope of [fromIdx, toIdx), reduced to at most pixelWidth points per channel.
+ */
+function readMinMaxPageURL(baseDatatypeMethodURL, fromIdx, toIdx, pixelWidth, stateVariable, mode) {
+    if (stateVariable === null || stateVariable === undefined) {
+        stateVariable = 0;
+    }
+    if (mode === null || mode === undefined) {
+        mode = 0;
+    }
+    return baseDatatypeMethodURL + '/read_min_max_page/False?from_idx=' + fromIdx + ";to_idx=" + toIdx + ";pixel_width=" + pixelWidth + ";specific_slices=[null," + stateVariable + ",null," + mode + "]";
+}
+
 // ------ Datatype methods mappings end here
 
 
@@ -36,6 +36,45 @@ var exportScale;    // used for resizing the plot on exporting from canvas
 
 var C2D_hemispheresJSON;
 
+/**
+ * Build the nodes of a chart, in the JSON format expected by the RGraph, from the compact layout computed on the server:
+ * arrays with a value for each node, and the edges as a COO list of node indices and weights.
+ *
+ * @param layout the compact layout of a chart; an already expanded chart (a list of nodes) is returned as it is
+ */
+function C2D_expandLayout(layout) {
+    if ($.isArray(layout)) {
+        return layout;
+    }
+    var nodes = [];
+    for (var i = 0; i < layout.labels.length; i++) {
+        nodes.push({
+            id: layout.labels[i], name: layout.labels[i],
+            data: {
+                '$dim': 6, '$type': 'circle', '$color': layout.color,
+                customShapeDimension: layout.customShapeDimension[i], customShapeColor: layout.customShapeColor[i],
+                angle: layout.angle[i], radius: layout.radius[i]
+            },
+            adjacencies: []
+        });
+    }
+    var nodeFrom = new Int32Array(layout.nodeFrom);
+    var nodeTo = new Int32Array(layout.nodeTo);
+    var weight = new Float64Array(layout.weight);
+    for (var k = 0; k < nodeFrom.length; k++) {
+        nodes[nodeFrom[k]].adjacencies.push({nodeTo: layout.labels[nodeTo[k]], data: {weight: weight[k]}});
+    }
+    return nodes;
+}
+
+/**
+ * @returns the nodes of the chart for the given view ('left', 'both' or 'right'), expanded at the first use
+ */
+function C2D_getHemisphereJSON(view) {
+    C2D_hemispheresJSON[view] = C2D_expandLayout(C2D_hemispheresJSON[view]);
+    return C2D_hemispheresJSON[view];
+}
+
 /**
  * Used for drawing a chart from the given json
  *
@@ -153,7 +192,7 @@ function C2D_displaySelectedPoints() {
 		selectedPoints.push(GVAR_pointsLabels[GVAR_interestAreaNodeIndexes[i]]);
 	}
 	
-    drawConnectivity(C2D_hemispheresJSON[C2D_selectedView], C2D_shouldRefreshNodes);
+    drawConnectivity(C2D_getHemisphereJSON(C2D_selectedView), C2D_shouldRefreshNodes);
 }
 
 /**
@@ -214,7 +253,7 @@ function prepareConnectivity2D(left_json, full_json, right_json) {
 function startPreviewConnectivity() {
     C2D_selectedView = 'both';
 
-    var currrentJSON = C2D_hemispheresJSON[C2D_selectedView];
+    var currrentJSON = C2D_getHemisphereJSON(C2D_selectedView);
     NO_POSITIONS = currrentJSON.length;
     GVAR_interestAreaNodeIndexes = [];
     GVAR_pointsLabels = [];
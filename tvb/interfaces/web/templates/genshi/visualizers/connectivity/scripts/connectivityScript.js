@@ -17,7 +17,7 @@
  *
  **/
 
-/* globals gl, GL_shaderProgram, SHADING_Context */
+/* globals gl, GL_shaderProgram, SHADING_Context, HLPR_toPlainLists */
 
 /**
  * WebGL methods "inheriting" from webGL_xx.js in static/js.
@@ -143,7 +143,7 @@ function initBuffers() {
     let normals = [];
 
     for (let i = 0; i < NO_POSITIONS; i++) {
-        points = points.concat(GVAR_positionsPoints[i]);
+        points = points.concat(HLPR_toPlainLists(GVAR_positionsPoints[i]));
         normals = normals.concat(fakeNormal_1);
         lineColors = lineColors.concat(COLORS.WHITE);
     }
@@ -18,7 +18,7 @@
  **/
 
 /* globals  GVAR_connectivityMatrix, GVAR_interestAreaVariables, GVAR_selectedAreaType,
-            GVAR_pointsLabels, GVAR_interestAreaNodeIndexes, HLPR_removeByElement,
+            GVAR_pointsLabels, GVAR_interestAreaNodeIndexes, HLPR_removeByElement, HLPR_toPlainLists,
             GFUNC_updateLeftSideVisualization, GFUNC_isNodeAddedToInterestArea,
             GFUN_updateSelectionComponent, GFUNC_toggleNodeInInterestArea,
             displayMessage,
@@ -502,8 +502,8 @@ function MATRIX_colorTable() {
 function saveSubConnectivity(submitUrl, originalConnectivityId,  isBranch) {
     var data = {
         original_connectivity: originalConnectivityId,
-        new_weights: $.toJSON(GVAR_interestAreaVariables[1].values),
-        new_tracts: $.toJSON(GVAR_interestAreaVariables[2].values),
+        new_weights: $.toJSON(HLPR_toPlainLists(GVAR_interestAreaVariables[1].values)),
+        new_tracts: $.toJSON(HLPR_toPlainLists(GVAR_interestAreaVariables[2].values)),
         interest_area_indexes: $.toJSON(GVAR_interestAreaNodeIndexes),
         User_Tag_1_Perpetuated: $('#newConnectivityNameTag').val()
     };
@@ -17,7 +17,8 @@
  *
  **/
 
-/* globals doAjaxCall, readDataPageURL, HLPR_readJSONfromFile */
+/* globals doAjaxCall, readDataPageURL, readMinMaxPageURL, HLPR_readJSONfromFile, HLPR_isBinaryFrameURL,
+ HLPR_fetchBinaryFrame, HLPR_toPlainLists */
 
 // //it contains all the points that have to be/have been displayed (it contains all the points from the read file);
 // //it is an array of arrays (each array contains the points for a certain line chart)
@@ -175,6 +176,8 @@ var longestChannelIndex = 0;
 var AG_regionSelector = null;
 // State mode selector. Used as a global only in dual view
 var AG_modeSelector = null;
+// (min, max) envelope of the whole first time series, pre-rendered for the overview strip; null until loaded
+var AG_overviewImage = null;
 
 function resizeToFillParent() {
     const canvas = $('#EEGcanvasDiv');
@@ -185,7 +188,8 @@ function resizeToFillParent() {
         // For height we have the toolbar there. Using 100% does not seem to work properly with FLOT.
         container = canvas.parent();
         width = container.width() - 40;
-        height = container.height() - 80;
+        height = container.height() - 80 - ($('#eegOverviewCanvas').outerHeight(true) || 0);
+        $('#eegOverviewCanvas').width(width);
     } else {
         container = $('body');
         width = container.width() - 40;
@@ -519,6 +523,7 @@ function submitSelectedChannels(isEndOfData) {
     AG_createYAxisDictionary(AG_noOfLines);
     redrawPlot([]);
     resetToDefaultView();
+    AG_loadOverview();
     if (AG_isStopped) {
         AG_isStopped = false;
         drawGraph(false, noOfShiftedPoints);
@@ -690,6 +695,7 @@ function drawGraph(executeShift, shiftNo) {
         plot.setupGrid();
         plot.draw();
         setLabelColors();
+        AG_drawOverview();
     }
     if (!isDoubleView) {
         t = setTimeout("drawGraph(true, noOfShiftedPoints)", getTimeoutBasedOnSpeed());
@@ -856,7 +862,7 @@ function addFromPreviousPage(indexInPage, currentPage) {
         }
         AG_displayedPoints.push(oneLine);
     }
-    AG_displayedTimes = previousTimeData.slice(fromIdx).concat(AG_time.slice(0, toIdx));
+    AG_displayedTimes = HLPR_toPlainLists(previousTimeData.slice(fromIdx)).concat(HLPR_toPlainLists(AG_time.slice(0, toIdx)));
     previousData = null;
 }
 
@@ -886,7 +892,7 @@ function addFromNextPage(indexInPage, currentPage) {
         }
         AG_displayedPoints.push(oneLine);
     }
-    AG_displayedTimes = AG_time.slice(fromIdx).concat(followingTimeData.slice(0, toIdx));
+    AG_displayedTimes = HLPR_toPlainLists(AG_time.slice(fromIdx)).concat(HLPR_toPlainLists(followingTimeData.slice(0, toIdx)));
     // Since next page is already loaded, that becomes the current page
     AG_allPoints = followingData;
     AG_time = followingTimeData;
@@ -1043,21 +1049,128 @@ function AG_readFileDataAsynchronous(nrOfPages, noOfChannelsPerSet, currentFileI
 
         AG_readFileDataAsynchronous(nrOfPages, noOfChannelsPerSet, currentFileIndex, maxChannelLength, dataSetIndex + 1);
     } else {
-        doAjaxCall({
-            url: readDataPageURL(baseDataURLS[dataSetIndex], currentFileIndex * dataPageSize, (currentFileIndex + 1) * dataPageSize, tsStates[dataSetIndex], tsModes[dataSetIndex]),
-            success: function (data) {
-                if (AG_isLoadStarted) {
-                    data = $.parseJSON(data);
-                    const result = parseData(data, dataSetIndex);
-                    nextData.push(result);
+        const pageUrl = readDataPageURL(baseDataURLS[dataSetIndex], currentFileIndex * dataPageSize, (currentFileIndex + 1) * dataPageSize, tsStates[dataSetIndex], tsModes[dataSetIndex]);
+        const onPageLoaded = function (data) {
+            if (AG_isLoadStarted) {
+                const result = parseData(data, dataSetIndex);
+                nextData.push(result);
+
+                AG_readFileDataAsynchronous(nrOfPages, noOfChannelsPerSet, currentFileIndex, maxChannelLength, dataSetIndex + 1);
+            }
+        };
 
-                    AG_readFileDataAsynchronous(nrOfPages, noOfChannelsPerSet, currentFileIndex, maxChannelLength, dataSetIndex + 1);
+        if (HLPR_isBinaryFrameURL(pageUrl)) {
+            HLPR_fetchBinaryFrame(pageUrl, onPageLoaded);
+        } else {
+            doAjaxCall({
+                url: pageUrl,
+                success: function (data) {
+                    onPageLoaded($.parseJSON(data));
                 }
+            });
+        }
+    }
+}
+
+/**
+ * Read the (min, max) envelope of the whole first time series, at the resolution of the overview strip.
+ * The server answers from the min/max pyramid level matching the strip width, so the transfer does not
+ * grow with the simulation length.
+ */
+function AG_loadOverview() {
+    const canvas = document.getElementById('eegOverviewCanvas');
+    if (canvas === null) {
+        return;
+    }
+    canvas.width = Math.max($(canvas).width(), 1);
+    canvas.height = $(canvas).height();
+    AG_overviewImage = null;
+
+    const pageUrl = readMinMaxPageURL(baseDataURLS[0], 0, totalTimeLength, canvas.width, tsStates[0], tsModes[0]);
+    const onPageLoaded = function (page) {
+        AG_overviewImage = _AG_renderOverview(page, canvas.width, canvas.height);
+        AG_drawOverview();
+    };
+    if (HLPR_isBinaryFrameURL(pageUrl)) {
+        HLPR_fetchBinaryFrame(pageUrl, onPageLoaded);
+    } else {
+        doAjaxCall({
+            url: pageUrl,
+            success: function (data) {
+                onPageLoaded($.parseJSON(data));
             }
         });
     }
 }
 
+/**
+ * Draw the envelope of the displayed channels of the first time series on an off-screen canvas.
+ * @param page (minimum, maximum) pair, each with shape [rows][1][channels][1]
+ * @private
+ */
+function _AG_renderOverview(page, width, height) {
+    let channels = displayedChannels.filter(function (idx) {
+        return idx < noOfChannelsPerSet[0];
+    });
+    if (channels.length === 0) {
+        channels = Array.from({length: noOfChannelsPerSet[0]}, function (v, idx) {
+            return idx;
+        });
+    }
+    const rows = page[0].length;
+    const low = new Float64Array(rows).fill(Infinity);
+    const high = new Float64Array(rows).fill(-Infinity);
+    for (let r = 0; r < rows; r++) {
+        for (let c = 0; c < channels.length; c++) {
+            // JSON transport encodes NaN as a string, the unary plus turns it back into a numeric NaN
+            const minimum = +page[0][r][0][channels[c]][0];
+            const maximum = +page[1][r][0][channels[c]][0];
+            if (!isNaN(minimum) && minimum < low[r]) {
+                low[r] = minimum;
+            }
+            if (!isNaN(maximum) && maximum > high[r]) {
+                high[r] = maximum;
+            }
+        }
+    }
+    const finiteLow = low.filter(isFinite), finiteHigh = high.filter(isFinite);
+    const bottom = finiteLow.length ? Math.min.apply(Math, finiteLow) : 0;
+    const top = finiteHigh.length ? Math.max.apply(Math, finiteHigh) : 1;
+    const yScale = (height - 1) / ((top - bottom) || 1);
+
+    const image = document.createElement('canvas');
+    image.width = width;
+    image.height = height;
+    const ctx = image.getContext('2d');
+    ctx.fillStyle = 'rgb(90, 90, 90)';
+    for (let r = 0; r < rows; r++) {
+        if (isFinite(low[r]) && isFinite(high[r])) {
+            const y = height - 1 - (high[r] - bottom) * yScale;
+            ctx.fillRect(r * width / rows, y, Math.max(width / rows, 1), Math.max((high[r] - low[r]) * yScale, 1));
+        }
+    }
+    return image;
+}
+
+/**
+ * Paint the overview envelope and mark the time window currently shown in the main chart.
+ */
+function AG_drawOverview() {
+    const canvas = document.getElementById('eegOverviewCanvas');
+    if (canvas === null || AG_overviewImage === null) {
+        return;
+    }
+    const ctx = canvas.getContext('2d');
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    ctx.drawImage(AG_overviewImage, 0, 0);
+
+    const windowEnd = totalPassedData + AG_currentIndex;
+    const windowStart = Math.max(windowEnd - AG_numberOfVisiblePoints, 0);
+    ctx.fillStyle = 'rgba(255, 0, 0, 0.25)';
+    ctx.fillRect(windowStart * canvas.width / totalTimeLength, 0,
+                 Math.max((windowEnd - windowStart) * canvas.width / totalTimeLength, 1), canvas.height);
+}
+
 /*
  * Data is received from the HLPR_parseJSON as a 500/74 array. We need to transform it
  * into an 74/500 one and in the transformation also replace all NaN values.
@@ -1071,7 +1184,8 @@ function parseData(dataArray, dataSetIndex) {
     for (let j = 0; j < dataArray.length; j++) {
         for (let k = 0; k < noOfChannelsPerSet[dataSetIndex]; k++) {
             let arrElem = dataArray[j][k];
-            if (arrElem === 'NaN') {
+            // JSON transport encodes NaN as a string, binary transport keeps it numeric
+            if (arrElem === 'NaN' || Number.isNaN(arrElem)) {
                 nanValueFound = true;
                 arrElem = 0;
             }
@@ -1094,17 +1208,22 @@ function readTimeData(fileIndex, asyncRead) {
         }
         isNextTimeDataLoaded = true;
     } else {
-        if (asyncRead) {
+        const timeUrl = timeSetUrls[longestChannelIndex][fileIndex];
+        const onTimeLoaded = function (data) {
+            nextTimeData = data;
+            isNextTimeDataLoaded = true;
+        };
+        if (asyncRead && HLPR_isBinaryFrameURL(timeUrl)) {
+            HLPR_fetchBinaryFrame(timeUrl, onTimeLoaded);
+        } else if (asyncRead) {
             doAjaxCall({
-                url: timeSetUrls[longestChannelIndex][fileIndex],
+                url: timeUrl,
                 success: function (data) {
-                    nextTimeData = $.parseJSON(data);
-                    isNextTimeDataLoaded = true;
+                    onTimeLoaded($.parseJSON(data));
                 }
             });
         } else {
-            nextTimeData = HLPR_readJSONfromFile(timeSetUrls[longestChannelIndex][fileIndex]);
-            isNextTimeDataLoaded = true;
+            onTimeLoaded(HLPR_readJSONfromFile(timeUrl));
         }
     }
 }
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+"""
+Common setup for the tests of the analyzers computing their results in blocks (of nodes or of windows).
+"""
+
+import numpy
+import tvb.adapters.analyzers.node_blocks as node_blocks
+from tvb.tests.framework.core.base_testcase import TransactionalTestCase
+from tvb.tests.framework.datatypes.datatypes_factory import DatatypesFactory
+from tvb.core.entities.file.files_helper import FilesHelper
+
+
+
+class BlockedAnalyzerTestCase(TransactionalTestCase):
+    """
+    Store a region time series, and launch the analyzers on it with a lowered block memory, so that
+    the tests can compare results computed over several blocks with the library algorithm evaluated at once.
+    """
+
+    def transactional_setup_method(self):
+        self.datatypes_factory = DatatypesFactory()
+        self.data = self.create_data()
+        _, self.connectivity = self.datatypes_factory.create_connectivity(nodes=self.data.shape[2])
+        self.time_series = self.datatypes_factory.create_timeseries(self.connectivity, data=self.data,
+                                                                    sample_period=1.0)
+        self.block_memory = node_blocks.BLOCK_MEMORY
+
+
+    def transactional_teardown_method(self):
+        node_blocks.BLOCK_MEMORY = self.block_memory
+        FilesHelper().remove_project_structure(self.datatypes_factory.project.name)
+
+
+    @staticmethod
+    def create_data():
+        """
+        :returns: the (time, state variable, node, mode) data of the time series, to be overwritten for other inputs
+        """
+        return numpy.random.RandomState(42).randn(500, 2, 10, 1)
+
+
+    def launch_in_blocks(self, adapter, block_memory, **kwargs):
+        """
+        Configure and launch an analyzer on the stored time series, with at most block_memory bytes per block.
+        The block memory is restored at teardown, so the adapter can still be inspected afterwards.
+        """
+        node_blocks.BLOCK_MEMORY = block_memory
+        adapter.storage_path = self.time_series.storage_path
+        adapter.configure(self.time_series, **kwargs)
+        return adapter.launch(self.time_series, **kwargs)
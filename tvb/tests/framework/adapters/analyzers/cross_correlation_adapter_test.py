@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import numpy
+import pytest
+from tvb.tests.framework.adapters.analyzers.blocked_analyzer_testcase import BlockedAnalyzerTestCase
+from tvb.adapters.analyzers.cross_correlation_adapter import CrossCorrelateAdapter
+from tvb.adapters.analyzers.cross_correlation_adapter import PearsonCorrelationCoefficientAdapter
+from tvb.core.adapters.exceptions import LaunchException
+from tvb.analyzers.cross_correlation import CrossCorrelate
+from tvb.analyzers.correlation_coefficient import CorrelationCoefficient
+from tvb.datatypes.time_series import TimeSeries
+
+
+
+class TestCrossCorrelationAdapters(BlockedAnalyzerTestCase):
+    """
+    The blocked adapters give the results of the algorithms evaluated at once, on small random inputs.
+    """
+
+    def test_cross_correlation_blocks(self):
+        adapter = CrossCorrelateAdapter()
+        result = self.launch_in_blocks(adapter, 1)
+        assert adapter._block_nodes() == 1
+
+        algorithm = CrossCorrelate(time_series=TimeSeries(data=self.data, sample_period=1.0, use_storage=False))
+        expected = algorithm.evaluate()
+        assert numpy.allclose(result.read_data_slice((slice(None),) * 5), expected.array_data)
+        assert numpy.allclose(result.time, expected.time)
+
+
+    def test_pearson_blocks(self):
+        result = self.launch_in_blocks(PearsonCorrelationCoefficientAdapter(), 1, t_start=2.0, t_end=8.0)
+
+        expected = CorrelationCoefficient(time_series=self.time_series, t_start=2.0, t_end=8.0).evaluate()
+        assert numpy.allclose(result.array_data, expected.array_data)
+
+
+    def test_pearson_interval_past_end(self):
+        with pytest.raises(LaunchException):
+            self.launch_in_blocks(PearsonCorrelationCoefficientAdapter(), 1, t_start=600.0, t_end=700.0)
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import json
+import numpy
+import pytest
+import tvb.adapters.analyzers.fcd_adapter as fcd_adapter
+from tvb.tests.framework.adapters.analyzers.blocked_analyzer_testcase import BlockedAnalyzerTestCase
+from tvb.tests.framework.core.factory import TestFactory
+from tvb.adapters.analyzers.fcd_adapter import FunctionalConnectivityDynamicsAdapter
+from tvb.adapters.visualizers.histogram import HistogramViewer
+from tvb.adapters.visualizers.stacked_measure import MeasureRow, ROW_TITLES
+from tvb.analyzers.fcd_matrix import FcdCalculator
+from tvb.core.adapters.exceptions import LaunchException
+from tvb.core.entities import model
+from tvb.core.entities.storage import dao
+from tvb.core.services.operation_service import OperationService
+from tvb.datatypes.graph import ConnectivityMeasure
+
+
+
+class TestFcdAdapter(BlockedAnalyzerTestCase):
+    """
+    Test the FCD adapter, computing the windowed FC in chunks.
+    """
+
+    @staticmethod
+    def create_data():
+        return numpy.cumsum(numpy.random.RandomState(42).randn(2000, 1, 20, 1), axis=0)
+
+
+    def test_chunked_fcd(self):
+        """
+        With FC blocks of a few windows only, the FCD is the one computed by the FCD algorithm at once.
+        """
+        adapter = FunctionalConnectivityDynamicsAdapter()
+        result = self.launch_in_blocks(adapter, 2 * 8 * 190 * 5, sw=200.0, sp=20.0)
+        assert adapter._block_rows() == 5
+        assert adapter.get_required_memory_size() > 0
+
+        expected_fcd = FcdCalculator(time_series=self.time_series, sw=200.0, sp=20.0).evaluate()[0]
+        assert result[0].array_data.shape == (90, 90, 1, 1)
+        assert numpy.allclose(result[0].array_data, expected_fcd)
+
+
+    def test_eigenvector_measures(self):
+        """
+        All the eigenvectors of a run are stored in one stacked ConnectivityMeasure, which the measure viewers
+        open one row at a time.
+        """
+        algorithm = dao.get_algorithm_by_module(FunctionalConnectivityDynamicsAdapter.__module__,
+                                                FunctionalConnectivityDynamicsAdapter.__name__)
+        operation = TestFactory.create_operation(algorithm=algorithm, test_user=self.datatypes_factory.user,
+                                                 test_project=self.datatypes_factory.project,
+                                                 operation_status=model.STATUS_STARTED)
+        OperationService().initiate_prelaunch(operation, FunctionalConnectivityDynamicsAdapter(), {},
+                                              time_series=self.time_series.gid, sw=200.0, sp=20.0)
+
+        measures = dao.get_generic_entity(ConnectivityMeasure, operation.id, 'fk_from_operation')
+        assert len(measures) == 1
+        measure = measures[0]
+        nr_rows, nr_regions = measure.get_data_shape('array_data')
+        assert nr_regions == 20
+        assert nr_rows > 0 and nr_rows % fcd_adapter.NUM_EIGENVECTORS == 0
+        titles = measure.get_data(ROW_TITLES)
+        assert len(titles) == nr_rows
+        assert len(measure.get_data('eigenvalues')) == nr_rows
+        assert measure.get_data('eigenvector_indices').shape == (nr_rows, 4)
+
+        viewer = HistogramViewer()
+        assert viewer.get_input_tree()[0]['conditions'].get_python_filter_equivalent(measure)
+        row = MeasureRow(measure, 1)
+        assert row.title.startswith("Epoch # ")
+        assert row.title == str(titles[1])
+        assert numpy.array_equal(row.array_data, measure.array_data[1])
+        assert "get_data_row" in row.data_url()
+        params = viewer.prepare_parameters(row)
+        assert len(json.loads(params['data'])) == 20
+        with pytest.raises(LaunchException):
+            MeasureRow(measure, nr_rows)
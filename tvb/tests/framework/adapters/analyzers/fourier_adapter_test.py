@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+
+import json
+import numpy
+import tvb.analyzers.fft as fft
+from tvb.tests.framework.core.base_testcase import TransactionalTestCase
+from tvb.config import SIMULATOR_MODULE, SIMULATOR_CLASS
+from tvb.core.entities import model
+from tvb.core.entities.storage import dao
+from tvb.core.entities.file.files_helper import FilesHelper
+from tvb.adapters.analyzers.fourier_adapter import FourierAdapter
+from tvb.datatypes.time_series import TimeSeries
+from tvb.core.services.flow_service import FlowService
+from tvb.tests.framework.core.factory import TestFactory
+
+
+
+class TestFourierAdapter(TransactionalTestCase):
+    """
+    Test the Fourier adapter, streaming the time series one segment at a time.
+    """
+
+    def transactional_setup_method(self):
+        self.test_user = TestFactory.create_user()
+        self.test_project = TestFactory.create_project(self.test_user)
+
+
+    def transactional_teardown_method(self):
+        FilesHelper().remove_project_structure(self.test_project.name)
+
+
+    def _storage_path(self):
+        algo = FlowService().get_algorithm_by_module_and_class(SIMULATOR_MODULE, SIMULATOR_CLASS)
+        operation = model.Operation(self.test_user.id, self.test_project.id, algo.id, json.dumps(''),
+                                    status=model.STATUS_STARTED)
+        operation = dao.store_entity(operation)
+        return FilesHelper().get_project_folder(self.test_project, str(operation.id))
+
+
+    def test_streamed_segments(self):
+        """
+        Spectra written segment by segment are the ones of the FFT algorithm, run on the full time series.
+        """
+        time = numpy.arange(4000) * 0.5
+        frequencies = numpy.array([8.0, 20.0, 40.0, 80.0])
+        data = numpy.sin(2 * numpy.pi * numpy.outer(time / 1000.0, frequencies)) + 0.1 * numpy.cos(time)[:, None]
+        data = data.reshape((4000, 1, 4, 1))
+
+        time_series = TimeSeries(storage_path=self._storage_path(), sample_period=0.5)
+        time_series.write_data_slice(data)
+        time_series.close_file()
+
+        adapter = FourierAdapter()
+        adapter.storage_path = self._storage_path()
+        adapter.configure(time_series, segment_length=250.0)
+        spectra = adapter.launch(time_series, segment_length=250.0)
+
+        algorithm = fft.FFT(segment_length=250.0, detrend=True)
+        algorithm.window_function = None
+        algorithm.time_series = TimeSeries(data=data, sample_period=0.5, use_storage=False)
+        expected = algorithm.evaluate()
+        expected.compute_average_power()
+
+        assert spectra.read_data_shape() == expected.array_data.shape
+        assert numpy.allclose(spectra.get_data('power'), numpy.abs(expected.array_data) ** 2)
+        average_power = spectra.get_data('average_power')
+        assert numpy.allclose(average_power, expected.average_power)
+        # peaks are at the sinusoid frequencies, on a 4 Hz resolution
+        assert numpy.array_equal(average_power[:, 0, :, 0].argmax(axis=0) + 1, frequencies / 4)
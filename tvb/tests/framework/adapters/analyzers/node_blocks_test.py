@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import numpy
+import tvb.adapters.analyzers.node_blocks as node_blocks
+from tvb.tests.framework.adapters.analyzers.blocked_analyzer_testcase import BlockedAnalyzerTestCase
+from tvb.adapters.analyzers.fmri_balloon_adapter import BalloonModelAdapter
+from tvb.adapters.analyzers.wavelet_adapter import ContinuousWaveletTransformAdapter
+from tvb.analyzers.fmri_balloon import BalloonModel
+from tvb.datatypes.time_series import TimeSeries
+from tvb.core.entities.file.hdf5_storage_manager import HDF5StorageManager
+
+
+
+class TestNodeBlocks(BlockedAnalyzerTestCase):
+    """
+    Test the analyzers which evaluate their algorithm on blocks of nodes, against one node at a time.
+    """
+
+    def _node_time_series(self, node):
+        return TimeSeries(use_storage=False, sample_period=self.time_series.sample_period,
+                          sample_rate=self.time_series.sample_rate, time=self.time_series.read_time_page(0, 500),
+                          data=self.time_series.read_data_slice((slice(None), slice(None),
+                                                                 slice(node, node + 1), slice(None))))
+
+
+    def test_block_nodes(self):
+        """
+        Blocks span whole chunks of the time series data, as many as their memory allows, at least one.
+        """
+        chunk_nodes = HDF5StorageManager(self.time_series.storage_path,
+                                         self.time_series.get_storage_file_name()).get_data_chunks('data')[2]
+        node_blocks.BLOCK_MEMORY = 3 * 8000
+        block = node_blocks.block_nodes(self.time_series, 8000)
+        assert block == 10 or (block % chunk_nodes == 0 and block <= max(3, chunk_nodes))
+        assert node_blocks.block_nodes(self.time_series, 10 ** 9) == min(10, chunk_nodes)
+        node_blocks.BLOCK_MEMORY = 10 ** 9
+        assert node_blocks.block_nodes(self.time_series, 8000) == 10
+
+
+    def test_balloon_blocks(self):
+        """
+        The BOLD signal, computed in blocks of nodes, is the one computed one node at a time.
+        """
+        bold = self.launch_in_blocks(BalloonModelAdapter(), 1).get_data('data')
+
+        assert bold.shape == (500, 1, 10, 1)
+        for node in range(10):
+            algorithm = BalloonModel(dt=self.time_series.sample_period / 1000., time_series=self._node_time_series(node))
+            assert numpy.allclose(bold[:, :, node:node + 1], algorithm.evaluate().data)
+
+
+    def test_wavelet_blocks(self):
+        """
+        The wavelet coefficients, computed in blocks of nodes, are the ones computed one node at a time.
+        """
+        adapter = ContinuousWaveletTransformAdapter()
+        coefficients = self.launch_in_blocks(adapter, 1, frequencies_parameters={'lo': 0.01, 'hi': 0.04,
+                                                                                 'step': 0.01}).get_data('array_data')
+
+        algorithm = adapter.algorithm
+        for node in range(10):
+            algorithm.time_series = self._node_time_series(node)
+            expected = algorithm.evaluate().array_data
+            assert numpy.allclose(coefficients[:, :, 2 * node:2 * node + 2], expected)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+"""
+Checks the vectorized connectome construction of the Allen creator on a synthetic annotation volume.
+"""
+
+import numpy
+from tvb.adapters.creators.allen_creator import AnnotationIndex, rotate_reference, construct_centres
+from tvb.adapters.creators.allen_creator import construct_structural_conn, construct_tract_lengths
+from tvb.adapters.creators.allen_creator import mouse_brain_visualizer
+
+
+
+class _StructureTree(object):
+    """
+    The subset of the AllenSDK StructureTree used by the creator, over a {structure id: parent id} dictionary.
+    """
+
+    def __init__(self, parents):
+        self.parents = parents
+
+    def _path(self, structure_id):
+        path = [structure_id]
+        while path[0] in self.parents:
+            path.insert(0, self.parents[path[0]])
+        return path
+
+    def get_structures_by_id(self, structure_ids):
+        return [{'id': sid, 'structure_id_path': self._path(sid), 'name': 'S%d' % sid} for sid in structure_ids]
+
+    def children(self, structure_ids):
+        return [[{'id': child} for child, parent in sorted(self.parents.items()) if parent == sid]
+                for sid in structure_ids]
+
+    def descendant_ids(self, structure_ids):
+        return [[child for child in sorted(set(self.parents) | set(self.parents.values()))
+                 if sid in self._path(child)] for sid in structure_ids]
+
+
+
+class TestAllenCreator(object):
+
+    # 997 is the root, 10 and 20 are regions of the parcellation, 11 and 21 their children,
+    # 30 and its child 31 are outside the parcellation
+    TREE = _StructureTree({10: 997, 11: 10, 20: 997, 21: 20, 30: 997, 31: 30})
+    ORDER = {1: [10, 'ten'], 2: [20, 'twenty']}
+    KEY_ORD = [1, 2]
+
+
+    def setup_method(self):
+        self.vol = numpy.random.RandomState(42).choice([0, 10, 11, 20, 21, 31], (6, 5, 8)).astype(numpy.uint32)
+        self.annotation = AnnotationIndex(self.vol, self.TREE)
+
+
+    def test_rotate_reference(self):
+        rotated = rotate_reference(self.vol)
+        assert rotated.shape == (8, 6, 5)
+        for x, y, z in [(0, 0, 0), (1, 2, 3), (5, 4, 7)]:
+            assert rotated[z, x, 4 - y] == self.vol[x, y, z]
+
+
+    def test_structure_statistics(self):
+        for structure_id in [10, 20, 30]:
+            mask = numpy.in1d(self.vol, self.TREE.descendant_ids([structure_id])[0]).reshape(self.vol.shape)
+            assert self.annotation.voxel_count(structure_id) == numpy.count_nonzero(mask)
+
+            mask_r = rotate_reference(mask)[:4]
+            expected = [numpy.mean(xyz) for xyz in numpy.where(mask_r)]
+            assert numpy.allclose(self.annotation.right_centre(structure_id), expected)
+
+        centres, names = construct_centres(self.annotation, self.ORDER, self.KEY_ORD)
+        assert names == ['Right ten', 'Right twenty', 'Left ten', 'Left twenty']
+        assert numpy.allclose(centres[2:, 0], 8 - centres[:2, 0])
+        assert numpy.allclose(centres[2:, 1:], centres[:2, 1:])
+
+
+    def test_construct_structural_conn(self):
+        columns = [{'structure_id': sid, 'hemisphere_id': hemisphere} for sid in [20, 10] for hemisphere in [1, 2, 3]]
+        projmaps = {10: {'columns': columns, 'matrix': numpy.array([[1., 2, 3, 4, 5, 6],
+                                                                     [3., numpy.nan, 3, 8, 5, 6]])},
+                    20: {'columns': columns, 'matrix': numpy.array([[8., 8, 8, 8, 8, 8]])}}
+        structural_conn = construct_structural_conn(projmaps, self.ORDER, self.KEY_ORD)
+        # rows: right 10, right 20, left 10, left 20; the same order for the columns
+        expected = numpy.array([[5, 2, 6, 2],
+                                [8, 8, 8, 8],
+                                [6, 2, 5, 2],
+                                [8, 8, 8, 8]]) / 8.0
+        assert numpy.allclose(structural_conn, expected)
+
+
+    def test_construct_tract_lengths(self):
+        centres = numpy.array([[0., 0, 0], [3, 4, 0], [10, 0, 0], [7, 4, 0]])
+        tracts = construct_tract_lengths(centres)
+        expected = numpy.sqrt(((centres[:, numpy.newaxis] - centres[numpy.newaxis]) ** 2).sum(axis=2))
+        assert numpy.allclose(tracts, expected)
+
+
+    def test_mouse_brain_visualizer(self):
+        vol_parcel = mouse_brain_visualizer(self.annotation, self.ORDER, self.KEY_ORD, {997: 0}, {},
+                                            self.TREE, {10: None, 20: None})
+        # back to the Allen reference
+        vol_parcel = numpy.transpose(vol_parcel, (1, 2, 0))[:, ::-1, :]
+        expected_right = {0: -1, 10: 0, 11: 0, 20: 1, 21: 1, 31: 0}
+        expected_left = {0: -1, 10: 2, 11: 2, 20: 3, 21: 3, 31: 2}
+        for label in expected_right:
+            assert (vol_parcel[:, :, :4][self.vol[:, :, :4] == label] == expected_right[label]).all()
+            assert (vol_parcel[:, :, 4:][self.vol[:, :, 4:] == label] == expected_left[label]).all()
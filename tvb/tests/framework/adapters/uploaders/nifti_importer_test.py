@@ -33,6 +33,7 @@
 
 import os
 import numpy
+import nibabel
 import tvb_data.nifti as demo_data
 from tvb.tests.framework.core.base_testcase import TransactionalTestCase
 from tvb.tests.framework.core.factory import TestFactory
@@ -43,6 +44,7 @@ from tvb.core.entities.transient.structure_entities import DataTypeMetaData
 from tvb.core.services.flow_service import FlowService
 from tvb.core.services.exceptions import OperationException
 from tvb.core.adapters.abcadapter import ABCAdapter
+from tvb.adapters.uploaders.nifti.parser import NIFTIParser
 from tvb.datatypes.region_mapping import RegionVolumeMapping
 from tvb.datatypes.time_series import TimeSeriesVolume
 from tvb.datatypes.structural import StructuralMRI
@@ -124,6 +126,24 @@ class TestNIFTIImporter(TransactionalTestCase):
         assert "mm" == volume.voxel_unit
 
 
+    def test_parse_in_time_blocks(self):
+        """
+        Streaming in time blocks of any size should store the same data as loading the whole NIFTI volume.
+        """
+        expected_data = numpy.rollaxis(nibabel.load(self.TIMESERIES_NII_FILE).get_data(), 3)
+        parser = NIFTIParser(self.TIMESERIES_NII_FILE)
+        assert 1 == parser.compute_time_block_size(1)
+        assert 5 == parser.compute_time_block_size()
+
+        for idx, max_block_size in enumerate([1, None]):
+            storage_path = FilesHelper().get_project_folder(self.test_project, "nifti_blocks_%d" % idx)
+            time_series = TimeSeriesVolume(storage_path=storage_path)
+            parser.parse(time_series, True, max_block_size=max_block_size)
+            stored_data = time_series.get_data('data')
+            assert expected_data.shape == stored_data.shape
+            assert numpy.allclose(expected_data, stored_data)
+
+
     def test_import_nii_without_time_dimension(self):
         """
         This method tests import of a NIFTI file.
@@ -32,8 +32,10 @@
 .. moduleauthor:: Mihai Andrei <mihai.andrei@codemart.ro>
 """
 
+import numpy
+import pytest
 from StringIO import StringIO
-from tvb.adapters.uploaders.obj.parser import ObjWriter, ObjParser
+from tvb.adapters.uploaders.obj.parser import ObjWriter, ObjParser, BulkObjParser, UnsupportedObjFeature
 
 
 
@@ -73,3 +75,29 @@ class TestObjFiles():
         assert normals == p.normals
         # assert triangles == p.faces
 
+
+
+    def test_bulk_parse_matches_line_parser(self):
+        f = StringIO()
+        vertices = numpy.random.rand(40, 3)
+        normals = numpy.random.rand(40, 3)
+        triangles = numpy.random.randint(0, 40, (60, 3))
+        ObjWriter(f).write(vertices, triangles, normals)
+
+        bulk = BulkObjParser()
+        bulk.read(f.getvalue())
+        p = ObjParser()
+        p.read(f.getvalue().splitlines())
+
+        assert numpy.allclose(bulk.vertices, p.vertices)
+        assert numpy.allclose(bulk.normals, p.normals)
+        assert (bulk.triangles == triangles).all()
+        assert (bulk.triangle_normals == triangles).all()
+        assert (bulk.triangles == numpy.array(p.faces)[:, :, 0]).all()
+
+
+    def test_bulk_parse_rejects_exotic_files(self):
+        header = "v 0 0 0\nv 1 0 0\nv 0 1 0\nv 1 1 0\nvn 0 0 1\n"
+        for faces in ["f 1 2 3 4\n", "f -4 -3 -2\n", "f 1//1 2//1 3\n", "f 1 2 3\nf 1/1 2/1 3/1\n"]:
+            with pytest.raises(UnsupportedObjFeature):
+                BulkObjParser().read(header + faces)
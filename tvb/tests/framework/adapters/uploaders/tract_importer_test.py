@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import numpy
+import pytest
+from tvb.adapters.uploaders.tract_importer import TrackvizTractsImporter
+
+
+
+class _InMemoryRegionVolume(object):
+    """
+    Stands for a RegionVolumeMapping, counting the slices read from it.
+    """
+
+    def __init__(self, array_data):
+        self.array_data = array_data
+        self.slices_read = 0
+
+
+    def read_data_shape(self):
+        return self.array_data.shape
+
+
+    def read_data_slice(self, data_slice):
+        self.slices_read += 1
+        return self.array_data[data_slice]
+
+
+
+class TestTractImporter(object):
+    """
+    Unit-tests for the batched region lookup of tract start points.
+    """
+
+    def setup_method(self):
+        numpy.random.seed(42)
+        self.region_volume = _InMemoryRegionVolume(numpy.random.randint(-1, 76, (20, 6, 5)).astype(numpy.int16))
+        self.start_vertices = numpy.random.rand(300, 3) * numpy.array([20, 6, 5])
+        self.importer = TrackvizTractsImporter()
+
+
+    def _per_point_regions(self):
+        """
+        The lookup before batching: one slice read per tract start point.
+        """
+        regions = []
+        for vertex in self.start_vertices:
+            x, y, z = [int(i) for i in vertex]
+            voxel = self.region_volume.read_data_slice((slice(x, x + 1), slice(y, y + 1), slice(z, z + 1)))
+            regions.append(voxel[0, 0, 0])
+        return numpy.array(regions, dtype=numpy.int16)
+
+
+    def _prepare_importer(self):
+        """
+        The region volume part of `_base_before_launch`.
+        """
+        self.importer.region_volume = self.region_volume
+        self.importer._attempt_to_cache_regionmap(self.region_volume)
+        self.importer.region_volume_shape = self.region_volume.read_data_shape()
+
+
+    def _batched_regions(self):
+        self._prepare_importer()
+        chunks = [self.importer._to_voxel_indices(self.start_vertices[i:i + 64])
+                  for i in range(0, len(self.start_vertices), 64)]
+        return self.importer._compute_tract_region(chunks)
+
+
+    def test_regions_in_memory(self):
+        expected = self._per_point_regions()
+        self.region_volume.slices_read = 0
+        assert numpy.array_equal(self._batched_regions(), expected)
+        # the whole volume is read once, when it fits in memory
+        assert self.region_volume.slices_read == 1
+
+
+    def test_regions_in_slabs(self):
+        expected = self._per_point_regions()
+        self.region_volume.slices_read = 0
+        # 3 x planes per slab
+        self.importer.MAX_RMAP_BLOCK = 3 * 6 * 5
+        assert numpy.array_equal(self._batched_regions(), expected)
+        assert self.region_volume.slices_read <= 7
+
+
+    def test_vertices_outside_volume(self):
+        self._prepare_importer()
+        with pytest.raises(IndexError):
+            self.importer._to_voxel_indices([[20, 0, 0]])
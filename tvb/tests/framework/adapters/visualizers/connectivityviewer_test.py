@@ -32,7 +32,9 @@
 """
 from tvb.tests.framework.core.base_testcase import TransactionalTestCase
 from tvb.core.entities.file.files_helper import FilesHelper
-from tvb.adapters.visualizers.connectivity import ConnectivityViewer
+import json
+import numpy
+from tvb.adapters.visualizers.connectivity import ConnectivityViewer, Connectivity2DViewer
 from tvb.datatypes.connectivity import Connectivity
 from tvb.tests.framework.core.factory import TestFactory
 from tvb.tests.framework.datatypes.datatypes_factory import DatatypesFactory
@@ -75,3 +77,21 @@ class TestConnectivityViewer(TransactionalTestCase):
                          'leftHemisphereJson', 'connectivity_entity', 'bothHemisphereJson']
         for key in expected_keys:
             assert key in result
+
+
+    def test_2d_layout(self):
+        """
+        Check that the 2D charts hold a value for each node and their non-zero edges as a COO list.
+        """
+        params, _ = Connectivity2DViewer().compute_parameters(self.connectivity)
+        both = json.loads(params['bothHemisphereJson'])
+        left = json.loads(params['leftHemisphereJson'])
+        nodes = self.connectivity.number_of_regions
+        for key in ['labels', 'angle', 'radius', 'customShapeDimension', 'customShapeColor']:
+            assert len(both[key]) == nodes
+            assert len(left[key]) == nodes / 2
+
+        weights = Connectivity2DViewer()._normalize_weights(self.connectivity.ordered_weights)
+        assert len(both['nodeFrom']) == len(both['nodeTo']) == len(both['weight']) == numpy.count_nonzero(weights)
+        assert numpy.allclose(weights[both['nodeFrom'], both['nodeTo']], both['weight'])
+        assert 0 <= min(both['weight']) and max(both['weight']) <= Connectivity2DViewer.MAX_WEIGHT_VALUE
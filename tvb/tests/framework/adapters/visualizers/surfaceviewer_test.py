@@ -32,8 +32,11 @@
 .. moduleauthor:: Lia Domide <lia.domide@codemart.ro>
 """
 
+import json
+import numpy
 from tvb.tests.framework.core.base_testcase import TransactionalTestCase
-from tvb.adapters.visualizers.surface_view import SurfaceViewer, RegionMappingViewer
+from tvb.adapters.visualizers.surface_view import SurfaceViewer, RegionMappingViewer, prepare_region_boundaries_urls
+from tvb.core.region_boundaries import BOUNDARY_ARRAYS, boundaries_dataset_name
 from tvb.core.entities.file.files_helper import FilesHelper
 from tvb.datatypes.surfaces import CorticalSurface
 from tvb.datatypes.region_mapping import RegionMapping
@@ -93,3 +96,19 @@ class TestSurfaceViewers(TransactionalTestCase):
         result = viewer.launch(self.region_mapping)
 
         self.assert_compliant_dictionary(self.EXPECTED_KEYS, result)
+
+
+    def test_region_boundaries_cached(self):
+        """
+        Boundaries stored in the region mapping file are the ones the surface computes by walking its triangles.
+        """
+        urls = json.loads(prepare_region_boundaries_urls(self.surface, self.region_mapping))
+        assert prepare_region_boundaries_urls(self.surface, self.region_mapping) == json.dumps(urls)
+
+        expected = self.surface.generate_region_boundaries(self.region_mapping)
+        for array_idx, name in enumerate(BOUNDARY_ARRAYS):
+            assert len(urls[name]) == self.surface.number_of_split_slices
+            for slice_idx in range(self.surface.number_of_split_slices):
+                dataset_name = boundaries_dataset_name(self.surface, self.region_mapping, name, slice_idx)
+                stored = self.region_mapping.get_data(dataset_name)
+                assert numpy.allclose(stored, numpy.array(expected[array_idx][slice_idx], dtype=stored.dtype))
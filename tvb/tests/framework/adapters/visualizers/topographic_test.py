@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import threading
+import numpy
+from scipy.interpolate import griddata
+from tvb.adapters.visualizers.topographic import TopographyCalculations
+
+
+
+class TestTopographyCalculations(object):
+    """
+    Unit-tests for the topography computed by the Topographic Visualizer.
+    """
+
+    def setup_method(self):
+        random_state = numpy.random.RandomState(42)
+        self.sensors = TopographyCalculations.normalize_sensors(random_state.randn(76, 3) * [40, 60, 35])
+        self.measure = random_state.rand(76)
+
+
+    def test_topography(self):
+        """
+        Cells inside the sensors hull are interpolated as by griddata, the others are filled
+        from their neighbours, within the measure range, and the grid is trimmed to the head contour.
+        """
+        topography = TopographyCalculations.compute_topography_data(self.measure, self.sensors)
+        sensors_data = TopographyCalculations._prepare_sensors(self.sensors)
+        expected = griddata(sensors_data["sproj"][:, :2], self.measure, (sensors_data["x_arr"], sensors_data["y_arr"]),
+                            method='linear')
+
+        inside = topography != -1
+        interpolated = inside & ~numpy.isnan(expected)
+        assert not numpy.isnan(topography).any()
+        assert numpy.allclose(topography[interpolated], expected[interpolated])
+        assert self.measure.min() <= topography[inside].min()
+        assert topography[inside].max() <= self.measure.max()
+        assert topography[0, 0] == -1 and topography[-1, -1] == -1
+
+
+    def test_sensors_cache(self):
+        """
+        Measures over the same sensors reuse one preparation of these sensors.
+        """
+        first = TopographyCalculations.compute_topography_data(self.measure, self.sensors, "sensors-gid")
+        cached = TopographyCalculations._sensors_cache["sensors-gid"]
+        second = TopographyCalculations.compute_topography_data(self.measure, self.sensors, "sensors-gid")
+        assert TopographyCalculations._sensors_cache["sensors-gid"] is cached
+        assert numpy.array_equal(first, second)
+        assert numpy.array_equal(first, TopographyCalculations.compute_topography_data(self.measure, self.sensors))
+
+
+    def test_sensors_cache_threads(self):
+        """
+        Concurrent requests over the same and over other sensors leave the cache consistent and bounded.
+        """
+        errors = []
+
+        def _compute(index):
+            try:
+                for repeat in range(5):
+                    gid = "sensors-gid-%d" % ((index + repeat) % (TopographyCalculations.SENSORS_CACHE_SIZE + 2))
+                    TopographyCalculations.compute_topography_data(self.measure, self.sensors, gid)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=_compute, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+        assert len(TopographyCalculations._sensors_cache) <= TopographyCalculations.SENSORS_CACHE_SIZE
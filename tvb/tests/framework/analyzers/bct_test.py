@@ -32,8 +32,11 @@
 .. moduleauthor:: Lia Domide <lia.domide@codemart.ro>
 """
 
+import os
+import json
 import numpy
 import pytest
+import tvb.tests.framework.analyzers.test_data as test_data
 from tvb.tests.framework.core.base_testcase import TransactionalTestCase
 from tvb.core.adapters.abcadapter import ABCAdapter
 from tvb.core.entities.model import STATUS_FINISHED
@@ -44,6 +47,10 @@ from tvb.core.services.operation_service import OperationService
 from tvb.core.adapters.exceptions import InvalidParameterException
 from tvb.datatypes.connectivity import Connectivity
 from tvb.tests.framework.core.factory import TestFactory
+from tvb.adapters.analyzers.bct_native import NATIVE_FUNCTIONS, weights_to_lengths, distance_wei
+from tvb.adapters.analyzers.bct_adapters import BaseBCT, CharacteristicPathLength
+from tvb.adapters.analyzers.bct_centrality_adapters import ParticipationCoefficient
+from tvb.adapters.analyzers.bct_degree_adapters import DegreeIOD
 
 
 class TestBCT(TransactionalTestCase):
@@ -125,3 +132,69 @@ class TestBCT(TransactionalTestCase):
         for adapter_instance in self.bct_adapters:
             assert len(adapter_instance.stored_adapter.description) > 10, "Description was not loaded properly for " \
                                                                           "algorithm %s" % (str(adapter_instance))
+
+
+
+class TestBCTNative(object):
+    """
+    Check the NumPy implementations of BCT functions against reference outputs of the toolbox.
+    """
+    REFERENCE_FILE = os.path.join(os.path.dirname(test_data.__file__), 'bct_reference.json')
+
+    def setup_method(self):
+        with open(self.REFERENCE_FILE) as reference_file:
+            self.reference = json.load(reference_file)
+        self.matrices = dict((name, numpy.array(matrix)) for name, matrix in self.reference['matrices'].items())
+
+
+    @staticmethod
+    def _same_partition(communities1, communities2):
+        """ Community labels are arbitrary, compare the partitions """
+        pairs = set(zip(communities1, communities2))
+        return len(pairs) == len(set(communities1)) == len(set(communities2))
+
+
+    def test_native_functions(self):
+        for case in self.reference['expected']:
+            results = NATIVE_FUNCTIONS[case['function']](self.matrices[case['input']])
+            if not isinstance(results, tuple):
+                results = (results,)
+            assert len(results) == len(case['outputs'])
+
+            if case['function'].startswith('modularity'):
+                assert self._same_partition(results[0], case['outputs'][0])
+                assert numpy.allclose(results[1], case['outputs'][1])
+            else:
+                for result, expected in zip(results, case['outputs']):
+                    assert numpy.allclose(result, expected), "Wrong result for %s" % case['function']
+
+
+    def test_native_program(self):
+        assert BaseBCT.native_program(ParticipationCoefficient._matlab_code) is None
+        program = BaseBCT.native_program(CharacteristicPathLength._matlab_code)
+        assert [outputs for outputs, _, _ in program] == [['D'], ['lambda', 'efficiency', 'ecc', 'radius', 'diameter']]
+        assert CharacteristicPathLength.can_be_active()
+
+
+    def test_execute_native(self):
+        weights = self.matrices['directed']
+        result = DegreeIOD().execute(DegreeIOD._matlab_code, CIJ=weights)
+        assert numpy.allclose(result['id'] + result['od'], result['deg'])
+        assert numpy.allclose(result['od'], (weights != 0).sum(axis=1))
+
+        # the reference outputs of the toolbox, with the directed matrix taken as connection lengths
+        expected = dict((case['function'], case['outputs']) for case in self.reference['expected']
+                        if case['function'] in ('distance_wei', 'charpath'))
+        result = CharacteristicPathLength().execute(CharacteristicPathLength._matlab_code, L=weights)
+        assert numpy.allclose(result['D'], expected['distance_wei'][0])
+        for index, name in enumerate(['lambda', 'efficiency', 'ecc', 'radius', 'diameter']):
+            assert numpy.allclose(result[name], expected['charpath'][index])
+
+
+    def test_weights_to_lengths(self):
+        weights = numpy.array([[0, 4.0, 0.5], [4.0, 0, 0], [0.5, 0, 0]])
+        lengths = weights_to_lengths(weights)
+        assert numpy.allclose(lengths, [[0, 0.25, 2.0], [0.25, 0, 0], [2.0, 0, 0]])
+        # the strongest connection is the shortest path
+        distances = distance_wei(lengths)
+        assert distances[0, 1] < distances[0, 2]
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+"""
+Tests for the pooled interpreter sessions of MatlabWorker, against a stub interpreter.
+"""
+
+import os
+import sys
+import numpy
+import pytest
+import tvb.tests.framework.analyzers.test_data as test_data
+from tvb.adapters.analyzers.matlab_worker import MatlabWorker, SessionPool
+
+STUB_INTERPRETER = os.path.join(os.path.dirname(test_data.__file__), "octave_stub.py")
+
+
+class TestMatlabSessionPool(object):
+    """
+    Check that MatlabWorker reuses interpreter sessions, and replaces the ones which died.
+    """
+
+    def setup_method(self):
+        self.pool = SessionPool([sys.executable, STUB_INTERPRETER], max_idle=1)
+
+
+    def teardown_method(self):
+        self.pool.close()
+
+
+    def test_session_reused(self):
+        data = {"CIJ": numpy.arange(12.0).reshape((3, 4))}
+        for _ in range(3):
+            worker = MatlabWorker(session_pool=self.pool)
+            runcode, log, result = worker.matlab("result = 3", data)
+            assert result["result"] == 3
+            assert result["hexstamp"] == worker.hex
+            assert result["success" + worker.hex] == 1
+            assert numpy.array_equal(result["CIJ"], data["CIJ"])
+            assert "result = 3" in log
+            assert not os.path.exists(worker.wkspc_fname)
+        assert self.pool.started == 1
+
+
+    def test_workspace_cleared_between_calls(self):
+        MatlabWorker(session_pool=self.pool).matlab("first = 1")
+        _, _, result = MatlabWorker(session_pool=self.pool).matlab("second = 2")
+        assert "second" in result
+        assert "first" not in result
+
+
+    def test_dead_session_replaced(self):
+        session = self.pool.acquire()
+        session.process.kill()
+        session.process.wait()
+        self.pool.release(session)
+
+        _, _, result = MatlabWorker(session_pool=self.pool).matlab("value = 5")
+        assert result["value"] == 5
+        assert self.pool.started == 2
+
+
+    def test_hanging_session_killed(self):
+        worker = MatlabWorker(session_pool=self.pool)
+        worker.session_timeout = 1
+        with pytest.raises(IOError):
+            worker.matlab("pause(30)")
+        assert self.pool.started == 1
+
+        _, _, result = MatlabWorker(session_pool=self.pool).matlab("value = 5")
+        assert result["value"] == 5
+        assert self.pool.started == 2
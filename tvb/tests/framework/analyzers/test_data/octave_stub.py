@@ -0,0 +1,51 @@
+"""
+Stand-in for an Octave interpreter session, speaking the pipe protocol used by MatlabWorker.
+It reads statements from stdin and understands only: clear, load, save, disp, pause,
+assignments of numbers or strings and exit. Anything else is ignored.
+"""
+
+import re
+import sys
+import time
+from scipy.io import loadmat, savemat
+
+ASSIGNMENT = re.compile(r"^(\w+) = ('([^']*)'|-?[\d.]+)$")
+CALL = re.compile(r"^(load|save|disp)\('([^']*)'")
+PAUSE = re.compile(r"^pause\(([\d.]+)\)$")
+
+
+def main():
+    workspace = {}
+    for line in iter(sys.stdin.readline, ''):
+        statement = line.strip().rstrip(';')
+        if statement in ('exit', 'quit'):
+            break
+        if statement == 'clear':
+            workspace = {}
+            continue
+        match = ASSIGNMENT.match(statement)
+        if match is not None:
+            name, value, text = match.groups()
+            workspace[name] = text if text is not None else float(value)
+            print("%s = %s" % (name, value))
+            continue
+        match = PAUSE.match(statement)
+        if match is not None:
+            time.sleep(float(match.group(1)))
+            continue
+        match = CALL.match(statement)
+        if match is None:
+            continue
+        function, argument = match.groups()
+        if function == 'load':
+            data = loadmat(argument)
+            workspace.update((key, value) for key, value in data.items() if not key.startswith('__'))
+        elif function == 'save':
+            savemat(argument, workspace)
+        else:
+            print(argument)
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -297,6 +297,18 @@ class TestHDF5Storage(object):
             read_data = self.storage.get_data(DATASET_NAME_1, sl)
             self._assert_arrays_are_equal(self.test_2D_array[sl], read_data)
 
+    def test_read_data_chunks(self):
+        """
+        Appended data sets are chunked, while data sets stored at once are contiguous.
+        """
+        self.storage.store_data(DATASET_NAME_1, self.test_2D_array)
+        self.storage.append_data(DATASET_NAME_2, self.test_3D_array, grow_dimension=1)
+        assert self.storage.get_data_chunks(DATASET_NAME_1) is None
+        assert len(self.storage.get_data_chunks(DATASET_NAME_2)) == 3
+        assert self.storage.get_data_chunks("missing", ignore_errors=True) is None
+        with pytest.raises(MissingDataSetException):
+            self.storage.get_data_chunks("missing")
+
     def test_add_metadata(self):
         """
         This method checks metadata add for root or a dataset
@@ -314,6 +326,26 @@ class TestHDF5Storage(object):
         read_meta_value = self.storage.get_metadata()
         assert META_VALUE == read_meta_value[META_KEY]
 
+    def test_add_metadata_batch(self):
+        """
+        Metadata set inside a batch is written on file only at the batch exit.
+        """
+        self.storage.store_data(DATASET_NAME_1, self.test_2D_array)
+        reader = hdf5.HDF5StorageManager(self.storage_folder, STORAGE_FILE_NAME)
+        with self.storage.metadata_batch():
+            self.storage.set_metadata(META_DICT, DATASET_NAME_1)
+            self.storage.set_metadata({"other_key": 2}, DATASET_NAME_1)
+            self.storage.set_metadata(META_DICT)
+            assert META_KEY not in reader.get_metadata(DATASET_NAME_1)
+            assert META_KEY not in reader.get_metadata()
+        assert META_VALUE == reader.get_metadata(DATASET_NAME_1)[META_KEY]
+        assert 2 == reader.get_metadata(DATASET_NAME_1)["other_key"]
+        assert META_VALUE == reader.get_metadata()[META_KEY]
+
+        with self.storage.metadata_batch():
+            self.storage.set_metadata({META_KEY: "new_value"}, DATASET_NAME_1)
+            assert "new_value" == self.storage.get_metadata(DATASET_NAME_1)[META_KEY]
+
     def test_add_metadata_on_path(self):
         """
         This method checks metadata add for a dataset stored under a given path
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import os
+import numpy
+import pytest
+from tvb.tests.framework.core.base_testcase import TransactionalTestCase
+from tvb.tests.framework.core.factory import TestFactory
+from tvb.core.entities.file.files_helper import FilesHelper
+from tvb.core.entities.file.hdf5_storage_manager import HDF5StorageManager
+from tvb.core.entities.storage import dao
+from tvb.core import operation_profiler
+from tvb.core.operation_profiler import OperationProfiler, read_operation_profile
+
+
+class TestOperationProfiler(TransactionalTestCase):
+    """
+    Tests for the opt-in operation resource accounting.
+    """
+
+    def transactional_setup_method(self):
+        self.test_user = TestFactory.create_user()
+        self.test_project = TestFactory.create_project(self.test_user)
+        self.operation = TestFactory.create_operation(test_user=self.test_user, test_project=self.test_project)
+        self.files_helper = FilesHelper()
+
+
+    def transactional_teardown_method(self):
+        self.files_helper.remove_project_structure(self.test_project.name)
+
+
+    def _fake_operation(self):
+        """ Write and read back one array, then query the DB. """
+        folder = self.files_helper.get_operation_folder(self.test_project.name, self.operation.id)
+        storage = HDF5StorageManager(folder, "profiled.h5")
+        storage.store_data("data", numpy.zeros((10, 10)))
+        storage.get_data("data")
+        dao.get_operation_by_id(self.operation.id)
+        return 42
+
+
+    def test_profile_stored_in_operation_folder(self):
+        profiler = OperationProfiler(self.operation.id, operation_profiler.PROFILING_CPROFILE)
+        assert profiler.run(self._fake_operation) == 42
+
+        stats = read_operation_profile(dao.get_operation_by_id(self.operation.id))
+        assert stats == profiler.stats
+        assert stats['h5_bytes_written'] == 800
+        assert stats['h5_bytes_read'] == 800
+        assert stats['sql_statements'] >= 1
+        assert stats['wall_time'] >= 0
+        operation_folder = self.files_helper.get_operation_folder(self.test_project.name, self.operation.id)
+        assert os.path.exists(os.path.join(operation_folder, "%s.profile" % self.operation.id))
+        assert not dao.get_operation_by_id(self.operation.id).additional_info
+
+
+    def test_profile_stored_on_failure(self):
+        self.operation.additional_info = "Adapter warning"
+        dao.store_entity(self.operation)
+
+        def _failing_operation():
+            raise ValueError("failed")
+
+        with pytest.raises(ValueError):
+            OperationProfiler(self.operation.id).run(_failing_operation)
+        operation = dao.get_operation_by_id(self.operation.id)
+        assert operation.additional_info == "Adapter warning"
+        assert read_operation_profile(operation)['h5_bytes_written'] == 0
+
+
+    def test_profiling_mode(self):
+        original = os.environ.get(operation_profiler.PROFILING_ENV_VARIABLE)
+        try:
+            os.environ[operation_profiler.PROFILING_ENV_VARIABLE] = "CProfile"
+            assert operation_profiler.get_profiling_mode() == operation_profiler.PROFILING_CPROFILE
+            os.environ[operation_profiler.PROFILING_ENV_VARIABLE] = "no"
+            assert operation_profiler.get_profiling_mode() is None
+        finally:
+            if original is None:
+                del os.environ[operation_profiler.PROFILING_ENV_VARIABLE]
+            else:
+                os.environ[operation_profiler.PROFILING_ENV_VARIABLE] = original
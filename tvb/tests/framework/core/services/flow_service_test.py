@@ -207,6 +207,21 @@ class TestFlowService(TransactionalTestCase):
         assert interface[0]["default"] == "0", "Bad interface!"
 
 
+    def test_prepare_adapter_cached_static_tree(self):
+        """
+        The introspected tree is built once, and changes on a prepared tree do not reach the next ones.
+        """
+        stored_adapter = dao.get_algorithm_by_module(TEST_ADAPTER_VALID_MODULE, TEST_ADAPTER_VALID_CLASS)
+        interface = self.flow_service.prepare_adapter(self.test_project.id, stored_adapter, cache_static_tree=True)
+        static_tree = self.flow_service._get_static_input_tree(stored_adapter)
+        assert interface == self.flow_service.prepare_adapter(self.test_project.id, stored_adapter)
+
+        interface[0]["default"] = "5"
+        second_interface = FlowService().prepare_adapter(self.test_project.id, stored_adapter, cache_static_tree=True)
+        assert second_interface[0]["default"] == "0"
+        assert static_tree is FlowService()._get_static_input_tree(stored_adapter)
+
+
     def test_fire_operation(self):
         """
         Test preparation of an adapter and launch mechanism.
@@ -316,6 +331,7 @@ class TestFlowService(TransactionalTestCase):
         for row in returned_data:
             if row[1] != 'Datatype1':
                 raise AssertionError("Some invalid data was returned!")
+            assert row[8] == dao.get_datatype_by_id(row[0]).display_name
         assert 4 == len(returned_data), "Invalid length of result"
 
         filter_op = FilterChain(fields=[FilterChain.datatype + ".state", FilterChain.operation + ".start_date"],
@@ -39,6 +39,7 @@ from tvb.tests.framework.core.base_testcase import TransactionalTestCase
 from tvb.tests.framework.core.factory import TestFactory, ExtremeTestFactory
 from tvb.tests.framework.datatypes import datatypes_factory
 from tvb.tests.framework.datatypes.datatype1 import Datatype1
+from tvb.tests.framework.datatypes.datatype2 import Datatype2
 from tvb.tests.framework.adapters.storeadapter import StoreAdapter
 from tvb.basic.profile import TvbProfile
 from tvb.core.entities import model
@@ -370,8 +371,55 @@ class TestProjectService(TransactionalTestCase):
         projects = dao.get_projects_for_user(self.test_user.id)
         assert len(projects) == 1, "Initializations failed!"
         with pytest.raises(ProjectServiceException):
-            self.project_service.remove_project(99)   
-    
+            self.project_service.remove_project(99)
+
+
+    def _create_project_for_removal(self, link_project):
+        """
+        Fill a project with a Connectivity linked in `link_project`, a TimeSeries, a DataTypeGroup with measures,
+        a Burst and a Figure. Return the project and the linked Connectivity GID.
+        """
+        factory = datatypes_factory.DatatypesFactory()
+        project = factory.get_project()
+        _, connectivity = factory.create_connectivity(nodes=4)
+        factory.create_timeseries(connectivity)
+        factory.create_datatype_group()
+        TestFactory.store_burst(project.id)
+        TestFactory.create_figure(factory.get_operation().id, factory.get_user().id, project.id)
+        dao.store_entity(model.Links(connectivity.id, link_project.id))
+        return project, connectivity.gid
+
+
+    def _count_removable_entities(self):
+        """ Count all entities a project removal touches. """
+        entity_types = [model.Project, model.DataType, model.DataTypeGroup, Datatype2, model.Operation,
+                        model.OperationGroup, model.Links, model.BurstConfiguration, model.ResultFigure]
+        return [self.count_all_entities(entity_type) for entity_type in entity_types]
+
+
+    def test_remove_project_bulk_same_as_per_entity(self):
+        """
+        Removing a project in bulk should leave the DB in the same state as removing it entity by entity.
+        """
+        if dao.get_system_user() is None:
+            dao.store_entity(model.User(TvbProfile.current.web.admin.SYSTEM_USER_NAME, None, None, True, None))
+        link_project = TestFactory.create_project(self.test_user, 'link_proj')
+        removed_counts = []
+        for bulk in (False, True):
+            project, linked_gid = self._create_project_for_removal(link_project)
+            project_root = self.structure_helper.get_project_folder(project)
+            counts_before = self._count_removable_entities()
+            self.project_service.remove_project(project.id, bulk=bulk)
+            counts_after = self._count_removable_entities()
+            removed_counts.append([before - after for before, after in zip(counts_before, counts_after)])
+
+            assert not os.path.exists(project_root)
+            linked_connectivity = dao.get_datatype_by_gid(linked_gid)
+            assert linked_connectivity.parent_operation.fk_launched_in == link_project.id
+            assert dao.get_datatypes_in_project(project.id) == []
+        assert removed_counts[0] == removed_counts[1]
+        assert removed_counts[1][0] == 1
+
 
     @staticmethod
     def _create_value_wrapper(test_user, test_project=None):
@@ -38,6 +38,7 @@ from tvb.tests.framework.core.base_testcase import BaseTestCase
 from tvb.datatypes.arrays import MappedArray
 from tvb.basic.traits import types_basic as basic
 from tvb.basic.traits.types_mapped import MappedType
+from tvb.core.traits.types_mapped import MinMaxPyramid
 from tvb.core.entities import model
 from tvb.core.entities.storage import dao, SA_SESSIONMAKER
 from tvb.core.services.flow_service import FlowService
@@ -142,4 +143,63 @@ class TestMapping(BaseTestCase):
             assert  metadata[actual_datatype.METADATA_ARRAY_MIN] == 0
             assert actual_datatype.METADATA_ARRAY_MEAN in metadata
             assert  metadata[actual_datatype.METADATA_ARRAY_MEAN] == 7.5
-        
\ No newline at end of file
+        
+
+    def test_channel_statistics(self):
+        """
+        Per-channel statistics are accumulated while a configured array is written in chunks, and stored on close.
+        """
+        data = numpy.arange(120, dtype=numpy.float64).reshape((20, 2, 3)) % 17
+        data[4, 1, 2] = numpy.nan
+        storage_path = self.flow_service.file_helper.get_project_folder(self.operation.project, str(self.operation.id))
+        datatype_inst = MappedArray(title="chunked", d_type="MappedArray", storage_path=storage_path,
+                                    module="tvb.datatypes.arrays", subject="John Doe", state="RAW",
+                                    operation_id=self.operation.id)
+        datatype_inst.configure_channel_statistics('array_data')
+        for start in range(0, 20, 6):
+            datatype_inst.store_data_chunk('array_data', data[start:start + 6], grow_dimension=0, close_file=False)
+            datatype_inst.store_data_chunk('other_data', data[start:start + 6], grow_dimension=0, close_file=False)
+        datatype_inst.close_file()
+
+        statistics = datatype_inst.get_channel_statistics('array_data')
+        assert statistics['min'].shape == (1, 2, 3)
+        assert numpy.allclose(statistics['min'], numpy.nanmin(data, axis=0, keepdims=True))
+        assert numpy.allclose(statistics['max'], numpy.nanmax(data, axis=0, keepdims=True))
+        assert numpy.allclose(statistics['mean'], numpy.nanmean(data, axis=0, keepdims=True))
+        assert numpy.allclose(statistics['variance'], numpy.nanvar(data, axis=0, keepdims=True))
+        assert statistics['nan_count'].sum() == 1 and statistics['nan_count'][0, 1, 2] == 1
+        assert datatype_inst.get_channel_statistics('unknown_data') is None
+        # only the configured arrays get statistics
+        assert datatype_inst.get_channel_statistics('other_data') is None
+
+
+    def test_min_max_pyramid(self):
+        """
+        A min/max pyramid is written next to a chunked array, and pages are read from the matching level.
+        """
+        data = numpy.sin(numpy.arange(1000.0)).reshape((1000, 1, 1, 1)) * numpy.arange(1, 4).reshape((1, 1, 3, 1))
+        # spikes just outside the page read below, within the pyramid blocks it overlaps
+        data[96:100] = 10
+        data[900:905] = -10
+        storage_path = self.flow_service.file_helper.get_project_folder(self.operation.project, str(self.operation.id))
+        datatype_inst = MappedArray(title="pyramid", d_type="MappedArray", storage_path=storage_path,
+                                    module="tvb.datatypes.arrays", subject="John Doe", state="RAW",
+                                    operation_id=self.operation.id)
+        datatype_inst.configure_min_max_pyramid('array_data', factor=4)
+        for start in range(0, 1000, 7):
+            datatype_inst.store_data_chunk('array_data', data[start:start + 7], grow_dimension=0, close_file=False)
+        datatype_inst.close_file()
+
+        level_2 = datatype_inst.get_data(MinMaxPyramid.dataset_name('array_data', 'max', 2))
+        assert level_2.shape == (63, 1, 3, 1)
+        assert numpy.allclose(level_2[:62], data[:992].reshape((62, 16, 1, 3, 1)).max(axis=1))
+        assert numpy.allclose(level_2[62], data[992:].max(axis=0))
+
+        page = datatype_inst.read_min_max_page(100, 900, 50, "[null,0,null,0]", data_name='array_data')
+        assert page.shape == (2, 50, 1, 3, 1)
+        assert numpy.array_equal(page[0].min(axis=0), data[100:900].min(axis=0))
+        assert numpy.array_equal(page[1].max(axis=0), data[100:900].max(axis=0))
+        assert numpy.array_equal(page[0, 0], data[100:112].min(axis=0))
+
+        raw_page = datatype_inst.read_min_max_page(10, 20, 50, data_name='array_data')
+        assert numpy.array_equal(raw_page[0], data[10:20]) and numpy.array_equal(raw_page[1], data[10:20])
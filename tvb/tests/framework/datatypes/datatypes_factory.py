@@ -200,9 +200,9 @@ class DatatypesFactory(object):
         OperationService().initiate_prelaunch(operation, adapter_instance, {})
         return algo_id, connectivity
 
-    def create_timeseries(self, connectivity, ts_type=None, sensors=None):
+    def create_timeseries(self, connectivity, ts_type=None, sensors=None, data=None, sample_period=None):
         """
-        Create a stored TimeSeries entity.
+        Create a stored TimeSeries entity, with the given data or with random values of shape (10, 10, 10, 10).
         """
         operation, _, storage_path = self.__create_operation()
 
@@ -216,9 +216,12 @@ class DatatypesFactory(object):
                 rm = rm[0]
             time_series = TimeSeriesRegion(storage_path=storage_path, connectivity=connectivity, region_mapping=rm)
 
-        data = numpy.random.random((10, 10, 10, 10))
+        if data is None:
+            data = numpy.random.random((10, 10, 10, 10))
+        if sample_period is not None:
+            time_series.sample_period = sample_period
         time_series.write_data_slice(data)
-        time_series.write_time_slice(numpy.arange(10))
+        time_series.write_time_slice(numpy.arange(data.shape[0]))
         adapter_instance = StoreAdapter([time_series])
         OperationService().initiate_prelaunch(operation, adapter_instance, {})
         time_series = dao.get_datatype_by_gid(time_series.gid)
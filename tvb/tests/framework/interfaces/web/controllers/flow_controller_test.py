@@ -31,9 +31,11 @@
 .. moduleauthor:: Bogdan Neacsa <bogdan.neacsa@codemart.ro>
 """
 
+import os
 import copy
 import json
 import cherrypy
+import numpy
 from time import sleep
 from tvb.tests.framework.interfaces.web.controllers.base_controller_test import BaseControllersTest
 from tvb.tests.framework.core.factory import TestFactory
@@ -41,6 +43,7 @@ from tvb.core.entities import model
 from tvb.core.entities.storage import dao
 from tvb.core.services.operation_service import OperationService
 from tvb.interfaces.web.controllers import common
+from tvb.interfaces.web.controllers.decorators import pack_ndarrays, unpack_ndarrays, cache_datatype_response
 from tvb.interfaces.web.controllers.flow_controller import FlowController
 from tvb.interfaces.web.controllers.burst.burst_controller import BurstController
 from tvb.tests.framework.adapters.testadapter1 import TestAdapter1
@@ -150,8 +153,95 @@ class TestFlowContoller(BaseControllersTest):
         args = {'length': 101}
         returned_data = self.flow_c.read_datatype_attribute(dt.gid, 'return_test_data', **args)
         assert returned_data == str(range(101))
-        
-        
+
+
+    def test_read_binary_datatype_attributes(self):
+        """
+        Read multiple array attributes from a datatype, in one binary frame.
+        """
+        _, connectivity = DatatypesFactory().create_connectivity(nodes=10)
+        payload = self.flow_c.read_binary_datatype_attributes(connectivity.gid, "weights,centres")
+        result = unpack_ndarrays(payload)
+        assert list(result.keys()) == ["weights", "centres"]
+        assert (result["weights"] == connectivity.weights).all()
+        assert (result["centres"] == connectivity.centres).all()
+
+        payload = self.flow_c.read_binary_datatype_attributes(connectivity.gid, "centres", flatten=True,
+                                                              quantize="float16")
+        result = unpack_ndarrays(payload)
+        assert result.dtype == numpy.float16
+        assert result.shape == (30,)
+        assert numpy.allclose(result, connectivity.centres.flatten())
+
+
+    def test_pack_ndarrays_int64_range(self):
+        """
+        64 bit integers travel as 32 bit ones only when their values fit, and as float64 otherwise.
+        """
+        small = numpy.arange(-5, 5, dtype=numpy.int64)
+        result = unpack_ndarrays(pack_ndarrays(small))
+        assert result.dtype == numpy.int32
+        assert (result == small).all()
+
+        large = numpy.array([0, 2 ** 31, -2 ** 31 - 1], dtype=numpy.int64)
+        large_unsigned = numpy.array([0, 2 ** 32], dtype=numpy.uint64)
+        result = unpack_ndarrays(pack_ndarrays([large, large_unsigned]))
+        assert result[0].dtype == numpy.float64
+        assert (result[0] == large).all()
+        assert result[1].dtype == numpy.float64
+        assert (result[1] == large_unsigned).all()
+
+
+    def test_read_datatype_attribute_conditional_get(self):
+        """
+        A second read, with the ETag received at the first read, is answered with 304 and no payload.
+        """
+        _, connectivity = DatatypesFactory().create_connectivity(nodes=10)
+        cherrypy.request.headers = {}
+        payload = self.flow_c.read_binary_datatype_attributes(connectivity.gid, "weights")
+        etag = cherrypy.response.headers["ETag"]
+        assert len(payload) > 0
+
+        cherrypy.request.headers = {"If-None-Match": etag}
+        assert self.flow_c.read_binary_datatype_attributes(connectivity.gid, "weights") == b''
+        assert cherrypy.response.status == 304
+
+        cherrypy.response.status = 200
+        assert self.flow_c.read_binary_datatype_attributes(connectivity.gid, "centres") != b''
+        assert cherrypy.response.headers["ETag"] != etag
+        cherrypy.request.headers = {}
+
+
+    def test_etag_positional_datatype_kwargs(self):
+        """
+        DataTypes in datatype_kwargs are part of the ETag, whether passed by position or by name.
+        """
+        calls = []
+
+        @cache_datatype_response
+        def read(_, entity_gid, dataset_name, flatten=False, datatype_kwargs='null'):
+            calls.append(datatype_kwargs)
+            return b'payload'
+
+        _, connectivity = DatatypesFactory().create_connectivity(nodes=10)
+        _, other = DatatypesFactory().create_connectivity(nodes=10)
+        other_kwargs = json.dumps({'other': other.gid})
+        cherrypy.request.headers = {}
+
+        read(self.flow_c, connectivity.gid, "weights", False, other_kwargs)
+        positional_etag = cherrypy.response.headers["ETag"]
+        read(self.flow_c, connectivity.gid, "weights", False, datatype_kwargs=other_kwargs)
+        named_etag = cherrypy.response.headers["ETag"]
+
+        other_file = other.get_storage_file_path()
+        os.utime(other_file, (os.path.getatime(other_file), os.path.getmtime(other_file) + 10))
+        read(self.flow_c, connectivity.gid, "weights", False, other_kwargs)
+        assert cherrypy.response.headers["ETag"] != positional_etag
+        read(self.flow_c, connectivity.gid, "weights", False, datatype_kwargs=other_kwargs)
+        assert cherrypy.response.headers["ETag"] != named_etag
+        assert len(calls) == 4
+
+
     def test_get_simple_adapter_interface(self):
         adapter = dao.get_algorithm_by_module('tvb.tests.framework.adapters.testadapter1', 'TestAdapter1')
         result = self.flow_c.get_simple_adapter_interface(adapter.id)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+#
+# TheVirtualBrain-Framework Package. This package holds all Data Management, and 
+# Web-UI helpful to run brain-simulations. To use it, you also need do download
+# TheVirtualBrain-Scientific Package (for simulators). See content of the
+# documentation-folder for more details. See also http://www.thevirtualbrain.org
+#
+# (c) 2012-2017, Baycrest Centre for Geriatric Care ("Baycrest") and others
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License along with this
+# program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#
+#   CITATION:
+# When using The Virtual Brain for scientific publications, please cite it as follows:
+#
+#   Paula Sanz Leon, Stuart A. Knock, M. Marmaduke Woodman, Lia Domide,
+#   Jochen Mersmann, Anthony R. McIntosh, Viktor Jirsa (2013)
+#       The Virtual Brain: a simulator of primate brain network dynamics.
+#   Frontiers in Neuroinformatics (7:10. doi: 10.3389/fninf.2013.00010)
+#
+#
+
+import os
+import shutil
+from tvb.basic.profile import TvbProfile
+from tvb.interfaces.web.response_cache import DatatypeResponseCache, etag_matches
+
+
+
+class TestDatatypeResponseCache(object):
+    """
+    Unit tests for the on-disk LRU cache of DataType responses.
+    """
+
+    def setup_method(self):
+        self.cache_folder = os.path.join(TvbProfile.current.TVB_TEMP_FOLDER, "response_cache_test")
+        self.cache = DatatypeResponseCache(self.cache_folder, 250)
+
+
+    def teardown_method(self):
+        shutil.rmtree(self.cache_folder, True)
+
+
+    def test_disabled_cache(self):
+        cache = DatatypeResponseCache(None, 0)
+        cache.put('"etag"', {}, b'payload')
+        assert cache.get('"etag"') is None
+
+
+    def test_put_get(self):
+        self.cache.put('"etag1"', {"Content-Type": "application/x.tvb-ndarrays"}, b'\0\1\2payload')
+        headers, payload = self.cache.get('"etag1"')
+        assert headers == {"Content-Type": "application/x.tvb-ndarrays"}
+        assert payload == b'\0\1\2payload'
+        assert self.cache.get('"etag2"') is None
+
+
+    def test_lru_eviction(self):
+        for i in range(3):
+            self.cache.put('"etag%d"' % i, {}, b'x' * 100)
+        # only two entries fit, and the oldest one was evicted
+        assert self.cache.get('"etag0"') is None
+        assert self.cache.get('"etag1"') is not None
+        self.cache.put('"etag3"', {}, b'x' * 100)
+        # etag1 was recently used, thus etag2 goes out
+        assert self.cache.get('"etag2"') is None
+        assert self.cache.get('"etag1"') is not None
+        assert self.cache.current_size <= 250
+        assert len(os.listdir(self.cache_folder)) == 2
+
+
+    def test_index_restored_from_disk(self):
+        self.cache.put('"etag1"', {}, b'x' * 100)
+        cache = DatatypeResponseCache(self.cache_folder, 250)
+        assert cache.get('"etag1"') == ({}, b'x' * 100)
+        assert cache.current_size == self.cache.current_size
+
+
+    def test_etag_matches(self):
+        assert etag_matches('"abc"', '"xyz", "abc"')
+        assert etag_matches('"abc"', '*')
+        assert not etag_matches('"abc"', '"xyz"')
+        assert not etag_matches('"abc"', None)